@@ -7,6 +7,7 @@ Usage:
 
 API Endpoint:
     GET /extract?url=<URL>
+    GET /extract?url=<URL>&candidates=1    (also rank every phone/email found)
     
 Example:
     http://localhost:5000/extract?url=https://www.facebook.com/FidelidadeSeguros.Portugal
@@ -17,7 +18,8 @@ Response:
         "data": {
             "name": "Fidelidade Seguros",
             "email": "apoiocliente@fidelidade.pt",
-            "phone": "21 794 8800"
+            "phone": "21 794 8800",
+            "phone_e164": "+351217948800"
         }
     }
 """
@@ -28,11 +30,21 @@ import os
 
 # Import extract_contacts function from extract_contacts.py
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from extract_contacts import extract_contacts, clean_name
+from extract_contacts import extract_contacts, extract_contacts_http_first, clean_name
+from tab_pool import get_tab_pool, TabPoolExhausted
+from browser_supervisor import is_production_environment, get_supervisor
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+# In production, launch the headless browser once at startup so no request
+# pays the browser startup latency
+if is_production_environment():
+    try:
+        get_supervisor()
+    except Exception as e:
+        print(f"⚠️  Could not start browser at startup: {e}")
+
 
 @app.route('/favicon.ico')
 def favicon():
@@ -45,7 +57,8 @@ def health_check():
     """Health check endpoint"""
     return jsonify({
         "status": "healthy",
-        "service": "Contact Extractor API"
+        "service": "Contact Extractor API",
+        "tab_pool": get_tab_pool().stats()
     }), 200
 
 
@@ -54,6 +67,7 @@ def extract_contact_api():
     """Extract contact information from a URL"""
     # Get URL from query parameter
     url = request.args.get('url')
+    candidates = request.args.get('candidates') == '1'
     
     if not url:
         return jsonify({
@@ -68,10 +82,28 @@ def extract_contact_api():
         }), 400
     
     try:
-        # Extract contacts using the existing function
+        # Static websites are extracted over plain HTTP without taking a tab
+        fast_results = extract_contacts_http_first(url, candidates=candidates)
+        
+        # Otherwise extract contacts on a tab checked out from the shared pool,
+        # so overlapping requests never drive the same page
         # Note: This requires Chrome to be running with --remote-debugging-port=9222
         # For production deployment, you might need to use a headless browser service
-        result = extract_contacts(url, page=None)
+        try:
+            if fast_results:
+                result = fast_results, None
+            else:
+                with get_tab_pool().tab() as tab:
+                    result = extract_contacts(url, page=tab, http_first=False, candidates=candidates)
+                    if result[1] is None:
+                        # The tab died during extraction: don't put it back in the pool
+                        get_tab_pool().mark_broken(tab)
+        except TabPoolExhausted as e:
+            return jsonify({
+                "success": False,
+                "error": str(e),
+                "url": url
+            }), 503
         
         if result is None:
             return jsonify({
@@ -98,14 +130,19 @@ def extract_contact_api():
             print(f"Phone: {phone if phone else 'Not found'}")
             print("=" * 60 + "\n")
             
+            data = {
+                "name": name,
+                "email": email,
+                "phone": phone,
+                "phone_e164": results.get('phone_e164') or '',
+                "url": url
+            }
+            # Ranked alternatives with their evidence, when asked for
+            if 'candidates' in results:
+                data["candidates"] = results['candidates']
             return jsonify({
                 "success": True,
-                "data": {
-                    "name": name,
-                    "email": email,
-                    "phone": phone,
-                    "url": url
-                }
+                "data": data
             }), 200
         else:
             return jsonify({
@@ -144,62 +181,84 @@ def extract_contact_batch_api():
         results = []
         errors = []
         
-        # Import page connection
-        from DrissionPage import ChromiumPage
+        # Check out one tab from the pool for the whole batch
         try:
-            page = ChromiumPage(addr_or_opts=9222)
+            tab = get_tab_pool().checkout()
         except Exception as e:
             return jsonify({
                 "success": False,
                 "error": f"Failed to connect to browser: {str(e)}"
             }), 500
         
-        for url in urls:
-            if not url.startswith(('http://', 'https://')):
-                errors.append({
-                    "url": url,
-                    "error": "Invalid URL format"
-                })
-                continue
-            
-            try:
-                result = extract_contacts(url, page=page)
-                if result is None:
+        page = tab
+        # Set when a lost tab couldn't be replaced: the remaining URLs are
+        # reported as failed rather than extracted in browsers outside the pool
+        no_tab = None
+        try:
+            for url in urls:
+                if no_tab:
                     errors.append({
                         "url": url,
-                        "error": "Failed to extract contacts"
+                        "error": f"No browser tab available: {no_tab}"
                     })
                     continue
+                if not url.startswith(('http://', 'https://')):
+                    errors.append({
+                        "url": url,
+                        "error": "Invalid URL format"
+                    })
+                    continue
+            
+                try:
+                    result = extract_contacts(url, page=page)
+                    if result is None:
+                        errors.append({
+                            "url": url,
+                            "error": "Failed to extract contacts"
+                        })
+                        continue
                 
-                extracted_results, page = result
-                if extracted_results:
-                    name = clean_name(extracted_results.get('name', '') or '')
-                    email = extracted_results.get('email', '') or ''
-                    phone = extracted_results.get('phone', '') or ''
+                    extracted_results, page = result
+                    if page is None:
+                        # The tab died during extraction: replace it for the remaining URLs
+                        get_tab_pool().checkin(tab, broken=True)
+                        tab = None
+                        try:
+                            tab = page = get_tab_pool().checkout()
+                        except Exception as e:
+                            no_tab = str(e)
+                    if extracted_results:
+                        name = clean_name(extracted_results.get('name', '') or '')
+                        email = extracted_results.get('email', '') or ''
+                        phone = extracted_results.get('phone', '') or ''
                     
-                    # Print result to console
-                    print(f"✅ [{len(results) + 1}/{len(urls)}] {url[:50]}...")
-                    print(f"   Name:  {name if name else 'Not found'}")
-                    print(f"   Email: {email if email else 'Not found'}")
-                    print(f"   Phone: {phone if phone else 'Not found'}\n")
+                        # Print result to console
+                        print(f"✅ [{len(results) + 1}/{len(urls)}] {url[:50]}...")
+                        print(f"   Name:  {name if name else 'Not found'}")
+                        print(f"   Email: {email if email else 'Not found'}")
+                        print(f"   Phone: {phone if phone else 'Not found'}\n")
                     
-                    results.append({
-                        "url": url,
-                        "name": name,
-                        "email": email,
-                        "phone": phone
-                    })
-                else:
-                    print(f"❌ Failed to extract from: {url}\n")
+                        results.append({
+                            "url": url,
+                            "name": name,
+                            "email": email,
+                            "phone": phone,
+                            "phone_e164": extracted_results.get('phone_e164') or ''
+                        })
+                    else:
+                        print(f"❌ Failed to extract from: {url}\n")
+                        errors.append({
+                            "url": url,
+                            "error": "Failed to extract contacts"
+                        })
+                except Exception as e:
                     errors.append({
                         "url": url,
-                        "error": "Failed to extract contacts"
+                        "error": str(e)
                     })
-            except Exception as e:
-                errors.append({
-                    "url": url,
-                    "error": str(e)
-                })
+        finally:
+            if tab is not None:
+                get_tab_pool().checkin(tab)
         
         return jsonify({
             "success": True,
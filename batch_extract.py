@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Batch Extract - Run the text extractors over large document corpora on every core
+
+extract_email_from_text, extract_phone_from_text and clean_name work on one
+string; extract_texts() runs them over an iterable of documents (scraped
+text dumps, millions of pages) in a process pool and streams the results
+back in input order. Documents are sent to the workers in chunks, to
+amortize pickling, and only a few chunks per worker are in flight at a
+time, so memory stays flat however large the input is.
+
+A document is either a string (the page text) or a dict with 'text' and,
+optionally, 'name' (cleaned with clean_name), 'url' (picks the phone
+numbering plan) and 'id' (copied to the result). Anything else (a number,
+a list, null, a line that is not JSON) gets a result with just 'error'
+(and 'id', when there is one), so one bad record never stops a run.
+
+Usage:
+    from batch_extract import extract_texts
+
+    for result in extract_texts(documents):
+        print(result['email'], result['phone'], result['phone_e164'])
+
+    # Command line: one JSON document per line (or plain text with --text), JSON lines out
+    python batch_extract.py corpus.jsonl [--output results.jsonl] [--workers N] [--chunk-size N]
+
+Configuration (environment variables):
+    EXTRACT_BATCH_CHUNK      Documents handed to a worker process at a time (default: 256)
+    EXTRACT_BATCH_INFLIGHT   Chunks queued per worker; bounds memory (default: 2)
+"""
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import contextlib
+import itertools
+import json
+import sys
+import io
+import os
+
+
+BATCH_CHUNK = int(os.environ.get('EXTRACT_BATCH_CHUNK', '256'))
+BATCH_INFLIGHT = int(os.environ.get('EXTRACT_BATCH_INFLIGHT', '2'))
+
+
+def _run_chunk(func, chunk):
+    """Apply func to every item of a chunk (worker process)"""
+    # The extractors narrate their progress; only the results matter here
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [func(item) for item in chunk]
+
+
+def imap_chunks(func, items, workers=None, chunk_size=BATCH_CHUNK):
+    """Like executor.map(func, items), but reads `items` lazily and yields results in order
+
+    At most BATCH_INFLIGHT chunks per worker are pending, so neither the input
+    nor the results pile up in memory. func must be picklable (module level).
+    """
+    workers = workers or os.cpu_count() or 1
+    items = iter(items)
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while len(pending) < workers * BATCH_INFLIGHT:
+                chunk = list(itertools.islice(items, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_run_chunk, func, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def _document_error(document):
+    """Why a document can't be extracted, or None if it can"""
+    if isinstance(document, Exception):
+        return str(document)
+    if not isinstance(document, dict):
+        return f"unsupported record: expected a string or an object, got {type(document).__name__}"
+    for field in ('text', 'name', 'url'):
+        if document.get(field) is not None and not isinstance(document[field], str):
+            return f"unsupported record: '{field}' is a {type(document[field]).__name__}, not a string"
+    return None
+
+
+def extract_document(document):
+    """Email, phone (with its E.164 form) and cleaned name of one document
+
+    Records that are not a document get {'error': ...} instead of a result.
+    """
+    from extract_contacts import extract_email_from_text, extract_phone_from_text, clean_name, normalize_found_phone
+
+    if isinstance(document, str):
+        document = {'text': document}
+    error = _document_error(document)
+    if error:
+        if isinstance(document, dict) and 'id' in document:
+            return {'id': document['id'], 'error': error}
+        return {'error': error}
+    text = document.get('text') or ''
+    phone, phone_e164 = normalize_found_phone(extract_phone_from_text(text), document.get('url'))
+    result = {
+        'email': extract_email_from_text(text),
+        'phone': phone,
+        'phone_e164': phone_e164,
+    }
+    if document.get('name') is not None:
+        result['name'] = clean_name(document['name'])
+    if 'id' in document:
+        result = {'id': document['id'], **result}
+    return result
+
+
+def extract_texts(documents, workers=None, chunk_size=BATCH_CHUNK):
+    """Extract contacts from every document, in parallel; yields one result per document, in order"""
+    return imap_chunks(extract_document, documents, workers=workers, chunk_size=chunk_size)
+
+
+def read_documents(f, plain_text=False):
+    """Documents from a file: one JSON object (or, with plain_text, one text) per line
+
+    A line that is not valid JSON is yielded as a ValueError, which
+    extract_document() reports as that line's error.
+    """
+    for number, line in enumerate(f, 1):
+        line = line.rstrip('\n')
+        if plain_text:
+            yield line
+        elif line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield ValueError(f"line {number}: invalid JSON ({e})")
+
+
+def main():
+    """Command line: extract contacts from a corpus file"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Extract emails, phones and names from a corpus of documents")
+    parser.add_argument('input', nargs='?', default='-',
+                        help="JSON lines file ({\"text\": ..., \"name\": ..., \"url\": ..., \"id\": ...}), - for stdin")
+    parser.add_argument('--text', action='store_true',
+                        help="Input is plain text, one document per line")
+    parser.add_argument('--output', default=None,
+                        help="Write JSON lines here instead of stdout")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument('--chunk-size', type=int, default=BATCH_CHUNK,
+                        help=f"Documents per worker task (default: {BATCH_CHUNK})")
+    args = parser.parse_args()
+
+    if args.input != '-' and not os.path.isfile(args.input):
+        print(f"❌ Error: input file not found: {args.input}", file=sys.stderr)
+        sys.exit(1)
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    count = errors = 0
+    try:
+        for result in extract_texts(read_documents(source, args.text), workers=args.workers,
+                                    chunk_size=args.chunk_size):
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+            count += 1
+            errors += 'error' in result
+    finally:
+        if args.input != '-':
+            source.close()
+        if args.output:
+            out.close()
+    print(f"✅ Extracted {count} documents", file=sys.stderr)
+    if errors:
+        print(f"   ⚠️  {errors} records could not be extracted (see their 'error')", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
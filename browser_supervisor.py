@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""
+Browser Supervisor - Keep one headless Chromium alive for the whole process
+
+Instead of hunting for a Chromium binary and sleeping for it to boot whenever
+a request can't reach port 9222, the supervisor launches the browser once at
+process start and keeps it healthy in a background thread:
+
+- Health checks poll the DevTools endpoint (/json/version); a crashed or
+  unresponsive browser is restarted.
+- The browser is recycled after a configurable number of pages or once its
+  process tree exceeds a memory budget, at a moment when no page is in use.
+  While a recycle is pending, new leases wait for the pages in use to finish
+  (drain mode), so steady traffic can't postpone it forever; pages still in
+  use after CHROME_DRAIN_TIMEOUT are given up and the browser is recycled.
+
+Usage:
+    from browser_supervisor import get_supervisor
+
+    supervisor = get_supervisor()      # launches the browser on first call
+    page = supervisor.get_page()
+    with supervisor.lease():
+        extract_contacts(url, page=page)
+
+Leases and generations are counted per process, so one server process
+must own the browser: run gunicorn with a single worker and use threads
+for concurrency (Procfile, Dockerfile).
+
+Configuration (environment variables):
+    CHROME_DEBUG_PORT         Remote debugging port (default: 9222)
+    CHROME_MAX_PAGES          Recycle after this many pages (default: 500, 0 = never)
+    CHROME_MAX_RSS_MB         Recycle above this resident memory (default: 1500, 0 = never)
+    CHROME_HEALTH_INTERVAL    Seconds between health checks (default: 15)
+    CHROME_DRAIN_TIMEOUT      Max seconds new leases wait for a pending recycle (default: 60)
+    CHROME_USER_DATA_DIR      Profile directory (default: a temporary directory)
+    CHROMIUM_FLAGS            Launch flags (default: headless, no sandbox, no GPU)
+"""
+from DrissionPage import ChromiumPage
+from contextlib import contextmanager
+import subprocess
+import threading
+import tempfile
+import urllib.request
+import atexit
+import signal
+import shutil
+import time
+import os
+
+
+DEFAULT_FLAGS = [
+    '--headless',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-software-rasterizer',
+    '--disable-extensions',
+]
+
+
+def is_production_environment():
+    """Check if we're running on Render, Heroku or in Docker"""
+    return bool(os.environ.get('RENDER') or os.environ.get('DYNO') or os.path.exists('/.dockerenv'))
+
+
+def find_chromium_executable():
+    """Find a Chromium/Chrome executable to launch"""
+    from extract_contacts import get_playwright_chromium_path
+
+    # An explicit override wins everywhere
+    chromium_paths = [os.environ.get('CHROMIUM_PATH')]
+
+    # In Docker, prioritize system Chromium; elsewhere try Playwright's first
+    if not os.path.exists('/.dockerenv'):
+        playwright_path = get_playwright_chromium_path()
+        if playwright_path:
+            chromium_paths.append(playwright_path)
+
+    # Chromium in PATH, then standard Linux locations
+    chromium_paths.extend([
+        shutil.which('chromium-browser') or shutil.which('chromium') or shutil.which('google-chrome'),
+        '/usr/bin/chromium',
+        '/usr/bin/chromium-browser',
+        '/usr/bin/google-chrome',
+        '/usr/bin/google-chrome-stable',
+        '/snap/bin/chromium',
+        os.path.expanduser('~/.local/bin/chromium-browser'),
+        os.path.expanduser('~/.local/chromium/chrome'),
+    ])
+
+    for chromium_path in chromium_paths:
+        if chromium_path and os.path.exists(chromium_path) and os.access(chromium_path, os.X_OK):
+            return chromium_path
+    return None
+
+
+def process_tree_rss_mb(pid):
+    """Resident memory of a process and all its descendants in MB (Linux only)"""
+    try:
+        children = {}
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    # Field 4 is the parent PID; the command name (field 2) may contain spaces
+                    ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+                children.setdefault(ppid, []).append(int(entry))
+            except (OSError, ValueError, IndexError):
+                continue
+
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        total = 0
+        stack = [pid]
+        while stack:
+            current = stack.pop()
+            try:
+                with open(f'/proc/{current}/statm') as f:
+                    total += int(f.read().split()[1]) * page_size
+            except (OSError, ValueError, IndexError):
+                continue
+            stack.extend(children.get(current, []))
+        return total / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class BrowserSupervisor:
+    """Launches one Chromium, restarts it when it dies and recycles it when it grows"""
+
+    def __init__(self, port=None, max_pages=None, max_rss_mb=None, health_interval=None,
+                 user_data_dir=None, flags=None, drain_timeout=None):
+        self.port = port or int(os.environ.get('CHROME_DEBUG_PORT', 9222))
+        self.max_pages = int(max_pages if max_pages is not None else os.environ.get('CHROME_MAX_PAGES', 500))
+        self.max_rss_mb = float(max_rss_mb if max_rss_mb is not None else os.environ.get('CHROME_MAX_RSS_MB', 1500))
+        self.health_interval = float(health_interval or os.environ.get('CHROME_HEALTH_INTERVAL', 15))
+        self.drain_timeout = float(drain_timeout if drain_timeout is not None else
+                                   os.environ.get('CHROME_DRAIN_TIMEOUT', 60))
+        self.user_data_dir = user_data_dir or os.environ.get('CHROME_USER_DATA_DIR') or \
+            tempfile.mkdtemp(prefix='extract_contacts_chrome_')
+        if flags is None:
+            flags = os.environ.get('CHROMIUM_FLAGS', '').split() or DEFAULT_FLAGS
+        self.flags = flags
+
+        self.executable = None
+        self.generation = 0
+        self._process = None
+        self._lock = threading.RLock()
+        # Notified after every restart, for leases waiting out a recycle
+        self._restarted = threading.Condition(self._lock)
+        self._active = 0
+        self._pages_served = 0
+        self._recycle_reason = None
+        self._stop = threading.Event()
+        self._monitor = None
+
+    # -- DevTools endpoint ---------------------------------------------------
+
+    def is_responding(self, timeout=3):
+        """Check the DevTools HTTP endpoint of the browser"""
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{self.port}/json/version', timeout=timeout) as resp:
+                return resp.status == 200
+        except Exception:
+            return False
+
+    def _wait_until_ready(self, timeout=30):
+        """Poll the DevTools endpoint until the browser answers"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.is_responding(timeout=1):
+                return True
+            if self._process is not None and self._process.poll() is not None:
+                return False
+            time.sleep(0.1)
+        return False
+
+    # -- Process lifecycle ---------------------------------------------------
+
+    def _launch(self):
+        """Start the browser process and wait for its DevTools endpoint"""
+        if self.executable is None:
+            self.executable = find_chromium_executable()
+            if self.executable is None:
+                raise Exception("Could not find a Chromium/Chrome executable to launch")
+
+        print(f"🚀 Starting browser: {self.executable} (port {self.port})")
+        started = time.time()
+        self._process = subprocess.Popen(
+            [self.executable, f'--remote-debugging-port={self.port}',
+             f'--user-data-dir={self.user_data_dir}'] + self.flags + ['about:blank'],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        if not self._wait_until_ready():
+            self._terminate()
+            raise Exception(f"Browser did not open its DevTools endpoint on port {self.port}")
+
+        self.generation += 1
+        self._pages_served = 0
+        self._recycle_reason = None
+        print(f"   ✅ Browser ready in {time.time() - started:.1f}s (generation {self.generation})")
+
+    def _terminate(self):
+        """Stop the browser process and everything it spawned"""
+        process, self._process = self._process, None
+        if process is None or process.poll() is not None:
+            return
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            process.wait(timeout=5)
+        except Exception:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except Exception:
+                pass
+
+    def start(self):
+        """Launch the browser (unless one already answers on the port) and start health checks"""
+        with self._lock:
+            if self._process is None:
+                if self.is_responding():
+                    # Another process (e.g. a Chrome started by hand) already runs it
+                    print(f"ℹ️  Browser already running on port {self.port}, not launching another")
+                else:
+                    self._launch()
+            if self._monitor is None:
+                self._monitor = threading.Thread(target=self._monitor_loop, name='browser-supervisor', daemon=True)
+                self._monitor.start()
+        return self
+
+    def restart(self, reason):
+        """Replace the browser process with a fresh one"""
+        with self._lock:
+            print(f"🔄 Restarting browser: {reason}")
+            self._terminate()
+            try:
+                self._launch()
+            except Exception as e:
+                print(f"   ❌ Browser restart failed: {e}")
+            self._restarted.notify_all()
+
+    def stop(self):
+        """Stop health checks and the browser"""
+        self._stop.set()
+        with self._lock:
+            self._terminate()
+
+    # -- Health checks and recycling ------------------------------------------
+
+    def _monitor_loop(self):
+        """Background thread: restart on crash/hang, flag recycling on memory growth"""
+        failures = 0
+        while not self._stop.wait(self.health_interval):
+            owned = self._process is not None
+            crashed = owned and self._process.poll() is not None
+            if not crashed and self.is_responding(timeout=5):
+                failures = 0
+            else:
+                failures += 1
+
+            if crashed or failures >= 2:
+                if owned or not self.is_responding():
+                    self.restart("browser crashed" if crashed else "browser not responding")
+                failures = 0
+                continue
+
+            if owned and self.max_rss_mb > 0 and self._recycle_reason is None:
+                rss = process_tree_rss_mb(self._process.pid)
+                if rss is not None and rss > self.max_rss_mb:
+                    self._request_recycle(f"memory {rss:.0f} MB > {self.max_rss_mb:.0f} MB")
+
+    def _request_recycle(self, reason):
+        """Recycle now if idle, otherwise as soon as the last lease is returned"""
+        with self._lock:
+            self._recycle_reason = reason
+            if self._active == 0:
+                self.restart(f"recycling ({reason})")
+
+    def _recycle_pending(self):
+        return self._recycle_reason is not None and self._process is not None
+
+    def acquire(self):
+        """Mark a page as in use so recycling waits for it to finish
+
+        While a recycle is pending, wait for it (drain mode); after
+        drain_timeout the browser is recycled under the pages still in use.
+        """
+        with self._lock:
+            deadline = time.monotonic() + self.drain_timeout
+            while self._recycle_pending():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.restart(f"recycling ({self._recycle_reason}), "
+                                 f"{self._active} pages still in use after {self.drain_timeout:.0f}s")
+                    break
+                self._restarted.wait(remaining)
+            self._active += 1
+
+    def release(self):
+        """Mark a page as done; recycle if it was due and nothing else is in use"""
+        with self._lock:
+            self._active -= 1
+            self._pages_served += 1
+            if (self._process is not None and self.max_pages > 0 and
+                    self._pages_served >= self.max_pages and self._recycle_reason is None):
+                self._recycle_reason = f"{self._pages_served} pages served"
+            if self._recycle_reason and self._active == 0 and self._process is not None:
+                self.restart(f"recycling ({self._recycle_reason})")
+
+    @contextmanager
+    def lease(self):
+        """Hold the browser for the duration of a `with` block"""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_page(self):
+        """Connect DrissionPage to the supervised browser"""
+        return ChromiumPage(addr_or_opts=self.port)
+
+
+_supervisor = None
+_supervisor_lock = threading.Lock()
+
+
+def get_supervisor():
+    """Return the process-wide supervisor, launching the browser on first call"""
+    global _supervisor
+    if _supervisor is None:
+        with _supervisor_lock:
+            if _supervisor is None:
+                supervisor = BrowserSupervisor().start()
+                atexit.register(supervisor.stop)
+                _supervisor = supervisor
+    return _supervisor
+
+
+def running_supervisor():
+    """Return the supervisor if one was started in this process, else None"""
+    return _supervisor
@@ -48,4 +48,11 @@ for cache_dir in cache_dirs:
         print(f'  {cache_dir}: not found')
 "
 
+# Resolve the browser once now and cache it, so workers skip discovery at boot
+echo "📝 Caching Chromium location..."
+python -c "
+from extract_contacts import get_playwright_chromium_path
+get_playwright_chromium_path()
+" || echo "⚠️  Could not cache Chromium location (will be resolved at runtime)"
+
 echo "✅ Chromium installation complete via Playwright"
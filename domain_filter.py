@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Domain Filter - Email domains that are never a page's contact, indexed for suffix lookups
+
+Pages are full of addresses that aren't anyone's contact: placeholders
+(you@example.com), platform mailboxes (Facebook) and error-reporting
+ingestion addresses (…@o123.ingest.sentry.io, …@sentry.wixpress.com).
+A DomainFilter holds a blocklist and an allowlist of domains; a domain
+matches its own entry and every subdomain's, and the most specific entry
+wins, so an allowlisted subdomain of a blocked domain stays allowed.
+
+Rules are kept in one dict keyed by domain, and a lookup tries the address's
+domain and each of its parent domains: one hash lookup per label, whether
+the lists hold 10 entries or 100,000.
+
+List files hold one domain per line ('#' starts a comment; a leading '@' or
+'*.' is ignored) and are added to the built-in blocklist.
+
+Usage:
+    from domain_filter import is_blocked_email
+
+    if not is_blocked_email('info@shop.pt'):
+        ...
+
+Configuration (environment variables):
+    EXTRACT_EMAIL_BLOCKLIST    Comma-separated blocklist files (default: built-in list only)
+    EXTRACT_EMAIL_ALLOWLIST    Comma-separated allowlist files (default: none)
+"""
+import os
+
+
+BLOCKLIST_FILES = [p for p in os.environ.get('EXTRACT_EMAIL_BLOCKLIST', '').split(',') if p.strip()]
+ALLOWLIST_FILES = [p for p in os.environ.get('EXTRACT_EMAIL_ALLOWLIST', '').split(',') if p.strip()]
+
+# Fake/example, platform and error-reporting domains that are never a page's contact
+DEFAULT_BLOCKED_DOMAINS = [
+    'example.com', 'test.com', 'domain.com', 'email.com',
+    'facebook.com', 'placeholder.com', 'yourdomain.com',
+    'sentry.io', 'wixpress.com',
+]
+
+
+def normalize_domain(domain):
+    """Lowercase domain without list-file decorations ('@', '*.', trailing dot)"""
+    domain = domain.strip().lower().rstrip('.')
+    if domain.startswith('@'):
+        domain = domain[1:]
+    if domain.startswith('*.'):
+        domain = domain[2:]
+    return domain
+
+
+def read_domain_list(path):
+    """Domains listed in a file, one per line"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            domain = normalize_domain(line.split('#', 1)[0])
+            if domain:
+                yield domain
+
+
+class DomainFilter:
+    """Blocked/allowed domains; a lookup walks the domain's suffixes, most specific first"""
+
+    def __init__(self, blocked=(), allowed=()):
+        # domain -> True (blocked) / False (allowed)
+        self.rules = {}
+        self.block(blocked)
+        self.allow(allowed)
+
+    def block(self, domains):
+        for domain in domains:
+            self.rules[normalize_domain(domain)] = True
+
+    def allow(self, domains):
+        for domain in domains:
+            self.rules[normalize_domain(domain)] = False
+
+    def blocks_domain(self, domain):
+        """Whether the domain (or the closest parent domain with a rule) is blocked"""
+        domain = domain.lower().rstrip('.')
+        start = 0
+        while True:
+            rule = self.rules.get(domain[start:])
+            if rule is not None:
+                return rule
+            start = domain.find('.', start) + 1
+            if not start:
+                return False
+
+    def blocks(self, email):
+        """Whether an address belongs to a blocked domain"""
+        return self.blocks_domain(email.rpartition('@')[2])
+
+    def __len__(self):
+        return len(self.rules)
+
+
+_domain_filter = None
+
+
+def get_domain_filter():
+    """Return the filter built from the built-in blocklist and the configured list files"""
+    global _domain_filter
+    if _domain_filter is None:
+        domain_filter = DomainFilter(DEFAULT_BLOCKED_DOMAINS)
+        for paths, add in ((BLOCKLIST_FILES, domain_filter.block), (ALLOWLIST_FILES, domain_filter.allow)):
+            for path in paths:
+                try:
+                    add(read_domain_list(path.strip()))
+                except OSError as e:
+                    print(f"   ⚠️  Could not read email domain list {path}: {e}")
+        _domain_filter = domain_filter
+    return _domain_filter
+
+
+def is_blocked_email(email):
+    """Whether an address is a placeholder/platform one that is never a page's contact"""
+    return get_domain_filter().blocks(email)
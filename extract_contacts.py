@@ -6,6 +6,9 @@ Usage:
     # Single URL mode (returns JSON):
     python extract_contacts.py <URL>
     
+    # Also rank every phone/email found, with scores and evidence:
+    python extract_contacts.py <URL> --candidates
+    
     # HTTP API server mode:
     python extract_contacts.py --server
 
@@ -15,36 +18,777 @@ Example:
     
     # Start HTTP API server:
     python extract_contacts.py --server
-    # Then call: http://localhost:5000/extract?url=<URL>
+    # Then call: http://localhost:5000/extract?url=<URL>[&candidates=1]
 """
 from DrissionPage import ChromiumPage
+from DrissionPage.errors import PageDisconnectedError, BrowserConnectError, TargetNotFoundError
+import functools
 import time
 import re
 import sys
-import csv
 import os
 import json
 from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
 
+from strategy_stats import get_strategy_stats
+from page_archive import get_page_archive
+from domain_filter import is_blocked_email
+from name_normalizer import normalize_name
+from phone_numbers import normalize_phone, country_for_url, IMPOSSIBLE
 
-def get_playwright_chromium_path():
-    """Get the path to Playwright's Chromium browser"""
-    import glob
+
+# In-page scripts (function bodies run via page.run_js); shared with the async engine
+
+# Find the Facebook page name (h1 first, then page-name spans)
+FACEBOOK_NAME_JS = """
+// Method 1: Find h1 with page name (most reliable)
+const h1s = document.querySelectorAll('h1');
+for (let h1 of h1s) {
+    const text = h1.textContent.trim();
+    // Filter out common UI elements
+    if (text && text.length > 2 && text.length < 200 && 
+        !text.match(/^\\d+/) && 
+        !['Facebook', 'Home', 'Posts', 'About', 'Contact', 'Menu', '简介', '帖子'].includes(text) &&
+        !text.includes('粉丝') && !text.includes('followers') && !text.includes('likes')) {
+        return text;
+    }
+}
+
+// Method 2: Find span with page name near profile picture
+const spans = document.querySelectorAll('span[dir="auto"]');
+const candidates = [];
+for (let span of spans) {
+    const text = span.textContent.trim();
+    if (text && text.length > 2 && text.length < 200 && 
+        !text.match(/^\\d+/) && 
+        !['Facebook', 'Home', 'Posts', 'About', 'Contact', 'Menu', '简介', '帖子'].includes(text) &&
+        !text.includes('粉丝') && !text.includes('followers') && !text.includes('likes')) {
+        candidates.push(text);
+    }
+}
+// Return the first candidate that looks like a name (has letters)
+for (let candidate of candidates) {
+    if (/[a-zA-ZÀ-ÿ]/.test(candidate)) {
+        return candidate;
+    }
+}
+
+return null;
+"""
+
+# Read og:title / title meta tags
+META_TITLE_JS = """
+const meta = document.querySelector('meta[property="og:title"]') || 
+            document.querySelector('meta[name="title"]');
+return meta ? (meta.content || '').trim() : null;
+"""
+
+# Find phone and email in the Facebook Intro/About section. One TreeWalker
+# pass indexes the text nodes (with offsets) and the phone/email icons;
+# every lookup afterwards works on that index, so the cost is linear in the DOM.
+FACEBOOK_CONTACT_JS = r"""
+const SKIP_TAGS = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE']);
+// Intro/About containers; numbers outside them need an icon or a contact context
+const CONTAINER_SELECTOR = '[role="main"], [data-pagelet], [class*="intro" i], [class*="about" i]';
+const EMAIL_RE = /\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b/;
+// Common PT formats seen in Facebook Intro (prefer formatted/WhatsApp style)
+const PHONE_PATTERNS = [
+    /\+\d{1,4}\s+\d{3}\s+\d{3}\s+\d{3,4}\b/,      // +351 911 744 738
+    /\b\d{2,3}\s+\d{3}\s+\d{3,4}\b/,              // 22 093 1950 / 966 043 960 / 21 932 4069
+    /\b\d{3}[-\s]\d{3}[-\s]\d{3,4}\b/             // 966-043-960
+];
+const PHONE_WORD_RE = /phone|telephone|tel|telefone|call|whatsapp/i;
+const CONTEXT_PHONE_RE = /\b(\d{2,3}\s+\d{3}\s+\d{3,4})\b/g;
+const CONTEXT_WORDS = ['@', 'email', 'address', 'morada', 'intro', 'about'];
+const ROW_LENGTH = 200;
+
+function extractPhoneFromText(text) {
+    if (!text) return null;
+    for (const re of PHONE_PATTERNS) {
+        const m = text.match(re);
+        if (m) return m[0].trim();
+    }
+    return null;
+}
+
+function extractEmailFromText(text) {
+    const m = text ? text.match(EMAIL_RE) : null;
+    return m ? m[1].trim() : null;
+}
+
+// 'phone' / 'email' for icons that label a contact row, else null
+function iconType(el) {
+    if (el.localName === 'img') {
+        const src = el.getAttribute('src') || '';
+        const alt = (el.getAttribute('alt') || '').toLowerCase();
+        return (src.includes('VIGUiR6qVQJ') || alt.includes('whats')) ? 'phone' : null;
+    }
+    if (el.localName === 'svg') {
+        const label = ((el.getAttribute('aria-label') || '') + ' ' + (el.getAttribute('title') || '')).toLowerCase();
+        if (/phone|telephone|call|whats/.test(label)) return 'phone';
+        if (/mail|envelope/.test(label)) return 'email';
+    }
+    return null;
+}
+
+// --- Index: text nodes in document order and icon markers between them ---
+const texts = [];    // {text, start, inContainer}
+const markers = [];  // {type, index}: icon placed right before texts[index]
+const containers = [];
+let length = 0;
+
+function enter(node) {
+    if (node.nodeType === Node.TEXT_NODE) {
+        const text = node.nodeValue.replace(/\u00a0/g, ' ').trim();
+        if (text) {
+            texts.push({text: text, start: length, inContainer: containers.length > 0});
+            length += text.length + 1;
+        }
+        return false;
+    }
+    if (SKIP_TAGS.has(node.tagName)) return false;
+    const icon = iconType(node);
+    if (icon) markers.push({type: icon, index: texts.length});
+    if (node.localName === 'svg') return false;
+    if (node.matches(CONTAINER_SELECTOR)) containers.push(node);
+    return true;
+}
+
+function exit(node) {
+    if (containers.length && containers[containers.length - 1] === node) containers.pop();
+}
+
+const root = document.body;
+const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT);
+let descend = enter(root);
+let done = false;
+while (!done) {
+    if (descend && walker.firstChild()) {
+        descend = enter(walker.currentNode);
+        continue;
+    }
+    // Leaf (or skipped subtree): leave it, then move to the next sibling or up
+    while (true) {
+        exit(walker.currentNode);
+        if (walker.currentNode === root) { done = true; break; }
+        if (walker.nextSibling()) { descend = enter(walker.currentNode); break; }
+        walker.parentNode();
+    }
+}
+const fullText = texts.map(t => t.text).join('\n');
+
+// Text right after an icon (the row it labels), then right before it
+function iconWindows(marker) {
+    const after = [];
+    let size = 0;
+    for (let i = marker.index; i < texts.length && size < ROW_LENGTH; i++) {
+        after.push(texts[i].text);
+        size += texts[i].text.length;
+    }
+    const before = texts.slice(Math.max(0, marker.index - 3), marker.index).map(t => t.text);
+    return [after.join('\n'), before.join('\n')];
+}
+
+// Short rows inside the Intro/About containers
+function isRow(entry) {
+    return entry.inContainer && entry.text.length <= ROW_LENGTH && !entry.text.toLowerCase().includes('followers');
+}
+
+// Lookup methods per field; contactStrategy (set by the bundle) may drop some
+// of them. Each method passes the values it finds, in order, to emit() and
+// stops once emit() returns true. The method that produced each field is
+// reported back.
+const phoneMethods = {
+    // Text next to a phone icon
+    icon: emit => {
+        for (const marker of markers) {
+            if (marker.type !== 'phone') continue;
+            for (const text of iconWindows(marker)) {
+                const p = extractPhoneFromText(text);
+                if (p && emit(p)) return;
+            }
+        }
+    },
+    // Intro rows with a phone keyword (the number may sit in the next node)
+    keyword: emit => {
+        for (let i = 0; i < texts.length; i++) {
+            if (!isRow(texts[i]) || !PHONE_WORD_RE.test(texts[i].text)) continue;
+            const next = texts[i + 1] && isRow(texts[i + 1]) ? texts[i + 1].text : '';
+            const p = extractPhoneFromText(texts[i].text + '\n' + next);
+            if (p && emit(p)) return;
+        }
+    },
+    // Any number in a contact context (near an email, address or Intro)
+    context: emit => {
+        for (const match of fullText.matchAll(CONTEXT_PHONE_RE)) {
+            const context = fullText.substring(Math.max(0, match.index - 100), match.index + 100).toLowerCase();
+            if (CONTEXT_WORDS.some(word => context.includes(word)) && emit(match[1].trim())) return;
+        }
+    }
+};
+const emailMethods = {
+    // Text next to an email icon
+    icon: emit => {
+        for (const marker of markers) {
+            if (marker.type !== 'email') continue;
+            for (const text of iconWindows(marker)) {
+                const e = extractEmailFromText(text);
+                if (e && emit(e)) return;
+            }
+        }
+    },
+    // Short Intro rows containing an address
+    row: emit => {
+        for (const entry of texts) {
+            if (isRow(entry) && entry.text.includes('@')) {
+                const e = extractEmailFromText(entry.text);
+                if (e && emit(e)) return;
+            }
+        }
+    }
+};
+
+const strategy = (typeof contactStrategy !== 'undefined' && contactStrategy) || {};
+const methods = {phone: null, email: null};
+const tried = {phone: [], email: []};
+
+function runMethods(field, available) {
+    for (const name of strategy[field] || Object.keys(available)) {
+        if (!available[name]) continue;
+        tried[field].push(name);
+        let value = null;
+        available[name](v => { value = v; return true; });
+        if (value) {
+            methods[field] = name;
+            return value;
+        }
+    }
+    return null;
+}
+
+const phone = runMethods('phone', phoneMethods);
+const email = runMethods('email', emailMethods);
+
+// Every value of every method, for ranked candidates (set by the bundle)
+const candidates = {phone: [], email: []};
+if (typeof collectCandidates !== 'undefined' && collectCandidates) {
+    for (const [field, available] of [['phone', phoneMethods], ['email', emailMethods]]) {
+        for (const name of Object.keys(available)) {
+            available[name](v => { candidates[field].push({value: v, method: name}); return false; });
+        }
+    }
+}
+
+return {phone: phone, email: email, methods: methods, tried: tried, candidates: candidates};
+"""
+
+# Check whether the page shows a phone icon
+PHONE_INDICATOR_JS = """
+const svgs = document.querySelectorAll('svg[aria-label*="phone" i], svg[aria-label*="telephone" i], svg[aria-label*="call" i]');
+return svgs.length > 0;
+"""
+
+# Remove modal/popup overlays
+CLOSE_POPUPS_JS = """
+document.querySelectorAll('.modal, .popup, .overlay').forEach(el => {
+    if (el.style) el.style.display = 'none';
+    el.remove();
+});
+document.body.style.overflow = 'auto';
+"""
+
+# Cut a page string down to windows around anything the Python extractors
+# could match: @ / mailto: / tel:, phone keywords, and digit runs long enough
+# to be a phone number (document order kept, overlapping windows merged)
+CONTACT_WINDOWS_JS = """
+const RADIUS = 150;
+const ANCHOR_RE = /@|mailto:|tel|phone|call|contact|电话|mobile|cell|\\+?\\d[\\d\\s\\-()]{7,30}\\d/gi;
+const windows = [];
+let start = -1;
+let end = -1;
+for (const match of source.matchAll(ANCHOR_RE)) {
+    const from = Math.max(0, match.index - RADIUS);
+    const to = Math.min(source.length, match.index + match[0].length + RADIUS);
+    if (from <= end) {
+        end = Math.max(end, to);
+        continue;
+    }
+    if (end > start) windows.push(source.substring(start, end));
+    start = from;
+    end = to;
+}
+if (end > start) windows.push(source.substring(start, end));
+// The '.' between windows keeps a pattern from matching across two of them
+return windows.join('\\n.\\n');
+"""
+
+# Return only the contact windows of the page to Python (EXTRACT_TEXT_WINDOWS=1)
+TEXT_WINDOWS = os.environ.get('EXTRACT_TEXT_WINDOWS', '0') == '1'
+
+# All in-page extraction work in one round trip: name candidates, Facebook
+# Intro contacts or the phone indicator, the raw page text the Python
+# extractors need, then popup cleanup. Built by extract_bundle_js().
+EXTRACT_BUNDLE_JS = """
+const isFacebook = __IS_FACEBOOK__;
+const contactStrategy = __STRATEGY__;
+const keepPage = __KEEP_PAGE__;
+const windowsOnly = __WINDOWS_ONLY__;
+const collectCandidates = __CANDIDATES__;
+function facebookName() {""" + FACEBOOK_NAME_JS + """}
+function metaTitle() {""" + META_TITLE_JS + """}
+function facebookContact() {""" + FACEBOOK_CONTACT_JS + """}
+function phoneIndicator() {""" + PHONE_INDICATOR_JS + """}
+function closePopups() {""" + CLOSE_POPUPS_JS + """}
+function contactWindows(source) {""" + CONTACT_WINDOWS_JS + """}
+
+const result = {
+    facebook_name: null,
+    h1s: Array.from(document.querySelectorAll('h1')).map(h1 => (h1.innerText || h1.textContent || '').trim()),
+    title: document.title,
+    meta_title: null,
+    phone: null,
+    email: null,
+    has_phone_indicator: false,
+    methods: {},
+    tried: {},
+    candidates: {},
+    html: null,
+    text: null
+};
+try { result.meta_title = metaTitle(); } catch (e) {}
+
+if (isFacebook) {
+    try { result.facebook_name = facebookName(); } catch (e) {}
+    const contact = facebookContact() || {};
+    result.phone = contact.phone || null;
+    result.email = contact.email || null;
+    result.methods = contact.methods || {};
+    result.tried = contact.tried || {};
+    result.candidates = contact.candidates || {};
+} else {
+    result.has_phone_indicator = phoneIndicator();
+}
+
+// Raw page for the Python extractors (on Facebook only when the Intro had no
+// email, or when the page gets archived or all candidates are wanted)
+if (!isFacebook || !result.email || keepPage || collectCandidates) {
+    result.html = document.documentElement.outerHTML;
+    result.text = document.body ? (document.body.innerText || '') : '';
+    // Ship only the parts the extractors can match instead of the whole page
+    if (windowsOnly) {
+        result.html = contactWindows(result.html);
+        result.text = contactWindows(result.text);
+    }
+}
+
+try { closePopups(); } catch (e) {}
+return result;
+"""
+
+
+def extract_bundle_js(facebook, plan=None, keep_page=False, candidates=False):
+    """The extraction bundle script for a Facebook or a general page
+
+    `plan` optionally limits the Intro lookup methods per field
+    ({'phone': [...], 'email': [...]}, see plan_extraction()). `keep_page`
+    always returns the whole HTML and text (for the page archive); otherwise
+    only the contact windows are returned when TEXT_WINDOWS is on.
+    `candidates` also returns every value the Intro lookup methods find.
+    """
+    strategy = json.dumps({field: plan[field] for field in ('phone', 'email') if field in plan}) if plan else 'null'
+    return (EXTRACT_BUNDLE_JS
+            .replace('__IS_FACEBOOK__', 'true' if facebook else 'false', 1)
+            .replace('__STRATEGY__', strategy, 1)
+            .replace('__KEEP_PAGE__', 'true' if keep_page else 'false', 1)
+            .replace('__WINDOWS_ONLY__', 'true' if TEXT_WINDOWS and not keep_page else 'false', 1)
+            .replace('__CANDIDATES__', 'true' if candidates else 'false', 1))
+
+
+# Readiness probe: does any target selector match yet, and how many resources have loaded
+READY_CHECK_JS = """
+const selectors = %s;
+let found = null;
+for (const sel of selectors) {
+    if (document.querySelector(sel)) { found = sel; break; }
+}
+return {
+    found: found,
+    href: location.href,
+    readyState: document.readyState,
+    resources: performance.getEntriesByType('resource').length
+};
+"""
+
+# Content that means a page is ready to be read
+PAGE_READY_SELECTORS = ['a[href^="mailto:"]', 'a[href^="tel:"]', 'h1']
+FACEBOOK_READY_SELECTORS = [
+    '[data-pagelet*="ProfileTilesFeed"]',
+    '[data-pagelet*="ProfileTimeline"]',
+    'img[src*="VIGUiR6qVQJ"]',
+    'a[href^="mailto:"]',
+]
+
+# Hard cap for a readiness wait, and how long the network must be quiet to count as idle
+READY_TIMEOUT = float(os.environ.get('EXTRACT_READY_TIMEOUT', 5))
+NETWORK_IDLE_TIME = 0.5
+
+
+class ReadyTracker:
+    """Decides from successive readiness probes whether a page is ready
+
+    With `leaving` (the URL before a click), probes of that URL don't count:
+    the old document is still there until the navigation commits.
+    """
+    
+    def __init__(self, timeout=READY_TIMEOUT, idle_time=NETWORK_IDLE_TIME, leaving=None):
+        self.deadline = time.time() + timeout
+        self.idle_time = idle_time
+        self.leaving = leaving
+        self._resources = None
+        self._changed_at = time.time()
     
-    # Method 1: Use Playwright's API
+    def update(self, state):
+        """Return 'content', 'idle' or 'timeout' once the wait is over, else None"""
+        now = time.time()
+        if state and self.leaving is not None and state.get('href') == self.leaving:
+            state = None
+        if state:
+            if state.get('found'):
+                return 'content'
+            if state.get('readyState') == 'complete':
+                if state.get('resources') != self._resources:
+                    self._resources = state.get('resources')
+                    self._changed_at = now
+                elif now - self._changed_at >= self.idle_time:
+                    return 'idle'
+        if now >= self.deadline:
+            return 'timeout'
+        return None
+
+
+def wait_for_ready(page, selectors, timeout=READY_TIMEOUT, interval=0.1, leaving=None):
+    """Wait until any target element exists or the network goes idle, up to `timeout` seconds
+
+    After a click, pass the URL it was made on as `leaving`, so the page being left doesn't count.
+    """
+    script = READY_CHECK_JS % json.dumps(list(selectors))
+    tracker = ReadyTracker(timeout, leaving=leaving)
+    while True:
+        try:
+            state = page.run_js(script)
+        except Exception:
+            state = None
+        outcome = tracker.update(state)
+        if outcome:
+            return outcome
+        time.sleep(interval)
+
+
+# Contact watcher: a MutationObserver (installed once per document as
+# window.__contactWatch) that records whether a phone number and an email
+# have shown up in the page, and how long the DOM has been quiet
+CONTACT_WATCH_JS = r"""
+const required = __FIELDS__;
+let watch = window.__contactWatch;
+if (!watch) {
+    const EMAIL_RE = /[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}/;
+    const PHONE_RE = /\b\d{2,3}[\s-]\d{3}[\s-]\d{3,4}\b/;
+    watch = window.__contactWatch = {seen: {phone: false, email: false}, lastMutation: Date.now()};
+    const scan = (node) => {
+        const text = node.nodeType === Node.TEXT_NODE ? node.nodeValue : node.textContent;
+        if (!text) return;
+        if (!watch.seen.email && EMAIL_RE.test(text)) watch.seen.email = true;
+        if (!watch.seen.phone && PHONE_RE.test(text)) watch.seen.phone = true;
+    };
+    const observer = new MutationObserver(records => {
+        watch.lastMutation = Date.now();
+        for (const record of records) {
+            if (record.type === 'characterData') scan(record.target);
+            for (const node of record.addedNodes) scan(node);
+        }
+        if (required.every(field => watch.seen[field])) observer.disconnect();
+    });
+    scan(document.body);
+    observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+}
+return {
+    phone: watch.seen.phone,
+    email: watch.seen.email,
+    quiet: (Date.now() - watch.lastMutation) / 1000
+};
+"""
+
+# Contact fields the watcher waits for, its hard cap, and how long the DOM must
+# be quiet to stop early with only some of them (or, twice as long, with none)
+CONTACT_WATCH_FIELDS = os.environ.get('EXTRACT_WATCH_FIELDS', 'phone,email')
+CONTACT_WATCH_TIMEOUT = float(os.environ.get('EXTRACT_WATCH_TIMEOUT', 8))
+CONTACT_WATCH_QUIET_TIME = 1.5
+
+
+def _watch_fields(fields):
+    """Normalize the watched fields to a list ('phone,email' -> ['phone', 'email'])"""
+    if fields is None:
+        fields = CONTACT_WATCH_FIELDS
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(',') if f.strip()]
+    return list(fields)
+
+
+def contact_watch_js(fields=None):
+    """The watcher script for the required fields ('phone', 'email')"""
+    return CONTACT_WATCH_JS.replace('__FIELDS__', json.dumps(_watch_fields(fields)), 1)
+
+
+class ContactWatch:
+    """Decides from successive watcher states whether the contact fields have rendered"""
+    
+    def __init__(self, fields=None, timeout=CONTACT_WATCH_TIMEOUT, quiet_time=CONTACT_WATCH_QUIET_TIME):
+        self.fields = _watch_fields(fields)
+        self.deadline = time.time() + timeout
+        self.quiet_time = quiet_time
+    
+    def update(self, state):
+        """Return 'complete', 'settled' or 'timeout' once the wait is over, else None"""
+        if state:
+            if all(state.get(field) for field in self.fields):
+                return 'complete'
+            seen_any = state.get('phone') or state.get('email')
+            quiet = state.get('quiet') or 0
+            if quiet >= (self.quiet_time if seen_any else 2 * self.quiet_time):
+                return 'settled'
+        if time.time() >= self.deadline:
+            return 'timeout'
+        return None
+
+
+def watch_for_contacts(page, fields=None, timeout=CONTACT_WATCH_TIMEOUT, interval=0.1):
+    """Wait until the required contact fields appear in the page, up to `timeout` seconds"""
+    script = contact_watch_js(fields)
+    watch = ContactWatch(fields, timeout)
+    while True:
+        try:
+            state = page.run_js(script)
+        except Exception:
+            state = None
+        outcome = watch.update(state)
+        if outcome:
+            return outcome
+        time.sleep(interval)
+
+
+# Selector race: index of the first selector (in priority order) that matches
+# right now, or -1; optionally clicks the winner
+SELECTOR_RACE_JS = """
+const selectors = %s;
+const click = %s;
+for (let i = 0; i < selectors.length; i++) {
+    const [kind, expr] = selectors[i];
+    const el = kind === 'xpath'
+        ? document.evaluate(expr, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : document.querySelector(expr);
+    if (el) {
+        if (click) {
+            el.scrollIntoView({block: 'center'});
+            el.click();
+        }
+        return i;
+    }
+}
+return -1;
+"""
+
+# Fallback chains, best first (DrissionPage locator syntax)
+ABOUT_SELECTORS = [
+    'xpath://a[contains(text(), "About")]',
+    'xpath://span[contains(text(), "About")]',
+    'xpath://a[contains(text(), "简介")]',
+    'xpath://span[contains(text(), "简介")]',
+]
+CONTACT_SELECTORS = [
+    'xpath://a[contains(translate(text(), "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"), "contact")]',
+    'xpath://a[contains(translate(@href, "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"), "contact")]',
+]
+
+
+def selector_race_js(selectors, click=False):
+    """The race probe for a list of 'css:' / 'xpath:' locators"""
+    specs = []
+    for selector in selectors:
+        kind, _, expr = selector.partition(':')
+        if kind not in ('css', 'xpath'):
+            kind, expr = 'css', selector
+        specs.append([kind, expr])
+    return SELECTOR_RACE_JS % (json.dumps(specs), 'true' if click else 'false')
+
+
+def race_selectors(page, selectors, timeout=3, interval=0.1, click=False):
+    """Wait for the first of several selectors under one shared deadline; returns the winner or None"""
+    script = selector_race_js(selectors, click)
+    deadline = time.time() + timeout
+    while True:
+        try:
+            index = page.run_js(script)
+        except Exception:
+            index = None
+        if index is not None and index >= 0:
+            return selectors[index]
+        if time.time() >= deadline:
+            return None
+        time.sleep(interval)
+
+
+# Request blocking profile: URL patterns (Network.setBlockedURLs syntax, '*' wildcard)
+# for resource types the extractors never read. Icons are served as .png from
+# static.xx.fbcdn.net, so .png and Facebook's static scripts stay allowed.
+BLOCK_PATTERNS = {
+    'image': ['*scontent*.fbcdn.net/*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.avif*', '*.bmp*'],
+    'media': ['*video*.fbcdn.net/*', '*.mp4*', '*.webm*', '*.m3u8*', '*.mpd*', '*.mp3*'],
+    'font': ['*.woff*', '*.ttf*', '*.otf*', '*.eot*'],
+    'tracking': [
+        '*google-analytics.com/*', '*googletagmanager.com/*', '*doubleclick.net/*',
+        '*googlesyndication.com/*', '*adservice.google.*', '*connect.facebook.net/*',
+        '*facebook.com/tr?*', '*facebook.com/tr/*', '*hotjar.com/*', '*clarity.ms/*',
+    ],
+    'stylesheet': ['*.css*'],
+}
+
+# Requests that must never be blocked: the Intro phone icon and Facebook's own
+# scripts, which render the Intro. Chrome's blocklist has no exceptions, so a
+# block pattern that covers an allow pattern (matches its text, wildcards read
+# literally) is left out of the blocklist instead.
+ALLOW_PATTERNS = [
+    '*://static.xx.fbcdn.net/rsrc.php/*VIGUiR6qVQJ.png*',
+    '*://static.xx.fbcdn.net/rsrc.php/*.js*',
+]
+
+# Comma-separated types from BLOCK_PATTERNS ('none' disables blocking) and extra patterns
+BLOCK_RESOURCES = os.environ.get('EXTRACT_BLOCK_RESOURCES', 'image,media,font,tracking')
+BLOCK_URLS = os.environ.get('EXTRACT_BLOCK_URLS', '')
+
+
+def _wildcard_match(pattern, url):
+    """Match a URL against a '*' wildcard pattern the way Chrome does"""
+    regex = '.*'.join(re.escape(part) for part in pattern.split('*'))
+    return re.fullmatch(regex, url) is not None
+
+
+def build_block_patterns(resource_types=None, extra_patterns=None, keep_urls=()):
+    """Build the list of URL patterns to block for the given resource types
+
+    Patterns covering ALLOW_PATTERNS or one of `keep_urls` (e.g. the page itself) are dropped.
+    """
+    if resource_types is None:
+        resource_types = BLOCK_RESOURCES
+    if extra_patterns is None:
+        extra_patterns = BLOCK_URLS
+    if isinstance(resource_types, str):
+        resource_types = [t.strip() for t in resource_types.split(',') if t.strip()]
+    if isinstance(extra_patterns, str):
+        extra_patterns = [p.strip() for p in extra_patterns.split(',') if p.strip()]
+    
+    patterns = []
+    for resource_type in resource_types:
+        if resource_type != 'none':
+            patterns.extend(BLOCK_PATTERNS.get(resource_type, []))
+    patterns.extend(extra_patterns)
+    
+    # Never block what the extractors or the page rendering depend on,
+    # nor the page itself
+    keep = ALLOW_PATTERNS + list(keep_urls)
+    return [p for p in dict.fromkeys(patterns)
+            if not any(_wildcard_match(p, allowed) for allowed in keep)]
+
+
+def apply_resource_blocking(page, url, patterns=None):
+    """Block the profile's resources in this tab before opening `url`"""
+    if patterns is None:
+        patterns = build_block_patterns(keep_urls=[url])
     try:
-        from playwright.sync_api import sync_playwright
-        with sync_playwright() as p:
-            # Get the browser path from Playwright
-            browser = p.chromium
-            executable_path = browser.executable_path
-            if executable_path and os.path.exists(executable_path):
-                print(f"   ✅ Found via Playwright API: {executable_path}")
-                return executable_path
+        page.run_cdp('Network.enable')
+        page.run_cdp('Network.setBlockedURLs', urls=patterns)
     except Exception as e:
-        print(f"   ⚠️  Playwright API failed: {e}")
+        print(f"      ⚠️ Could not set request blocking: {e}")
+
+
+def clear_resource_blocking(page):
+    """Lift the tab's request blocking (the tab may be the user's own browser tab)"""
+    try:
+        page.run_cdp('Network.setBlockedURLs', urls=[])
+    except Exception:
+        pass
+
+
+# Resolved browser executable, cached on disk so discovery runs once per deploy
+CHROMIUM_PATH_CACHE_FILE = os.environ.get(
+    'CHROMIUM_PATH_CACHE',
+    os.path.expanduser('~/.cache/extract_contacts/chromium_path.json')
+)
+_UNRESOLVED = object()
+_chromium_path = _UNRESOLVED
+
+
+def _is_executable(path):
+    """Check that a path is an existing executable file"""
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _read_chromium_path_cache():
+    """Return the cached executable if it still exists with the same mtime"""
+    try:
+        with open(CHROMIUM_PATH_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        path = cached.get('path')
+        if _is_executable(path) and os.stat(path).st_mtime == cached.get('mtime'):
+            return path
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+
+def _write_chromium_path_cache(path):
+    """Remember the resolved executable and its mtime (best effort)"""
+    try:
+        os.makedirs(os.path.dirname(CHROMIUM_PATH_CACHE_FILE), exist_ok=True)
+        tmp_file = CHROMIUM_PATH_CACHE_FILE + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'path': path, 'mtime': os.stat(path).st_mtime}, f)
+        os.replace(tmp_file, CHROMIUM_PATH_CACHE_FILE)
+    except OSError as e:
+        print(f"   ⚠️  Could not write browser path cache: {e}")
+
+
+def get_playwright_chromium_path():
+    """Get the path to Playwright's Chromium browser (cached)
     
-    # Method 2: Try common cache locations
+    Resolution order: CHROMIUM_PATH env override (validated once), the
+    in-process result, the on-disk cache, and only then a full discovery.
+    """
+    global _chromium_path
+    if _chromium_path is not _UNRESOLVED:
+        return _chromium_path
+    
+    override = os.environ.get('CHROMIUM_PATH')
+    if override:
+        if _is_executable(override):
+            _chromium_path = override
+            return override
+        print(f"   ⚠️  CHROMIUM_PATH is not an executable file, ignoring: {override}")
+    
+    path = _read_chromium_path_cache()
+    if path is None:
+        path = discover_playwright_chromium_path()
+        if path:
+            _write_chromium_path_cache(path)
+    _chromium_path = path
+    return path
+
+
+def discover_playwright_chromium_path():
+    """Search the filesystem (and as a last resort Playwright) for Chromium"""
+    import glob
+    
+    # Method 1: Try common cache locations
     cache_locations = [
         os.path.expanduser('~/.cache/ms-playwright'),
         '/opt/render/.cache/ms-playwright',
@@ -79,7 +823,7 @@ def get_playwright_chromium_path():
                         print(f"   ✅ Found Chromium: {chrome_exe}")
                         return chrome_exe
     
-    # Method 3: Check common Render/Heroku paths (limited search to avoid timeouts)
+    # Method 2: Check common Render/Heroku paths (limited search to avoid timeouts)
     print("   🔍 Checking Render-specific paths...")
     render_paths = [
         '/opt/render/project/src/.cache/ms-playwright',
@@ -95,216 +839,560 @@ def get_playwright_chromium_path():
                     print(f"   ✅ Found Chromium in Render path: {match}")
                     return match
     
+    # Method 3: Ask Playwright (starts a driver process, so only as a last resort)
+    try:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as p:
+            # Get the browser path from Playwright
+            browser = p.chromium
+            executable_path = browser.executable_path
+            if executable_path and os.path.exists(executable_path):
+                print(f"   ✅ Found via Playwright API: {executable_path}")
+                return executable_path
+    except Exception as e:
+        print(f"   ⚠️  Playwright API failed: {e}")
+    
     print("   ❌ Could not find Playwright Chromium in any location")
     return None
 
 
+# Single-pass contact scanner: one walk over the text finds every '@' and every
+# run of digits and separators long enough to hold a phone number. Addresses
+# are read around each '@', phone keywords only in the short stretch before
+# each run (the only place the phone rules can pair them with a number); the
+# extractors below apply their priority rules to these candidates instead of
+# running one full regex scan per keyword and format.
+CONTACT_SCANNER = re.compile(r'@|[+(\d][\d\s\-()+]{8,}')
+EMAIL_PATTERN = r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'
+EMAIL_RE = re.compile(EMAIL_PATTERN)
+EMAIL_LOCAL_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-')
+
+# Keywords in priority order (extract_phone_from_text), and those the
+# context rule looks behind (in its alternation order)
+PHONE_KEYWORDS = ['phone', 'telephone', 'tel', 'call', 'contact', 'telefone', 'telefone:', '电话', 'mobile', 'cell']
+CONTEXT_KEYWORDS = ['phone', 'tel', 'call', 'contact', 'telefone']
+# Scanned words, longest first where one is a prefix of another
+SCANNED_KEYWORDS = ['telephone', 'telefone', 'phone', 'tel', 'call', 'contact', 'mobile', 'cell', '电话']
+KEYWORD_GROUPS = {f'kw{i}': word for i, word in enumerate(SCANNED_KEYWORDS)}
+# A lookahead tries every offset, so keywords that overlap ("Contactel":
+# contact + tel) are all found, as the per-keyword rules find them
+KEYWORD_SCANNER = re.compile(
+    '(?=' + '|'.join(f'(?P<{group}>(?i:{re.escape(word)}))' for group, word in KEYWORD_GROUPS.items()) + ')')
+# Longest keyword, and how far before a digit run the context rule reaches for one
+KEYWORD_LENGTH = max(len(keyword) for keyword in PHONE_KEYWORDS)
+CONTEXT_REACH = 100 + KEYWORD_LENGTH
+
+# What follows a keyword, a digit run or a context keyword in each phone rule
+KEYWORD_PHONE_TAILS = [
+    re.compile(r'[:\s]*([\+\d][\d\s\-\(\)]{8,20})'),
+    re.compile(r'[:\s]*(\d{2,4}[\s\-]\d{3,4}[\s\-]\d{3,4})'),
+]
+FORMATTED_PHONE_PATTERNS = [
+    # Portuguese format: 21 794 8800 (2 digits, space, 3 digits, space, 4 digits)
+    ('pt', re.compile(r'\b\d{2}\s+\d{3}\s+\d{4}\b')),
+    # Portuguese mobile: 9XX XXX XXX or 9XX-XXX-XXX
+    ('pt-mobile', re.compile(r'\b9\d{2}[\s\-]\d{3}[\s\-]\d{3}\b')),
+    # Portuguese landline: 2X XXX XXXX or 2X-XXX-XXXX
+    ('pt-landline', re.compile(r'\b2\d{1}[\s\-]\d{3}[\s\-]\d{4}\b')),
+    # US/International format: (XXX) XXX-XXXX or +1 234 567 8900
+    ('groups', re.compile(r'\+?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,9}')),
+    # US format: (XXX) XXX-XXXX
+    ('us', re.compile(r'\(\d{3}\)[\s\-]?\d{3}[\s\-]?\d{4}')),
+    # Format with dashes: XXX-XXX-XXXX
+    ('dashes', re.compile(r'\d{3}[\-]\d{3}[\-]\d{4}')),
+]
+CONTEXT_PHONE_TAIL = re.compile(r'[^.]{0,100}?(\d{2,4}[\s\-]\d{3,4}[\s\-]\d{3,4})')
+NON_DIGITS_RE = re.compile(r'[^\d+]')
+
+
+class ContactScan:
+    """Contact candidates of a text with their offsets, found in one pass
+
+    emails:   [(offset, address)] in text order
+    numbers:  [(start, end)] of the digit runs phone numbers can sit in
+    keywords: {keyword: [offsets]} of the phone keywords before those runs
+              (case-insensitive, also inside words, as the phone rules match them)
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.emails = []
+        self.numbers = []
+        self.keywords = {}
+        self._scan()
+
+    def _add_keyword(self, group, offset):
+        word = KEYWORD_GROUPS[group]
+        self.keywords.setdefault(word, []).append(offset)
+        # Only the longest keyword matches at an offset: add the ones it starts with
+        if word in ('telephone', 'telefone'):
+            self.keywords.setdefault('tel', []).append(offset)
+        if word == 'telefone' and self.text.startswith(':', offset + 8):
+            self.keywords.setdefault('telefone:', []).append(offset)
+
+    def _email_at(self, at, email_end):
+        """The address around the '@' at `at` (the leftmost one, as re.findall picks it)"""
+        start = at
+        while start > email_end and self.text[start - 1] in EMAIL_LOCAL_CHARS:
+            start -= 1
+        for offset in range(start, at):
+            match = EMAIL_RE.match(self.text, offset)
+            if match:
+                return match
+        return None
+
+    def _scan(self):
+        text = self.text
+        email_end = 0
+        keywords_end = 0
+        for match in CONTACT_SCANNER.finditer(text):
+            start, end = match.span()
+            if end - start == 1:
+                email = self._email_at(start, email_end)
+                if email:
+                    self.emails.append((email.start(), email.group()))
+                    email_end = email.end()
+                continue
+
+            self.numbers.append((start, end))
+            # A keyword rule needs its keyword right before the run (only ':' and
+            # whitespace between), the context rule within 100 characters
+            lead = start
+            while lead > keywords_end and (text[lead - 1] == ':' or text[lead - 1].isspace()):
+                lead -= 1
+            region_start = max(keywords_end, min(start - CONTEXT_REACH, lead - KEYWORD_LENGTH), 0)
+            for keyword in KEYWORD_SCANNER.finditer(text, region_start, start):
+                self._add_keyword(keyword.lastgroup, keyword.start())
+            keywords_end = start
+
+
+@functools.lru_cache(maxsize=2)
+def scan_contacts(text):
+    """Scan a text once (cached: the email and phone extractors share the scan)"""
+    return ContactScan(text)
+
+
 def extract_email_from_text(text):
     """Extract email addresses from text"""
     if not text:
         return None
-    email_pattern = r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'
-    matches = re.findall(email_pattern, text)
-    if matches:
-        # Filter out common fake/example emails
-        filtered = [e for e in matches if not any(x in e.lower() for x in [
-            'example.com', 'test.com', 'domain.com', 'email.com', 
-            'facebook.com', 'placeholder.com', 'yourdomain.com'
-        ])]
-        if filtered:
-            return filtered[0]
+    for _, email in scan_contacts(text).emails:
+        # Filter out fake/example and platform emails
+        if not is_blocked_email(email):
+            return email
+    return None
+
+
+def _phone_near_keyword(text):
+    """Phone numbers right after a phone keyword (most reliable)"""
+    scan = scan_contacts(text)
+    for keyword in PHONE_KEYWORDS:
+        offsets = scan.keywords.get(keyword)
+        if not offsets:
+            continue
+        # Keyword followed by a phone number with separators: more reliable as it has context
+        for tail in KEYWORD_PHONE_TAILS:
+            # Only the first occurrence the rule matches at counts
+            match = next((m for m in (tail.match(text, offset + len(keyword)) for offset in offsets) if m), None)
+            if match and _keyword_phone_ok(match.group(1).strip()):
+                return match.group(1).strip()
+    return None
+
+
+def _keyword_phone_ok(phone):
+    """Keyword rule: at least 9 digits and separators (spaces, dashes, parentheses)"""
+    phone_clean = NON_DIGITS_RE.sub('', phone)
+    if len(phone_clean) >= 9 and len(phone_clean) <= 15:
+        # Check if it has separators (more likely to be a phone number)
+        return any(sep in phone for sep in [' ', '-', '(', ')', '+'])
+    return False
+
+
+def _phone_by_format(text):
+    """Well-formatted phone numbers with separators"""
+    numbers = scan_contacts(text).numbers
+    # These patterns require separators, making them more reliable
+    for _, pattern in FORMATTED_PHONE_PATTERNS:
+        for start, end in numbers:
+            # One character past the run so \b sees what follows it
+            for match in pattern.finditer(text, start, end + 1):
+                if _formatted_phone_ok(match.group().strip()):
+                    return match.group().strip()
     return None
 
 
+def _formatted_phone_ok(phone):
+    """Format rule: 9-15 digits, not a year, with separators or a leading +"""
+    phone_clean = NON_DIGITS_RE.sub('', phone)
+    # Must be 9-15 digits
+    if not 9 <= len(phone_clean) <= 15:
+        return False
+    # Exclude years (1900-2099)
+    if len(phone_clean) >= 4:
+        first_four = int(phone_clean[:4])
+        if 1900 <= first_four <= 2099:
+            return False
+    # Exclude pure numbers without separators (likely IDs, not phone numbers)
+    # Only accept if it has separators or starts with +
+    return any(sep in phone for sep in [' ', '-', '(', ')', '+']) or phone.startswith('+')
+
+
+def _phone_in_context(text):
+    """Phone-like patterns in specific contexts, near contact-related words"""
+    scan = scan_contacts(text)
+    # Keyword offsets in text order; at one offset keywords are tried in CONTEXT_KEYWORDS order
+    hits = sorted((offset, rank) for rank, keyword in enumerate(CONTEXT_KEYWORDS)
+                  for offset in scan.keywords.get(keyword, []))
+    matched_until = 0
+    for offset, rank in hits:
+        # Matches don't overlap: skip keywords inside the previous match
+        if offset < matched_until:
+            continue
+        match = CONTEXT_PHONE_TAIL.match(text, offset + len(CONTEXT_KEYWORDS[rank]))
+        if not match:
+            continue
+        matched_until = match.end()
+        if _context_phone_ok(match.group(1).strip()):
+            return match.group(1).strip()
+    return None
+
+
+def _context_phone_ok(phone):
+    """Context rule: 9-15 digits"""
+    return 9 <= len(NON_DIGITS_RE.sub('', phone)) <= 15
+
+
+# Methods of extract_phone_from_text in their default priority order
+PHONE_TEXT_METHODS = {
+    'keyword': _phone_near_keyword,
+    'formatted': _phone_by_format,
+    'context': _phone_in_context,
+}
+
+
+def extract_phone_with_method(text, methods=None):
+    """Extract a phone number trying `methods` in order; returns (phone, method, tried)"""
+    tried = []
+    if not text:
+        return None, None, tried
+    for method in methods or PHONE_TEXT_METHODS:
+        if method not in PHONE_TEXT_METHODS:
+            continue
+        tried.append(method)
+        phone = PHONE_TEXT_METHODS[method](text)
+        if phone:
+            return phone, method, tried
+    return None, None, tried
+
+
 def extract_phone_from_text(text):
     """Extract phone numbers from text - only return if confident it's a phone number"""
+    # If no phone number found with separators or context, return None
+    # This prevents extracting random numbers like IDs, dates, etc.
+    return extract_phone_with_method(text)[0]
+
+
+# Ranked candidates: every value the extractors accept, scored by the evidence
+# behind it, so ambiguous pages can be resolved offline without another visit.
+# Evidence weights add up to the score (capped at 1).
+PHONE_EVIDENCE_WEIGHTS = {
+    'icon': 0.5,             # next to a phone icon (Facebook Intro)
+    'intro_row': 0.4,        # Facebook Intro row with a phone keyword
+    'keyword': 0.4,          # right after a phone keyword
+    'intro_context': 0.2,    # Facebook Intro text near an email/address
+    'context': 0.2,          # phone keyword up to 100 characters before it
+    'format': 0.2,           # national/US format (not just digit groups)
+    'separators': 0.1,       # grouped digits or a leading +
+    'page_icon': 0.1,        # the page shows a phone icon somewhere
+    'section': 0.1,          # found on an About/Contact page
+}
+EMAIL_EVIDENCE_WEIGHTS = {
+    'address': 0.2,          # a well-formed address
+    'icon': 0.5,             # next to an email icon (Facebook Intro)
+    'intro_row': 0.4,        # short Facebook Intro row
+    'mailto': 0.3,           # target of a mailto: link
+    'site_domain': 0.3,      # same domain as the website
+    'repeated': 0.1,         # appears more than once
+    'section': 0.1,          # found on an About/Contact page
+}
+# Facebook Intro lookup methods as evidence names
+INTRO_EVIDENCE = {'icon': 'icon', 'keyword': 'intro_row', 'context': 'intro_context', 'row': 'intro_row'}
+CONTACT_SECTIONS = ('about', 'contact')
+
+
+def _add_candidate(found, value, key, offset=None, **evidence):
+    """Merge one sighting of a value into found[key] (first sighting keeps value/offset)"""
+    candidate = found.get(key)
+    if candidate is None:
+        candidate = found[key] = {'value': value, 'offset': offset, 'evidence': {}}
+    for name, detail in evidence.items():
+        candidate['evidence'].setdefault(name, detail)
+    return candidate
+
+
+def add_phone_candidate(found, phone, offset=None, **evidence):
+    """Merge one sighting of a phone number (keyed by its digits)"""
+    if any(sep in phone for sep in [' ', '-', '(', ')', '+']):
+        evidence.setdefault('separators', True)
+    return _add_candidate(found, phone, NON_DIGITS_RE.sub('', phone), offset, **evidence)
+
+
+def phone_candidates(text, found=None):
+    """Every phone number the text rules accept, keyed by its digits, with its evidence"""
+    found = {} if found is None else found
     if not text:
-        return None
-    
-    # First priority: Look for phone numbers near keywords (most reliable)
-    phone_keywords = ['phone', 'telephone', 'tel', 'call', 'contact', 'telefone', 'telefone:', '电话', 'mobile', 'cell']
-    for keyword in phone_keywords:
-        # Look for pattern: keyword followed by phone number with separators
-        # This is more reliable as it has context
-        keyword_patterns = [
-            rf'(?i){re.escape(keyword)}[:\s]*([\+\d][\d\s\-\(\)]{{8,20}})',
-            rf'(?i){re.escape(keyword)}[:\s]*(\d{{2,4}}[\s\-]\d{{3,4}}[\s\-]\d{{3,4}})',
-        ]
-        for pattern in keyword_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                phone = matches[0].strip()
-                phone_clean = re.sub(r'[^\d+]', '', phone)
-                # Must have at least 9 digits and contain separators (spaces, dashes, parentheses)
-                if len(phone_clean) >= 9 and len(phone_clean) <= 15:
-                    # Check if it has separators (more likely to be a phone number)
-                    if any(sep in phone for sep in [' ', '-', '(', ')', '+']):
-                        return phone
-    
-    # Second priority: Well-formatted phone numbers with separators
-    # These patterns require separators, making them more reliable
-    formatted_patterns = [
-        # Portuguese format: 21 794 8800 (2 digits, space, 3 digits, space, 4 digits)
-        r'\b\d{2}\s+\d{3}\s+\d{4}\b',
-        # Portuguese mobile: 9XX XXX XXX or 9XX-XXX-XXX
-        r'\b9\d{2}[\s\-]\d{3}[\s\-]\d{3}\b',
-        # Portuguese landline: 2X XXX XXXX or 2X-XXX-XXXX
-        r'\b2\d{1}[\s\-]\d{3}[\s\-]\d{4}\b',
-        # US/International format: (XXX) XXX-XXXX or +1 234 567 8900
-        r'\+?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,9}',
-        # US format: (XXX) XXX-XXXX
-        r'\(\d{3}\)[\s\-]?\d{3}[\s\-]?\d{4}',
-        # Format with dashes: XXX-XXX-XXXX
-        r'\d{3}[\-]\d{3}[\-]\d{4}',
-    ]
+        return found
+    scan = scan_contacts(text)
+    for keyword in PHONE_KEYWORDS:
+        for offset in scan.keywords.get(keyword, []):
+            for tail in KEYWORD_PHONE_TAILS:
+                match = tail.match(text, offset + len(keyword))
+                if match and _keyword_phone_ok(match.group(1).strip()):
+                    add_phone_candidate(found, match.group(1).strip(), match.start(1),
+                                             keyword={'word': keyword, 'distance': match.start(1) - offset - len(keyword)})
+                    break
+    for name, pattern in FORMATTED_PHONE_PATTERNS:
+        for start, end in scan.numbers:
+            for match in pattern.finditer(text, start, end + 1):
+                phone = match.group().strip()
+                if _formatted_phone_ok(phone):
+                    candidate = add_phone_candidate(found, phone, match.start())
+                    if name != 'groups':
+                        candidate['evidence'].setdefault('format', name)
+    for keyword in CONTEXT_KEYWORDS:
+        for offset in scan.keywords.get(keyword, []):
+            match = CONTEXT_PHONE_TAIL.match(text, offset + len(keyword))
+            if match and _context_phone_ok(match.group(1).strip()):
+                add_phone_candidate(found, match.group(1).strip(), match.start(1),
+                                    context={'word': keyword, 'distance': match.start(1) - offset - len(keyword)})
+    return found
+
+
+def email_candidates(text, site=None, found=None):
+    """Every address extract_email_from_text accepts, keyed by address, with its evidence"""
+    found = {} if found is None else found
+    if not text:
+        return found
+    for offset, email in scan_contacts(text).emails:
+        if is_blocked_email(email):
+            continue
+        lower = email.lower()
+        candidate = _add_candidate(found, email, lower, offset, address=True)
+        candidate['evidence']['occurrences'] = candidate['evidence'].get('occurrences', 0) + 1
+        if candidate['evidence']['occurrences'] > 1:
+            candidate['evidence']['repeated'] = True
+        if text[max(0, offset - 7):offset].lower() == 'mailto:':
+            candidate['evidence']['mailto'] = True
+        domain = lower.rsplit('@', 1)[1]
+        if site and (domain == site or domain.endswith('.' + site)):
+            candidate['evidence']['site_domain'] = True
+    return found
+
+
+def rank_candidates(found, weights, picked=None):
+    """Score candidates by their evidence; best first, `picked` (the rule's choice) flagged"""
+    ranked = []
+    for candidate in found.values():
+        evidence = candidate['evidence']
+        score = 0.0
+        for name, weight in weights.items():
+            detail = evidence.get(name)
+            if not detail:
+                continue
+            # Context evidence counts less the further the keyword is
+            if name == 'context':
+                weight *= 1 - detail['distance'] / 200
+            score += weight
+        ranked.append({
+            'value': candidate['value'],
+            'score': round(min(score, 1.0), 2),
+            'picked': candidate['value'] == picked,
+            'evidence': evidence,
+            **({'e164': candidate['e164']} if 'e164' in candidate else {}),
+            'offset': candidate['offset'],
+        })
+    ranked.sort(key=lambda c: (not c['picked'], -c['score'], c['offset'] if c['offset'] is not None else -1))
+    return ranked
+
+
+def normalize_found_phone(phone, url):
+    """E.164 form of an extracted phone (country from the site's domain): (phone, e164)
+
+    Numbers the numbering plan can't have are dropped (None, None). On sites
+    whose domain has no country (facebook.com, .com), national numbers get the
+    EXTRACT_PHONE_COUNTRY plan's E.164 form when it allows them. Numbers no
+    plan covers are kept, with e164 None unless written with a calling code.
+    """
+    if not phone:
+        return None, None
+    e164, status = normalize_phone(phone, country_for_url(url))
+    if status == IMPOSSIBLE:
+        print(f"   ⚠️  Rejected impossible phone number: {phone}")
+        return None, None
+    return phone, e164
+
+
+def normalize_phone_candidates(found, url, picked=None):
+    """Re-key phone candidates by their E.164 form, merging sightings and dropping impossible numbers"""
+    country = country_for_url(url)
+    merged = {}
+    for key, candidate in found.items():
+        e164, status = normalize_phone(candidate['value'], country)
+        if status == IMPOSSIBLE:
+            continue
+        entry = _add_candidate(merged, candidate['value'], e164 or key, candidate['offset'], **candidate['evidence'])
+        entry['e164'] = e164
+        # Keep the rule's spelling of the number so rank_candidates() can flag it
+        if candidate['value'] == picked:
+            entry['value'] = picked
+    return merged
+
+
+def name_from_bundle(data, url):
+    """Pick the name from an extraction bundle: Facebook name, first real h1, page title, meta title"""
+    if is_facebook_url(url):
+        name = data.get('facebook_name')
+        if name and 2 < len(name) < 200:
+            return clean_name(name)
     
-    for pattern in formatted_patterns:
-        matches = re.findall(pattern, text)
-        if matches:
-            for match in matches:
-                phone = match.strip()
-                phone_clean = re.sub(r'[^\d+]', '', phone)
-                # Must be 9-15 digits
-                if 9 <= len(phone_clean) <= 15:
-                    # Exclude years (1900-2099)
-                    if len(phone_clean) >= 4:
-                        first_four = int(phone_clean[:4])
-                        if 1900 <= first_four <= 2099:
-                            continue
-                    # Exclude pure numbers without separators (likely IDs, not phone numbers)
-                    # Only accept if it has separators or starts with +
-                    if any(sep in phone for sep in [' ', '-', '(', ')', '+']) or phone.startswith('+'):
-                        return phone
+    for name in data.get('h1s') or []:
+        if name and 2 < len(name) < 200:
+            if (not name.isdigit() and
+                name.lower() not in ['facebook', 'home', 'posts', 'about', 'contact', 'menu', '简介', '帖子'] and
+                '粉丝' not in name and 'followers' not in name.lower() and 'likes' not in name.lower()):
+                return clean_name(name)
     
-    # Last resort: Only look for phone numbers in specific contexts
-    # Look for phone-like patterns near contact-related words
-    context_pattern = r'(?i)(?:phone|tel|call|contact|telefone)[^.]{0,100}?(\d{2,4}[\s\-]\d{3,4}[\s\-]\d{3,4})'
-    context_matches = re.findall(context_pattern, text)
-    if context_matches:
-        for match in context_matches:
-            phone = match.strip()
-            phone_clean = re.sub(r'[^\d+]', '', phone)
-            if 9 <= len(phone_clean) <= 15:
-                return phone
+    title = data.get('title')
+    if title:
+        title = re.sub(r'\s*[-|]\s*Facebook.*$', '', title, flags=re.IGNORECASE)
+        title = re.sub(r'\s*[-|]\s*.*$', '', title)
+        title = clean_name(title)
+        if title and 2 < len(title) < 200:
+            return title
     
-    # If no phone number found with separators or context, return None
-    # This prevents extracting random numbers like IDs, dates, etc.
+    name = data.get('meta_title')
+    if name and 2 < len(name) < 200:
+        return name
     return None
 
 
-def extract_name_from_page(page, url=None):
-    """Extract name/title from page"""
-    name = None
+# Lookup methods per field in default order: the in-page Facebook Intro
+# scan, and extract_phone_from_text on general pages
+FACEBOOK_CONTACT_METHODS = {'phone': ['icon', 'keyword', 'context'], 'email': ['icon', 'row']}
+PAGE_CONTACT_METHODS = {'phone': list(PHONE_TEXT_METHODS)}
+
+
+def site_domain(url):
+    """Host of a URL without port and www. prefix"""
+    domain = urlsplit(url).netloc.lower().split(':')[0]
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    return domain
+
+
+def strategy_key(url, template):
+    """Stats key for a URL: its domain plus the page template (e.g. 'facebook.com|about')"""
+    domain = 'facebook.com' if is_facebook_url(url) else site_domain(url)
+    return f'{domain}|{template}'
+
+
+def plan_extraction(url, template):
+    """Methods to run per field for this URL (default order, minus those that never yield on its domain/template)"""
+    key = strategy_key(url, template)
+    stats = get_strategy_stats()
+    defaults = FACEBOOK_CONTACT_METHODS if is_facebook_url(url) else PAGE_CONTACT_METHODS
+    plan = {'key': key, 'template': template}
+    for field, methods in defaults.items():
+        plan[field] = stats.plan(key, field, methods)
+    return plan
+
+
+def record_methods(plan, field, tried, winner):
+    """Feed back which methods ran for a field and which one found it"""
+    if plan and tried:
+        get_strategy_stats().record(plan['key'], field, tried, winner)
+
+
+def bundle_candidates(data, url, page_text, phone, email, section=None):
+    """Ranked phone/email candidates of an extraction bundle (Facebook Intro values and page text)"""
+    phones = {}
+    emails = {}
+    intro = data.get('candidates') or {}
+    for item in intro.get('phone') or []:
+        add_phone_candidate(phones, item['value'], **{INTRO_EVIDENCE[item['method']]: True})
+    for item in intro.get('email') or []:
+        if is_blocked_email(item['value']):
+            continue
+        _add_candidate(emails, item['value'], item['value'].lower(), address=True,
+                       **{INTRO_EVIDENCE[item['method']]: True})
+    phone_candidates(page_text, phones)
+    email_candidates(page_text, None if is_facebook_url(url) else site_domain(url), emails)
+
+    phones = normalize_phone_candidates(phones, url, phone)
+    for candidate in phones.values():
+        if data.get('has_phone_indicator'):
+            candidate['evidence']['page_icon'] = True
+    if section in CONTACT_SECTIONS:
+        for candidate in list(phones.values()) + list(emails.values()):
+            candidate['evidence']['section'] = section
+    return {
+        'phone': rank_candidates(phones, PHONE_EVIDENCE_WEIGHTS, phone),
+        'email': rank_candidates(emails, EMAIL_EVIDENCE_WEIGHTS, email),
+    }
+
+
+def contacts_from_bundle(data, url, plan=None, candidates=False):
+    """Turn an extraction bundle into the name/email/phone result
+
+    With `candidates`, the result also holds every phone/email found, ranked
+    with a score and the evidence behind it ('candidates': {'phone': [...],
+    'email': [...]}); the picked value comes first.
+    """
+    data = data or {}
+    name = name_from_bundle(data, url)
+    page_text = (data.get('html') or '') + ' ' + (data.get('text') or '')
     
-    try:
-        # Get URL from page if not provided
-        if url is None:
-            try:
-                url = page.url
-            except:
-                url = ""
-        
-        # For Facebook pages, use JavaScript to find the page name more reliably
-        if is_facebook_url(url):
-            try:
-                # Use JavaScript to find Facebook page name - more reliable
-                name = page.run_js("""
-                    // Method 1: Find h1 with page name (most reliable)
-                    const h1s = document.querySelectorAll('h1');
-                    for (let h1 of h1s) {
-                        const text = h1.textContent.trim();
-                        // Filter out common UI elements
-                        if (text && text.length > 2 && text.length < 200 && 
-                            !text.match(/^\\d+/) && 
-                            !['Facebook', 'Home', 'Posts', 'About', 'Contact', 'Menu', '简介', '帖子'].includes(text) &&
-                            !text.includes('粉丝') && !text.includes('followers') && !text.includes('likes')) {
-                            return text;
-                        }
-                    }
-                    
-                    // Method 2: Find span with page name near profile picture
-                    const spans = document.querySelectorAll('span[dir="auto"]');
-                    const candidates = [];
-                    for (let span of spans) {
-                        const text = span.textContent.trim();
-                        if (text && text.length > 2 && text.length < 200 && 
-                            !text.match(/^\\d+/) && 
-                            !['Facebook', 'Home', 'Posts', 'About', 'Contact', 'Menu', '简介', '帖子'].includes(text) &&
-                            !text.includes('粉丝') && !text.includes('followers') && !text.includes('likes')) {
-                            candidates.push(text);
-                        }
-                    }
-                    // Return the first candidate that looks like a name (has letters)
-                    for (let candidate of candidates) {
-                        if (/[a-zA-ZÀ-ÿ]/.test(candidate)) {
-                            return candidate;
-                        }
-                    }
-                    
-                    return null;
-                """)
-                if name and len(name) > 2 and len(name) < 200:
-                    # Remove "已认证" and "已认证账户" (verified badge) and other common suffixes
-                    name = name.strip()
-                    name = re.sub(r'\s*已认证账户\s*$', '', name)
-                    name = re.sub(r'\s*已认证\s*$', '', name)
-                    name = re.sub(r'\s*Verified\s*Account\s*$', '', name, flags=re.IGNORECASE)
-                    name = re.sub(r'\s*Verified\s*$', '', name, flags=re.IGNORECASE)
-                    return name
-            except Exception as e:
-                print(f"      ⚠️ JavaScript name extraction failed: {e}")
-        
-        # Try h1 tag (works for both Facebook and general pages)
-        try:
-            h1_elements = page.eles('css:h1', timeout=2)
-            for h1 in h1_elements:
-                if h1:
-                    name = h1.text.strip()
-                    # Filter out common UI text and numbers
-                    if name and len(name) > 2 and len(name) < 200:
-                        # Skip if it's just numbers, followers count, or common UI text
-                        if (not name.isdigit() and 
-                            name.lower() not in ['facebook', 'home', 'posts', 'about', 'contact', 'menu', '简介', '帖子'] and
-                            '粉丝' not in name and 'followers' not in name.lower() and 'likes' not in name.lower()):
-                            # Remove "已认证" and "已认证账户" (verified badge) and other common suffixes
-                            name = re.sub(r'\s*已认证账户\s*$', '', name)
-                            name = re.sub(r'\s*已认证\s*$', '', name)
-                            name = re.sub(r'\s*Verified\s*Account\s*$', '', name, flags=re.IGNORECASE)
-                            name = re.sub(r'\s*Verified\s*$', '', name, flags=re.IGNORECASE)
-                            return name
-        except:
-            pass
-        
-        # Try page title
-        title = page.title
-        if title:
-            # Remove common suffixes like "| Facebook", "- Facebook", etc.
-            title = re.sub(r'\s*[-|]\s*Facebook.*$', '', title, flags=re.IGNORECASE)
-            title = re.sub(r'\s*[-|]\s*.*$', '', title)
-            # Remove "已认证" and "已认证账户" (verified badge)
-            title = re.sub(r'\s*已认证账户\s*$', '', title)
-            title = re.sub(r'\s*已认证\s*$', '', title)
-            title = re.sub(r'\s*Verified\s*Account\s*$', '', title, flags=re.IGNORECASE)
-            title = re.sub(r'\s*Verified\s*$', '', title, flags=re.IGNORECASE)
-            if title and len(title) > 2 and len(title) < 200:
-                return title.strip()
-        
-        # Try meta tags (og:title, title)
-        try:
-            name = page.run_js("""
-                const meta = document.querySelector('meta[property="og:title"]') || 
-                            document.querySelector('meta[name="title"]');
-                return meta ? (meta.content || '').trim() : null;
-            """)
-            if name and len(name) > 2 and len(name) < 200:
-                return name
-        except:
-            pass
-            
-    except Exception as e:
-        print(f"      ⚠️ Name extraction error: {e}")
+    if is_facebook_url(url):
+        # Phone and email come from the structured Intro section
+        phone = data.get('phone')
+        email = data.get('email')
+        if email and is_blocked_email(email):
+            print(f"   ⚠️  Ignoring blocked email domain: {email}")
+            email = None
+        methods = data.get('methods') or {}
+        tried = data.get('tried') or {}
+        record_methods(plan, 'phone', tried.get('phone'), methods.get('phone'))
+        record_methods(plan, 'email', tried.get('email'), methods.get('email'))
+        if phone:
+            print(f"   ✅ Found phone: {phone}")
+        else:
+            print("   ℹ️  No phone found in page content")
+        if email:
+            print(f"   ✅ Found email: {email}")
+        else:
+            # Fallback: try extracting email from page text
+            email = extract_email_from_text(page_text)
+    else:
+        email = extract_email_from_text(page_text)
+        # Only extract phone if phone icon exists
+        phone = None
+        if data.get('has_phone_indicator'):
+            phone, method, tried = extract_phone_with_method(page_text, plan.get('phone') if plan else None)
+            record_methods(plan, 'phone', tried, method)
+            if phone:
+                print(f"   ✅ Found phone: {phone}")
     
-    return name
+    phone, phone_e164 = normalize_found_phone(phone, url)
+    results = {
+        'name': name,
+        'email': email,
+        'phone': phone,
+        'phone_e164': phone_e164
+    }
+    if candidates:
+        results['candidates'] = bundle_candidates(data, url, page_text, phone, email,
+                                                  plan.get('template') if plan else None)
+    return results
 
 
 def is_facebook_url(url):
@@ -312,218 +1400,154 @@ def is_facebook_url(url):
     return 'facebook.com' in url.lower() or 'fb.com' in url.lower()
 
 
-def extract_contacts(url, page=None):
-    """Extract name, email, and phone from a URL"""
-    print(f"🌐 Opening URL: {url}")
+# Facebook's About > "Contact and basic info" tab, and first path segments
+# of Facebook URLs that are not pages or profiles
+FACEBOOK_ABOUT_TAB = 'about_contact_and_basic_info'
+FACEBOOK_RESERVED_PATHS = {
+    'groups', 'events', 'watch', 'marketplace', 'share', 'sharer', 'photo', 'photos', 'hashtag',
+    'login', 'reel', 'reels', 'stories', 'gaming', 'help', 'policies', 'privacy', 'settings',
+    'search', 'pg', 'people', 'pages',
+}
+
+
+def facebook_about_url(url):
+    """Derive the About/Contact info URL of a Facebook page or profile, or None"""
+    parts = urlsplit(url)
+    host = parts.netloc.lower().split(':')[0]
+    if not (host in ('facebook.com', 'fb.com') or host.endswith(('.facebook.com', '.fb.com'))):
+        return None
+    segments = [segment for segment in parts.path.split('/') if segment]
+    if not segments:
+        return None
     
-    # Connect to browser (assumes Chrome is running with --remote-debugging-port=9222)
-    if page is None:
+    # Numeric IDs: /100038066929239/, /profile.php?id=..., /people/<name>/<id>/
+    first = segments[0].lower()
+    if first == 'profile.php':
+        page_id = (parse_qs(parts.query).get('id') or [''])[0]
+    elif first in ('people', 'pages') and len(segments) >= 3:
+        page_id = segments[2]
+    else:
+        page_id = segments[0] if segments[0].isdigit() else None
+    if page_id is not None:
+        if not page_id.isdigit():
+            return None
+        return f'https://www.facebook.com/profile.php?id={page_id}&sk={FACEBOOK_ABOUT_TAB}'
+    
+    # Vanity slugs: /volantedealverca/
+    if first in FACEBOOK_RESERVED_PATHS or first.endswith('.php') or not re.fullmatch(r'[\w.\-]+', first):
+        return None
+    return f'https://www.facebook.com/{segments[0]}/{FACEBOOK_ABOUT_TAB}'
+
+
+def is_facebook_about_url(url):
+    """Check that Facebook kept us on an About tab (not the timeline or a login wall)"""
+    parts = urlsplit(url or '')
+    return 'login' not in parts.path and ('/about' in parts.path or 'sk=about' in parts.query)
+
+
+def open_facebook_about(page, about_url):
+    """Load a Facebook About/Contact info URL; False if Facebook didn't show it"""
+    try:
+        apply_resource_blocking(page, about_url)
+        page.get(about_url)
+        page.wait.doc_loaded(timeout=10)
+        return is_facebook_about_url(page.url)
+    except Exception as e:
+        print(f"      ⚠️ Could not open About page directly: {e}")
+        return False
+
+
+def connect_browser():
+    """Connect to the browser on port 9222, or to the supervised headless browser in production"""
+    try:
+        # Try to connect to existing browser instance
+        return ChromiumPage(addr_or_opts=9222)
+    except Exception as e:
+        error = e
+    
+    # In production (Render, Heroku, Docker) a long-lived supervisor owns the
+    # browser: it is launched once and restarted/recycled in the background
+    from browser_supervisor import is_production_environment, get_supervisor
+    if is_production_environment():
         try:
-            # Try to connect to existing browser instance
-            page = ChromiumPage(addr_or_opts=9222)
+            return get_supervisor().get_page()
         except Exception as e:
-            # If connection fails, try to start browser automatically (for production)
-            try:
-                import subprocess
-                import os
-                # Check if we're in a production environment (Render, Heroku, etc.)
-                if os.environ.get('RENDER') or os.environ.get('DYNO') or os.path.exists('/.dockerenv'):
-                    print("🔧 Production environment detected, starting headless browser...")
-                    # Try to start chromium in headless mode
-                    chromium_paths = []
-                    
-                    # Check if we're in Docker (has /.dockerenv file)
-                    in_docker = os.path.exists('/.dockerenv')
-                    
-                    if in_docker:
-                        # In Docker, prioritize system Chromium
-                        print("   🐳 Docker environment detected, using system Chromium")
-                        chromium_paths = [
-                            '/usr/bin/chromium',  # Docker/Ubuntu (most common)
-                            '/usr/bin/chromium-browser',  # Debian
-                        ]
-                    else:
-                        # Not in Docker, try Playwright first
-                        playwright_path = get_playwright_chromium_path()
-                        if playwright_path:
-                            chromium_paths.append(playwright_path)
-                            print(f"   Found Playwright Chromium: {playwright_path}")
-                        
-                        # Also try to find it manually
-                        import glob
-                        playwright_chromium_patterns = [
-                            os.path.expanduser('~/.cache/ms-playwright/chromium-*/chrome-linux/chrome'),
-                            '/opt/render/.cache/ms-playwright/chromium-*/chrome-linux/chrome',
-                        ]
-                        for pattern in playwright_chromium_patterns:
-                            matches = glob.glob(pattern)
-                            if matches:
-                                chromium_paths.extend(matches)
-                    
-                    # Add system paths (standard Linux locations)
-                    chromium_paths.extend([
-                        '/usr/bin/chromium',
-                        '/usr/bin/chromium-browser',
-                        '/usr/bin/google-chrome',
-                        '/usr/bin/google-chrome-stable',
-                        '/snap/bin/chromium',
-                        os.path.expanduser('~/.local/bin/chromium-browser'),
-                        os.path.expanduser('~/.local/chromium/chrome')
-                    ])
-                    
-                    # Also try to find chromium in PATH
-                    import shutil
-                    chromium_in_path = shutil.which('chromium-browser') or shutil.which('chromium') or shutil.which('google-chrome')
-                    if chromium_in_path:
-                        chromium_paths.insert(0, chromium_in_path)
-                    
-                    for chromium_path in chromium_paths:
-                        if chromium_path and os.path.exists(chromium_path):
-                            try:
-                                print(f"   Trying to start: {chromium_path}")
-                                subprocess.Popen([
-                                    chromium_path,
-                                    '--headless',
-                                    '--remote-debugging-port=9222',
-                                    '--no-sandbox',
-                                    '--disable-dev-shm-usage',
-                                    '--disable-gpu',
-                                    '--disable-software-rasterizer',
-                                    '--disable-extensions'
-                                ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                                time.sleep(3)  # Wait for browser to start
-                                try:
-                                    page = ChromiumPage(addr_or_opts=9222)
-                                    print(f"   ✅ Successfully connected to browser at {chromium_path}")
-                                    break
-                                except Exception as conn_err:
-                                    print(f"   ⚠️  Could not connect: {conn_err}")
-                                    continue
-                            except Exception as start_err:
-                                print(f"   ⚠️  Could not start {chromium_path}: {start_err}")
-                                continue
-                    
-                    if page is None:
-                        # Last resort: try using DrissionPage's built-in browser management
-                        playwright_chromium = None
-                        try:
-                            print("   🔄 Trying DrissionPage browser management...")
-                            from DrissionPage import ChromiumOptions
-                            
-                            # Get Playwright Chromium path
-                            playwright_chromium = get_playwright_chromium_path()
-                            
-                            # If not found, try to install Playwright browsers
-                            if not playwright_chromium:
-                                print("   ⚠️  Playwright Chromium not found, attempting to install...")
-                                try:
-                                    import subprocess
-                                    result = subprocess.run(
-                                        ['python', '-m', 'playwright', 'install', 'chromium'],
-                                        capture_output=True,
-                                        text=True,
-                                        timeout=300
-                                    )
-                                    if result.returncode == 0:
-                                        print("   ✅ Playwright Chromium installed successfully")
-                                        playwright_chromium = get_playwright_chromium_path()
-                                    else:
-                                        print(f"   ⚠️  Installation failed: {result.stderr}")
-                                except Exception as install_err:
-                                    print(f"   ⚠️  Could not install Playwright browsers: {install_err}")
-                            
-                            co = ChromiumOptions()
-                            co.headless(True)
-                            co.set_argument('--no-sandbox')
-                            co.set_argument('--disable-dev-shm-usage')
-                            co.set_argument('--disable-gpu')
-                            co.set_argument('--disable-software-rasterizer')
-                            
-                            # Set browser path if we found Playwright's Chromium
-                            if playwright_chromium and os.path.exists(playwright_chromium):
-                                print(f"   📍 Configuring browser path: {playwright_chromium}")
-                                co.set_browser_path(playwright_chromium)
-                            else:
-                                print("   ⚠️  No browser path found, DrissionPage will try to find it automatically")
-                            
-                            page = ChromiumPage(co)
-                            print("   ✅ Browser started via DrissionPage")
-                        except Exception as drission_err:
-                            error_msg = str(drission_err)
-                            if not playwright_chromium:
-                                error_msg += " (Playwright Chromium path not found)"
-                            
-                            # Last resort: Try using Playwright directly (it handles browser discovery automatically)
-                            print("   🔄 Trying Playwright directly (auto-discovers browser)...")
-                            try:
-                                from playwright.sync_api import sync_playwright
-                                
-                                # Playwright will automatically find/install browsers
-                                p = sync_playwright().start()
-                                browser = p.chromium.launch(
-                                    headless=True,
-                                    args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu', '--disable-software-rasterizer']
-                                )
-                                
-                                # Launch browser with remote debugging so DrissionPage can connect
-                                browser_with_debug = p.chromium.launch(
-                                    headless=True,
-                                    args=[
-                                        '--remote-debugging-port=9222',
-                                        '--no-sandbox',
-                                        '--disable-dev-shm-usage',
-                                        '--disable-gpu',
-                                        '--disable-software-rasterizer'
-                                    ]
-                                )
-                                browser.close()  # Close the first browser
-                                
-                                # Wait a moment for remote debugging to be ready
-                                time.sleep(2)
-                                
-                                # Now try to connect with DrissionPage
-                                try:
-                                    page = ChromiumPage(addr_or_opts=9222)
-                                    print("   ✅ Browser started via Playwright, connected with DrissionPage")
-                                except:
-                                    # If DrissionPage can't connect, we need a different approach
-                                    raise Exception("Playwright browser started but DrissionPage couldn't connect")
-                                    
-                            except Exception as playwright_err:
-                                raise Exception(f"Could not start or connect to browser. Tried all methods. DrissionPage error: {error_msg}. Playwright error: {playwright_err}")
-                else:
-                    raise e
-            except Exception as e2:
-                print(f"❌ Error connecting to browser: {e2}")
-                print("\n💡 Make sure Chrome is running with remote debugging:")
-                print("   chrome --remote-debugging-port=9222")
-                return None, None
+            error = e
     
-    name = None
-    email = None
-    phone = None
+    print(f"❌ Error connecting to browser: {error}")
+    print("\n💡 Make sure Chrome is running with remote debugging:")
+    print("   chrome --remote-debugging-port=9222")
+    return None
+
+
+def extract_contacts_http_first(url, candidates=False):
+    """Try the browserless HTTP fast path for non-Facebook URLs; None means "use the browser" """
+    if is_facebook_url(url):
+        return None
+    try:
+        from http_extract import HTTP_FAST_PATH, extract_contacts_http
+    except ImportError:
+        return None
+    if not HTTP_FAST_PATH:
+        return None
+    
+    results = extract_contacts_http(url, candidates=candidates)
+    if results:
+        print("⚡ Extracted over HTTP without the browser")
+    return results
+
+
+# Errors meaning the tab can't be used any more (closed, crashed, browser restarted)
+BROWSER_GONE_ERRORS = (PageDisconnectedError, BrowserConnectError, TargetNotFoundError)
+
+
+def extract_contacts(url, page=None, http_first=True, candidates=False):
+    """Extract name, email, and phone from a URL
+
+    With `candidates`, the results also rank every phone/email found (see
+    contacts_from_bundle()). The returned page is None when the browser
+    couldn't be reached or the tab was lost during extraction.
+    """
+    print(f"🌐 Opening URL: {url}")
+    
+    # Static websites don't need a browser tab at all
+    if http_first:
+        results = extract_contacts_http_first(url, candidates=candidates)
+        if results:
+            return results, page
+    
+    if page is None:
+        page = connect_browser()
+        if page is None:
+            return None, None
     
     try:
-        # Navigate to URL
-        page.get(url)
-        page.wait.doc_loaded(timeout=10)
-        time.sleep(2)
+        # For Facebook pages, open the About/Contact info tab directly when its
+        # URL can be derived, skipping the timeline and the About button search
+        about_url = facebook_about_url(url) if is_facebook_url(url) else None
+        opened_about = bool(about_url) and open_facebook_about(page, about_url)
+        # Page template the fields get extracted from (for the strategy stats)
+        template = 'about' if opened_about else ('timeline' if is_facebook_url(url) else 'home')
         
-        # For Facebook pages, try to click "About" section first to get better data
-        if is_facebook_url(url):
+        if not opened_about:
+            # Navigate to URL (without downloading photos, video, fonts and trackers)
+            apply_resource_blocking(page, url)
+            page.get(url)
+            page.wait.doc_loaded(timeout=10)
+            wait_for_ready(page, FACEBOOK_READY_SELECTORS if is_facebook_url(url) else PAGE_READY_SELECTORS)
+        
+        if opened_about:
+            print("📘 Detected Facebook page, opened About section directly")
+        # Otherwise, for Facebook pages, try to click "About" section first to get better data
+        elif is_facebook_url(url):
             print("📘 Detected Facebook page, trying to access About section...")
             try:
-                about_btn = (
-                    page.ele('xpath://a[contains(text(), "About")]', timeout=3) or
-                    page.ele('xpath://span[contains(text(), "About")]', timeout=3) or
-                    page.ele('xpath://a[contains(text(), "简介")]', timeout=3) or
-                    page.ele('xpath://span[contains(text(), "简介")]', timeout=3)
-                )
+                about_selector = race_selectors(page, ABOUT_SELECTORS, timeout=3)
+                about_btn = page.ele(about_selector, timeout=1) if about_selector else None
                 if about_btn:
                     about_btn.scroll.to_see(center=True)
-                    time.sleep(0.5)
                     about_btn.click()
-                    time.sleep(2)
+                    template = 'about'
                     print("   ✅ Clicked About section")
             except:
                 pass
@@ -531,409 +1555,60 @@ def extract_contacts(url, page=None):
         else:
             print("🌍 Detected general webpage, trying to access Contact section...")
             try:
-                contact_btn = (
-                    page.ele('xpath://a[contains(translate(text(), "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"), "contact")]', timeout=3) or
-                    page.ele('xpath://a[contains(translate(@href, "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"), "contact")]', timeout=3)
-                )
+                contact_selector = race_selectors(page, CONTACT_SELECTORS, timeout=3)
+                contact_btn = page.ele(contact_selector, timeout=1) if contact_selector else None
                 if contact_btn:
                     contact_btn.scroll.to_see(center=True)
-                    time.sleep(0.5)
+                    leaving = page.run_js('return location.href;')
                     contact_btn.click()
+                    # Until the navigation commits, the probe still sees the page being left
+                    wait_for_ready(page, PAGE_READY_SELECTORS, leaving=leaving)
                     page.wait.doc_loaded(timeout=10)
-                    time.sleep(2)
+                    template = 'contact'
                     print("   ✅ Clicked Contact section")
             except:
                 pass
         
-        # Extract name after navigating to About/Contact section
-        print("📝 Extracting name...")
-        name = extract_name_from_page(page, url)
-        
-        # Extract email and phone - use precise method for Facebook pages
-        print("🔍 Searching for email and phone...")
-        
-        # For Facebook pages, extract directly from structured Intro section
+        # Facebook renders the Intro/About card lazily: wait until its phone and
+        # email (or the configured subset) show up, or the page settles
         if is_facebook_url(url):
-            contact_info = page.run_js(r"""
-                // Find phone and email directly from Facebook Intro section
-                let phone = null;
-                let email = null;
-
-                // Helper: extract phone candidates from a text block (prefer formatted/WhatsApp style)
-                function extractPhoneFromText(text) {
-                    if (!text) return null;
-                    const t = String(text).replace(/\u00a0/g, ' ').trim(); // normalize nbsp
-
-                    // Common PT formats seen in Facebook Intro:
-                    // - 22 093 1950
-                    // - 966 043 960
-                    // - 21 932 4069
-                    // - +351 911 744 738
-                    const patterns = [
-                        /\+\d{1,4}\s+\d{3}\s+\d{3}\s+\d{3,4}\b/g,      // +351 911 744 738
-                        /\b\d{2,3}\s+\d{3}\s+\d{3,4}\b/g,              // 22 093 1950 / 966 043 960 / 21 932 4069
-                        /\b\d{3}[-\s]\d{3}[-\s]\d{3,4}\b/g             // 966-043-960
-                    ];
-
-                    for (const re of patterns) {
-                        const m = t.match(re);
-                        if (m && m.length) {
-                            // Return the first match in this block
-                            return m[0].trim();
-                        }
-                    }
-                    return null;
-                }
-
-                // Method 0 (most reliable on Facebook): scan Intro/About "rows" (icon + text)
-                // Facebook renders these as list items or repeated blocks in the left "Intro" card.
-                const candidateContainers = document.querySelectorAll(
-                    '[role="main"], [data-pagelet], [class*="intro" i], [class*="about" i]'
-                );
-
-                for (const root of candidateContainers) {
-                    // List-item rows (often contain address/phone/email/website)
-                    const rows = root.querySelectorAll('[role="listitem"], a, div');
-                    for (const row of rows) {
-                        // Only consider short-ish rows to avoid picking numbers from posts
-                        const rowText = (row.innerText || row.textContent || '').trim();
-                        if (!rowText || rowText.length > 200) continue;
-
-                        // Skip anything that is clearly not contact info
-                        if (rowText.toLowerCase().includes('followers')) continue;
-
-                        // Email: detect directly from row text
-                        if (!email) {
-                            const emailMatch = rowText.match(/\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b/);
-                            if (emailMatch) email = emailMatch[1].trim();
-                        }
-
-                        // Phone: prefer rows that contain the phone icon image (VIGUiR6qVQJ.png) OR WhatsApp label/icon
-                        // This avoids picking random numbers elsewhere.
-                        const hasPhoneIconImg = !!row.querySelector('img[src*="VIGUiR6qVQJ"]');
-                        const hasWhatsApp = /whatsapp/i.test(rowText) || !!row.querySelector('img[alt*="whats" i], svg[aria-label*="whats" i]');
-                        const hasPhoneWord = /phone|telephone|tel|telefone|call/i.test(rowText);
-
-                        if (!phone && (hasPhoneIconImg || hasWhatsApp || hasPhoneWord)) {
-                            const p = extractPhoneFromText(rowText);
-                            if (p) {
-                                phone = p;
-                            }
-                        }
-
-                        if (phone && email) break;
-                    }
-                    if (phone && email) break;
-                }
-                
-                // Method 1 fallback: if still no phone, try phone icon container scan
-                if (!phone) {
-                    let phoneIcon = null;
-                    const phoneIconImages = document.querySelectorAll('img[src*="VIGUiR6qVQJ"]');
-                    if (phoneIconImages.length > 0) phoneIcon = phoneIconImages[0];
-
-                    if (!phoneIcon) {
-                        const phoneSvgIcons = document.querySelectorAll('svg');
-                        for (let svg of phoneSvgIcons) {
-                            const ariaLabel = (svg.getAttribute('aria-label') || '').toLowerCase();
-                            const title = (svg.getAttribute('title') || '').toLowerCase();
-                            if (ariaLabel.includes('phone') || ariaLabel.includes('telephone') || ariaLabel.includes('call') ||
-                                title.includes('phone') || title.includes('telephone') || title.includes('call')) {
-                                phoneIcon = svg;
-                                break;
-                            }
-                        }
-                    }
-
-                    if (phoneIcon) {
-                        let container = phoneIcon;
-                        for (let level = 0; level < 20; level++) {
-                            container = container.parentElement;
-                            if (!container) break;
-                            const text = container.innerText || container.textContent || '';
-                            const p = extractPhoneFromText(text);
-                            if (p) { phone = p; break; }
-                        }
-                    }
-                }
-                
-                // Method 2: If phone icon not found, search in Intro section text
-                if (!phone) {
-                    // Find Intro section - look for common Facebook selectors
-                    const introSelectors = [
-                        '[data-pagelet*="ProfileTilesFeed"]',
-                        '[data-pagelet*="ProfileTimeline"]',
-                        '[role="main"]',
-                        '[class*="x1y1aw1k"]',
-                        '[class*="x1n2onr6"]'
-                    ];
-                    
-                    for (let selector of introSelectors) {
-                        const sections = document.querySelectorAll(selector);
-                        for (let section of sections) {
-                            const sectionText = section.innerText || section.textContent || '';
-                            
-                            // Look for phone pattern near contact-related keywords
-                            const phonePattern = /(?:phone|telephone|tel|call|telefone)[^\\n]{0,50}?(\\d{2,3}\\s+\\d{3}\\s+\\d{3,4})/i;
-                            const match = sectionText.match(phonePattern);
-                            if (match) {
-                                phone = match[1].trim();
-                                break;
-                            }
-                            
-                            // Also try finding phone in structured list items
-                            const listItems = section.querySelectorAll('[role="listitem"], div[class*="x1"], span[class*="x1"]');
-                            for (let item of listItems) {
-                                const itemText = item.innerText || item.textContent || '';
-                                
-                                // Check if item contains phone icon
-                                const hasPhoneIcon = item.querySelector('svg[aria-label*="phone" i], svg[aria-label*="telephone" i], svg[aria-label*="call" i]');
-                                
-                                // Also check if item text contains phone-related words
-                                const hasPhoneKeyword = /phone|telephone|tel|call|telefone/i.test(itemText);
-                                
-                                if (hasPhoneIcon || hasPhoneKeyword) {
-                                    // Extract phone number from this item
-                                    const phoneMatch = itemText.match(/\\b(\\d{2,3}\\s+\\d{3}\\s+\\d{3,4})\\b/);
-                                    if (phoneMatch) {
-                                        phone = phoneMatch[1].trim();
-                                        break;
-                                    }
-                                }
-                            }
-                            if (phone) break;
-                        }
-                        if (phone) break;
-                    }
-                }
-                
-                // Method 3: Last resort - find all phone patterns in visible text and pick the one in contact context
-                if (!phone) {
-                    const allText = document.body.innerText || document.body.textContent || '';
-                    // Find all phone patterns
-                    const allPhones = allText.matchAll(/\\b(\\d{2,3}\\s+\\d{3}\\s+\\d{3,4})\\b/g);
-                    for (let match of allPhones) {
-                        const candidate = match[1];
-                        const index = allText.indexOf(candidate);
-                        // Check context (should be near email, address, or in Intro section)
-                        const context = allText.substring(Math.max(0, index - 100), index + 100).toLowerCase();
-                        if (context.includes('@') || context.includes('email') || 
-                            context.includes('address') || context.includes('morada') ||
-                            context.includes('intro') || context.includes('about')) {
-                            phone = candidate.trim();
-                            break;
-                        }
-                    }
-                }
-                
-                // Method 3: Find email icon
-                const emailIcons = document.querySelectorAll('svg');
-                for (let icon of emailIcons) {
-                    const ariaLabel = (icon.getAttribute('aria-label') || '').toLowerCase();
-                    const title = (icon.getAttribute('title') || '').toLowerCase();
-                    
-                    if (ariaLabel.includes('email') || ariaLabel.includes('mail') || 
-                        ariaLabel.includes('envelope') || title.includes('email') || 
-                        title.includes('mail') || title.includes('envelope')) {
-                        
-                        let container = icon;
-                        for (let level = 0; level < 10; level++) {
-                            container = container.parentElement;
-                            if (!container) break;
-                            
-                            const text = container.innerText || container.textContent || '';
-                            const emailMatch = text.match(/\\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\\.[a-zA-Z]{2,})\\b/);
-                            if (emailMatch) {
-                                email = emailMatch[1].trim();
-                                break;
-                            }
-                        }
-                        if (email) break;
-                    }
-                }
-                
-                return {phone: phone, email: email};
-            """)
-            
-            phone = contact_info.get('phone') if contact_info else None
-            email = contact_info.get('email') if contact_info else None
-            
-            if phone:
-                print(f"   ✅ Found phone: {phone}")
-            else:
-                print("   ℹ️  No phone found in page content")
-            
-            if email:
-                print(f"   ✅ Found email: {email}")
-            else:
-                # Fallback: try extracting email from page text
-                page_text = page.html
-                try:
-                    visible_text = page.ele('tag:body').text if page.ele('tag:body') else ""
-                    page_text += " " + visible_text
-                except:
-                    pass
-                email = extract_email_from_text(page_text)
-        else:
-            # For non-Facebook pages, use original method
-            page_text = page.html
-            try:
-                visible_text = page.ele('tag:body').text if page.ele('tag:body') else ""
-                page_text += " " + visible_text
-            except:
-                pass
-            
-            email = extract_email_from_text(page_text)
-            
-            # Only extract phone if phone icon exists
-            phone = None
-            try:
-                has_phone_indicator = page.run_js("""
-                    const svgs = document.querySelectorAll('svg[aria-label*="phone" i], svg[aria-label*="telephone" i], svg[aria-label*="call" i]');
-                    return svgs.length > 0;
-                """)
-                
-                if has_phone_indicator:
-                    phone = extract_phone_from_text(page_text)
-                    if phone:
-                        print(f"   ✅ Found phone: {phone}")
-            except Exception as e:
-                print(f"      ⚠️ Error extracting phone: {e}")
-                phone = None
+            outcome = watch_for_contacts(page)
+            print(f"   ⏱️  Contact fields: {outcome}")
         
-        # Close any popups
-        try:
-            page.run_js("""
-                document.querySelectorAll('.modal, .popup, .overlay').forEach(el => {
-                    if (el.style) el.style.display = 'none';
-                    el.remove();
-                });
-                document.body.style.overflow = 'auto';
-            """)
-        except:
-            pass
+        # Extract name, email and phone (Facebook: from the structured Intro
+        # section) and close popups in a single in-page script
+        print("🔍 Extracting name, email and phone...")
+        # in the order that worked best on this domain/template before
+        plan = plan_extraction(url, template)
+        archive = get_page_archive()
+        data = page.run_js(extract_bundle_js(is_facebook_url(url), plan, keep_page=bool(archive), candidates=candidates))
+        if archive:
+            archive.save(url, page.url, data)
+        results = contacts_from_bundle(data, url, plan, candidates=candidates)
         
+    except BROWSER_GONE_ERRORS as e:
+        # The tab (or the whole browser) is gone: don't hand it back for reuse
+        print(f"❌ Lost the browser tab while extracting contacts: {e}")
+        return None, None
     except Exception as e:
         print(f"❌ Error extracting contacts: {e}")
+        clear_resource_blocking(page)
         return None, page
     
-    return {
-        'name': name,
-        'email': email,
-        'phone': phone
-    }, page
-
-
-def read_csv_urls(filename):
-    """Read URLs from CSV file (column A)"""
-    urls = []
-    try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            # Skip header row
-            next(reader, None)
-            
-            for row_num, row in enumerate(reader, start=2):
-                if len(row) > 0 and row[0].strip():
-                    url = row[0].strip()
-                    if url.startswith(('http://', 'https://')):
-                        urls.append({
-                            'row': row_num,
-                            'url': url,
-                            'name': row[1].strip() if len(row) > 1 else '',
-                            'phone': row[2].strip() if len(row) > 2 else '',
-                            'email': row[3].strip() if len(row) > 3 else ''
-                        })
-        
-        return urls
-    except Exception as e:
-        print(f"❌ Error reading CSV: {e}")
-        return []
+    clear_resource_blocking(page)
+    return results, page
 
 
 def clean_name(name):
-    """Clean name by removing verified badges"""
-    if not name:
-        return name
-    name = name.strip()
-    name = re.sub(r'\s*已认证账户\s*$', '', name)
-    name = re.sub(r'\s*已认证\s*$', '', name)
-    name = re.sub(r'\s*Verified\s*Account\s*$', '', name, flags=re.IGNORECASE)
-    name = re.sub(r'\s*Verified\s*$', '', name, flags=re.IGNORECASE)
-    return name.strip()
-
-
-def rewrite_csv_clean_names(filename):
-    """Read CSV, clean all names, and rewrite the file"""
-    try:
-        # Read all rows
-        rows = []
-        with open(filename, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            rows = list(reader)
-        
-        # Clean names in all rows (skip header row)
-        cleaned_count = 0
-        for i in range(1, len(rows)):
-            if len(rows[i]) > 1 and rows[i][1]:
-                original_name = rows[i][1]
-                cleaned_name = clean_name(original_name)
-                if cleaned_name != original_name:
-                    rows[i][1] = cleaned_name
-                    cleaned_count += 1
-        
-        # Write back to file
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerows(rows)
-        
-        print(f"✅ Cleaned {cleaned_count} names in CSV")
-        return True
-    except Exception as e:
-        print(f"❌ Error rewriting CSV: {e}")
-        return False
+    """Clean name by removing verified badges (and normalizing Unicode/whitespace)"""
+    return normalize_name(name)
 
 
-def update_csv_row(filename, row_num, name, phone, email):
-    """Update a specific row in CSV file"""
-    try:
-        # Clean the name before saving
-        name = clean_name(name)
-        
-        # Read all rows
-        rows = []
-        with open(filename, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            rows = list(reader)
-        
-        # Update the specific row (row_num is 1-indexed, rows list is 0-indexed)
-        if row_num <= len(rows):
-            row_idx = row_num - 1
-            # Ensure row has enough columns
-            while len(rows[row_idx]) < 4:
-                rows[row_idx].append('')
-            
-            # Update columns B, C, D (indices 1, 2, 3)
-            rows[row_idx][1] = name
-            rows[row_idx][2] = phone
-            rows[row_idx][3] = email
-        
-        # Write back to file
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerows(rows)
-        
-        return True
-    except Exception as e:
-        print(f"❌ Error updating CSV: {e}")
-        return False
-
-
-def extract_single_url(url):
+def extract_single_url(url, page=None, candidates=False):
     """Extract contacts from a single URL and return JSON"""
     try:
         # Extract contacts
-        result = extract_contacts(url, page=None)
+        result = extract_contacts(url, page=page, candidates=candidates)
         
         if result is None:
             return {
@@ -949,14 +1624,19 @@ def extract_single_url(url):
             email = results.get('email', '') or ''
             phone = results.get('phone', '') or ''
             
+            data = {
+                "name": name,
+                "email": email,
+                "phone": phone,
+                "phone_e164": results.get('phone_e164') or '',
+                "url": url
+            }
+            # Ranked alternatives with their evidence, when asked for
+            if 'candidates' in results:
+                data["candidates"] = results['candidates']
             return {
                 "success": True,
-                "data": {
-                    "name": name,
-                    "email": email,
-                    "phone": phone,
-                    "url": url
-                }
+                "data": data
             }
         else:
             return {
@@ -981,6 +1661,7 @@ def main():
         print("\n💡 Usage:")
         print("   Single URL (JSON): python extract_contacts.py <URL>")
         print("   HTTP API server: python extract_contacts.py --server")
+        print("   Ranked phone/email candidates: python extract_contacts.py <URL> --candidates")
         print("\n   Example:")
         print("   python extract_contacts.py https://www.facebook.com/FidelidadeSeguros.Portugal")
         sys.exit(1)
@@ -998,7 +1679,7 @@ def main():
     
     # Single URL mode - return JSON
     url = first_arg
-    result = extract_single_url(url)
+    result = extract_single_url(url, candidates='--candidates' in sys.argv[2:])
     
     # Output JSON to stdout
     print(json.dumps(result, ensure_ascii=False, indent=2))
@@ -1039,7 +1720,10 @@ if __name__ == "__main__":
                     "error": "URL must start with http:// or https://"
                 }), 400
             
-            result = extract_single_url(url)
+            # Each request gets its own tab so overlapping requests don't collide
+            from tab_pool import get_tab_pool
+            with get_tab_pool().tab() as tab:
+                result = extract_single_url(url, page=tab, candidates=request.args.get('candidates') == '1')
             status_code = 200 if result.get('success') else 500
             return jsonify(result), status_code
         
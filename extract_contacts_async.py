@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+Async Contact Extractor - Extract name, phone, and email over the DevTools protocol
+
+The synchronous extractor blocks a thread per page (page.get, page.ele
+timeouts, fixed sleeps). This engine talks to Chrome's DevTools protocol
+directly over one websocket and drives every tab from a single asyncio event
+loop, so hundreds of in-flight pages cost hundreds of coroutines, not threads.
+It runs the same in-page scripts and text extractors as extract_contacts.py
+and returns the same name/email/phone result.
+
+Usage:
+    # Extract one or more URLs (JSON output):
+    python extract_contacts_async.py <URL> [<URL> ...] [--concurrency N]
+
+    # From Python:
+    result = await extract_contacts_async(url)
+    results = await extract_many_async(urls, concurrency=50)
+
+Requires Chrome running with --remote-debugging-port=9222 and the
+`websockets` package.
+"""
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+import urllib.request
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+# Extraction logic is shared with the synchronous extractor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from extract_contacts import (
+    READY_CHECK_JS, PAGE_READY_SELECTORS, FACEBOOK_READY_SELECTORS,
+    ReadyTracker, ContactWatch, contact_watch_js, build_block_patterns, extract_bundle_js, contacts_from_bundle, plan_extraction, is_facebook_url,
+    facebook_about_url, is_facebook_about_url, selector_race_js, ABOUT_SELECTORS, CONTACT_SELECTORS,
+)
+from page_archive import get_page_archive
+
+
+DEFAULT_DEBUG_PORT = 9222
+DEFAULT_CONCURRENCY = 20
+
+
+class CDPError(Exception):
+    """Raised when a DevTools protocol command returns an error"""
+
+
+class CDPBrowser:
+    """One websocket connection to the browser, multiplexing all tab sessions"""
+
+    def __init__(self, port=DEFAULT_DEBUG_PORT):
+        self.port = port
+        self._ws = None
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._listeners = {}
+        self._reader = None
+
+    async def connect(self):
+        """Open the browser-level DevTools websocket"""
+        if websockets is None:
+            raise ImportError("The async engine requires websockets: pip install websockets")
+
+        def fetch_version():
+            with urllib.request.urlopen(f'http://127.0.0.1:{self.port}/json/version', timeout=5) as resp:
+                return json.loads(resp.read().decode('utf-8'))
+
+        version = await asyncio.to_thread(fetch_version)
+        self._ws = await websockets.connect(version['webSocketDebuggerUrl'], max_size=None)
+        self._reader = asyncio.create_task(self._read_loop())
+        return self
+
+    async def close(self):
+        """Close the websocket (the browser itself keeps running)"""
+        if self._reader:
+            self._reader.cancel()
+        if self._ws:
+            await self._ws.close()
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _read_loop(self):
+        """Dispatch command responses and events to whoever is waiting for them"""
+        reason = "closed by the browser"
+        try:
+            async for raw in self._ws:
+                message = json.loads(raw)
+                if 'id' in message:
+                    future = self._pending.pop(message['id'], None)
+                    if future and not future.done():
+                        if 'error' in message:
+                            future.set_exception(CDPError(message['error'].get('message', str(message['error']))))
+                        else:
+                            future.set_result(message.get('result', {}))
+                else:
+                    key = (message.get('sessionId'), message.get('method'))
+                    for future in self._listeners.pop(key, []):
+                        if not future.done():
+                            future.set_result(message.get('params', {}))
+        except Exception as e:
+            reason = str(e)
+        finally:
+            # Connection gone (lost, closed cleanly or by close()): fail everything
+            # still waiting instead of leaving it to its own timeout
+            error = CDPError(f"DevTools connection closed: {reason}")
+            waiting = list(self._pending.values())
+            for futures in self._listeners.values():
+                waiting.extend(futures)
+            self._pending.clear()
+            self._listeners.clear()
+            for future in waiting:
+                if not future.done():
+                    future.set_exception(error)
+
+    async def send(self, method, params=None, session_id=None, timeout=30):
+        """Send a command and wait for its result"""
+        if self._reader is None or self._reader.done():
+            raise CDPError("DevTools connection closed")
+        message_id = next(self._ids)
+        message = {'id': message_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        await self._ws.send(json.dumps(message))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(message_id, None)
+
+    def expect_event(self, method, session_id=None):
+        """Return a future resolved by the next `method` event of a session"""
+        future = asyncio.get_running_loop().create_future()
+        self._listeners.setdefault((session_id, method), []).append(future)
+        return future
+
+    async def new_tab(self):
+        """Open a blank tab and attach a flat session to it"""
+        target = await self.send('Target.createTarget', {'url': 'about:blank'})
+        tab = CDPTab(self, target['targetId'], None)
+        try:
+            attached = await self.send('Target.attachToTarget', {'targetId': tab.target_id, 'flatten': True})
+            tab.session_id = attached['sessionId']
+            await tab.send('Page.enable')
+            await tab.send('Network.enable')
+        except BaseException:
+            await tab.close()
+            raise
+        return tab
+
+    def forget_session(self, session_id):
+        """Drop event listeners left behind by a closed tab"""
+        for key in [k for k in self._listeners if k[0] == session_id]:
+            for future in self._listeners.pop(key):
+                future.cancel()
+
+
+class CDPTab:
+    """A page target driven through its session on the shared connection"""
+
+    def __init__(self, browser, target_id, session_id):
+        self.browser = browser
+        self.target_id = target_id
+        self.session_id = session_id
+
+    async def send(self, method, params=None, timeout=30):
+        return await self.browser.send(method, params, session_id=self.session_id, timeout=timeout)
+
+    async def wait_load(self, future, timeout=10):
+        """Wait for a load event future, giving up quietly after `timeout` seconds"""
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def get(self, url, timeout=10):
+        """Navigate and wait for the load event"""
+        # Don't download photos, video, fonts and trackers the extractors never read
+        await self.send('Network.setBlockedURLs', {'urls': build_block_patterns(keep_urls=[url])})
+        loaded = self.browser.expect_event('Page.loadEventFired', self.session_id)
+        await self.send('Page.navigate', {'url': url})
+        await self.wait_load(loaded, timeout)
+
+    async def run_js(self, body, timeout=30):
+        """Run a function body in the page and return its value"""
+        result = await self.send('Runtime.evaluate', {
+            'expression': f'(function(){{\n{body}\n}})()',
+            'returnByValue': True,
+            'awaitPromise': True,
+        }, timeout=timeout)
+        if 'exceptionDetails' in result:
+            raise CDPError(result['exceptionDetails'].get('text', 'JavaScript error'))
+        return result.get('result', {}).get('value')
+
+    async def title(self):
+        return await self.run_js('return document.title;')
+
+    async def location(self):
+        return await self.run_js('return location.href;')
+
+    async def close(self):
+        if self.session_id:
+            self.browser.forget_session(self.session_id)
+        try:
+            await self.browser.send('Target.closeTarget', {'targetId': self.target_id})
+        except Exception:
+            pass
+
+
+async def wait_for_ready_async(tab, selectors, interval=0.1):
+    """Wait until any target element exists or the network goes idle (capped)"""
+    script = READY_CHECK_JS % json.dumps(list(selectors))
+    tracker = ReadyTracker()
+    while True:
+        try:
+            state = await tab.run_js(script)
+        except Exception:
+            state = None
+        outcome = tracker.update(state)
+        if outcome:
+            return outcome
+        await asyncio.sleep(interval)
+
+
+async def watch_for_contacts_async(tab, fields=None, interval=0.1):
+    """Wait until the required contact fields appear in the page (capped)"""
+    script = contact_watch_js(fields)
+    watch = ContactWatch(fields)
+    while True:
+        try:
+            state = await tab.run_js(script)
+        except Exception:
+            state = None
+        outcome = watch.update(state)
+        if outcome:
+            return outcome
+        await asyncio.sleep(interval)
+
+
+async def race_selectors_async(tab, selectors, timeout=3, interval=0.1, click=False):
+    """Wait for the first of several selectors under one shared deadline; returns the winner or None"""
+    script = selector_race_js(selectors, click)
+    deadline = time.time() + timeout
+    while True:
+        try:
+            index = await tab.run_js(script)
+        except Exception:
+            index = None
+        if index is not None and index >= 0:
+            return selectors[index]
+        if time.time() >= deadline:
+            return None
+        await asyncio.sleep(interval)
+
+
+async def extract_on_tab(tab, url):
+    """Run the full extraction for one URL on an already-open tab"""
+    # Facebook: open the About/Contact info tab directly when its URL can be derived
+    opened_about = False
+    about_url = facebook_about_url(url) if is_facebook_url(url) else None
+    if about_url:
+        try:
+            await tab.get(about_url)
+            opened_about = is_facebook_about_url(await tab.location())
+        except Exception:
+            pass
+
+    # Page template the fields get extracted from (for the strategy stats)
+    template = 'about' if opened_about else ('timeline' if is_facebook_url(url) else 'home')
+
+    if not opened_about:
+        await tab.get(url)
+        await wait_for_ready_async(tab, FACEBOOK_READY_SELECTORS if is_facebook_url(url) else PAGE_READY_SELECTORS)
+
+    if is_facebook_url(url):
+        # Otherwise try to open the "About" section first to get better data
+        try:
+            if not opened_about and await race_selectors_async(tab, ABOUT_SELECTORS, click=True):
+                template = 'about'
+        except Exception:
+            pass
+        # Wait until the lazily rendered Intro/About contact fields show up
+        await watch_for_contacts_async(tab)
+    else:
+        # Try to open the "Contact" page
+        try:
+            loaded = tab.browser.expect_event('Page.loadEventFired', tab.session_id)
+            if await race_selectors_async(tab, CONTACT_SELECTORS, click=True):
+                await tab.wait_load(loaded)
+                await wait_for_ready_async(tab, PAGE_READY_SELECTORS)
+                template = 'contact'
+        except Exception:
+            pass
+
+    # Name, email, phone and popup cleanup in one in-page script, skipping
+    # lookup methods that never yield on this domain/template
+    plan = plan_extraction(url, template)
+    archive = get_page_archive()
+    data = await tab.run_js(extract_bundle_js(is_facebook_url(url), plan, keep_page=bool(archive)))
+    # Compressing the snapshot, the Python extractors and the strategy stats
+    # file write all block: keep them off the event loop
+    if archive:
+        await asyncio.to_thread(archive.save, url, await tab.location(), data)
+    return await asyncio.to_thread(contacts_from_bundle, data, url, plan)
+
+
+async def extract_contacts_async(url, browser=None):
+    """Extract name, email, and phone from a URL in a fresh tab"""
+    own_browser = browser is None
+    if own_browser:
+        browser = await CDPBrowser().connect()
+    tab = None
+    try:
+        tab = await browser.new_tab()
+        return await extract_on_tab(tab, url)
+    except Exception as e:
+        print(f"❌ Error extracting contacts from {url}: {e}")
+        return None
+    finally:
+        if tab is not None:
+            await tab.close()
+        if own_browser:
+            await browser.close()
+
+
+async def extract_many_async(urls, concurrency=DEFAULT_CONCURRENCY, port=DEFAULT_DEBUG_PORT):
+    """Extract many URLs over one connection with at most `concurrency` tabs open
+
+    Returns one result per URL, in order; a URL that fails gets None and
+    doesn't affect the others.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with CDPBrowser(port) as browser:
+        async def run(url):
+            async with semaphore:
+                try:
+                    return await extract_contacts_async(url, browser=browser)
+                except Exception as e:
+                    print(f"❌ Error extracting contacts from {url}: {e}")
+                    return None
+
+        return await asyncio.gather(*(run(url) for url in urls))
+
+
+def main():
+    """Extract the URLs given on the command line and print JSON results"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Extract contacts from URLs with the asyncio DevTools engine")
+    parser.add_argument('urls', nargs='+', help="URLs to extract (http:// or https://)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Maximum number of tabs open at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--port', type=int, default=DEFAULT_DEBUG_PORT,
+                        help=f"Chrome remote debugging port (default: {DEFAULT_DEBUG_PORT})")
+    args = parser.parse_args()
+
+    invalid = [u for u in args.urls if not u.startswith(('http://', 'https://'))]
+    if invalid:
+        print(f"❌ Error: Invalid URL: {invalid[0]}")
+        print("\n💡 URL must start with http:// or https://")
+        sys.exit(1)
+
+    results = asyncio.run(extract_many_async(args.urls, args.concurrency, args.port))
+    output = []
+    for url, result in zip(args.urls, results):
+        if result:
+            output.append({"success": True, "data": {**result, "url": url}})
+        else:
+            output.append({"success": False, "error": "Failed to extract contacts from the URL", "url": url})
+
+    print(json.dumps(output if len(output) > 1 else output[0], ensure_ascii=False, indent=2))
+    sys.exit(0 if all(item['success'] for item in output) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,861 +3,38 @@
 Contact Extractor - Extract name, phone, and email from URLs in CSV file
 
 Usage:
-    python extract_contacts.py [contacts.csv]
+    python extract_contacts_from_csv.py [contacts.csv] [--workers N]
 
 Example:
-    python extract_contacts.py
-    python extract_contacts.py contacts.csv
+    python extract_contacts_from_csv.py
+    python extract_contacts_from_csv.py contacts.csv
+    
+    # Run 4 independent headless browsers in parallel (ports 9300-9303):
+    python extract_contacts_from_csv.py contacts.csv --workers 4
 
 The CSV file should have:
 - Column A: URL
 - Column B: Name (will be filled)
 - Column C: Phone (will be filled)
 - Column D: Email (will be filled)
+
+URLs, results, attempts and claims live in a SQLite job store next to the
+CSV (contacts.db); the CSV is imported at the start of a run and exported
+at the end (or with --export). Several runs can share one store:
+
+    python extract_contacts_from_csv.py contacts.csv --missing phone --max-attempts 3
 """
 from DrissionPage import ChromiumPage
 import time
-import re
 import sys
+import sqlite3
 import csv
 import os
-from datetime import datetime
-
-
-def get_playwright_chromium_path():
-    """Get the path to Playwright's Chromium browser"""
-    import glob
-    
-    # Method 1: Use Playwright's API
-    try:
-        from playwright.sync_api import sync_playwright
-        with sync_playwright() as p:
-            # Get the browser path from Playwright
-            browser = p.chromium
-            executable_path = browser.executable_path
-            if executable_path and os.path.exists(executable_path):
-                print(f"   ✅ Found via Playwright API: {executable_path}")
-                return executable_path
-    except Exception as e:
-        print(f"   ⚠️  Playwright API failed: {e}")
-    
-    # Method 2: Try common cache locations
-    cache_locations = [
-        os.path.expanduser('~/.cache/ms-playwright'),
-        '/opt/render/.cache/ms-playwright',
-        '/root/.cache/ms-playwright',
-        os.path.expanduser('~/.local/share/ms-playwright'),
-    ]
-    
-    for cache_dir in cache_locations:
-        if not os.path.exists(cache_dir):
-            continue
-        
-        print(f"   🔍 Checking cache directory: {cache_dir}")
-        
-        # Look for chromium directories
-        chromium_patterns = [
-            os.path.join(cache_dir, 'chromium-*/chrome-linux/chrome'),
-            os.path.join(cache_dir, 'chromium-*/chrome-linux/chromium'),
-            os.path.join(cache_dir, 'chromium-*/headless_shell'),
-        ]
-        
-        for pattern in chromium_patterns:
-            matches = glob.glob(pattern)
-            for match in matches:
-                if os.path.exists(match) and os.access(match, os.X_OK):
-                    print(f"   ✅ Found Chromium: {match}")
-                    return match
-                
-                # Also check if it's a directory and look for chrome inside
-                if os.path.isdir(match):
-                    chrome_exe = os.path.join(match, 'chrome')
-                    if os.path.exists(chrome_exe) and os.access(chrome_exe, os.X_OK):
-                        print(f"   ✅ Found Chromium: {chrome_exe}")
-                        return chrome_exe
-    
-    # Method 3: Check common Render/Heroku paths (limited search to avoid timeouts)
-    print("   🔍 Checking Render-specific paths...")
-    render_paths = [
-        '/opt/render/project/src/.cache/ms-playwright',
-        '/app/.cache/ms-playwright',
-    ]
-    
-    for render_path in render_paths:
-        if os.path.exists(render_path):
-            chromium_pattern = os.path.join(render_path, 'chromium-*/chrome-linux/chrome')
-            matches = glob.glob(chromium_pattern)
-            for match in matches:
-                if os.path.exists(match) and os.access(match, os.X_OK):
-                    print(f"   ✅ Found Chromium in Render path: {match}")
-                    return match
-    
-    print("   ❌ Could not find Playwright Chromium in any location")
-    return None
-
-
-def extract_email_from_text(text):
-    """Extract email addresses from text"""
-    if not text:
-        return None
-    email_pattern = r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'
-    matches = re.findall(email_pattern, text)
-    if matches:
-        # Filter out common fake/example emails
-        filtered = [e for e in matches if not any(x in e.lower() for x in [
-            'example.com', 'test.com', 'domain.com', 'email.com', 
-            'facebook.com', 'placeholder.com', 'yourdomain.com'
-        ])]
-        if filtered:
-            return filtered[0]
-    return None
-
-
-def extract_phone_from_text(text):
-    """Extract phone numbers from text - only return if confident it's a phone number"""
-    if not text:
-        return None
-    
-    # First priority: Look for phone numbers near keywords (most reliable)
-    phone_keywords = ['phone', 'telephone', 'tel', 'call', 'contact', 'telefone', 'telefone:', '电话', 'mobile', 'cell']
-    for keyword in phone_keywords:
-        # Look for pattern: keyword followed by phone number with separators
-        # This is more reliable as it has context
-        keyword_patterns = [
-            rf'(?i){re.escape(keyword)}[:\s]*([\+\d][\d\s\-\(\)]{{8,20}})',
-            rf'(?i){re.escape(keyword)}[:\s]*(\d{{2,4}}[\s\-]\d{{3,4}}[\s\-]\d{{3,4}})',
-        ]
-        for pattern in keyword_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                phone = matches[0].strip()
-                phone_clean = re.sub(r'[^\d+]', '', phone)
-                # Must have at least 9 digits and contain separators (spaces, dashes, parentheses)
-                if len(phone_clean) >= 9 and len(phone_clean) <= 15:
-                    # Check if it has separators (more likely to be a phone number)
-                    if any(sep in phone for sep in [' ', '-', '(', ')', '+']):
-                        return phone
-    
-    # Second priority: Well-formatted phone numbers with separators
-    # These patterns require separators, making them more reliable
-    formatted_patterns = [
-        # Portuguese format: 21 794 8800 (2 digits, space, 3 digits, space, 4 digits)
-        r'\b\d{2}\s+\d{3}\s+\d{4}\b',
-        # Portuguese mobile: 9XX XXX XXX or 9XX-XXX-XXX
-        r'\b9\d{2}[\s\-]\d{3}[\s\-]\d{3}\b',
-        # Portuguese landline: 2X XXX XXXX or 2X-XXX-XXXX
-        r'\b2\d{1}[\s\-]\d{3}[\s\-]\d{4}\b',
-        # US/International format: (XXX) XXX-XXXX or +1 234 567 8900
-        r'\+?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,9}',
-        # US format: (XXX) XXX-XXXX
-        r'\(\d{3}\)[\s\-]?\d{3}[\s\-]?\d{4}',
-        # Format with dashes: XXX-XXX-XXXX
-        r'\d{3}[\-]\d{3}[\-]\d{4}',
-    ]
-    
-    for pattern in formatted_patterns:
-        matches = re.findall(pattern, text)
-        if matches:
-            for match in matches:
-                phone = match.strip()
-                phone_clean = re.sub(r'[^\d+]', '', phone)
-                # Must be 9-15 digits
-                if 9 <= len(phone_clean) <= 15:
-                    # Exclude years (1900-2099)
-                    if len(phone_clean) >= 4:
-                        first_four = int(phone_clean[:4])
-                        if 1900 <= first_four <= 2099:
-                            continue
-                    # Exclude pure numbers without separators (likely IDs, not phone numbers)
-                    # Only accept if it has separators or starts with +
-                    if any(sep in phone for sep in [' ', '-', '(', ')', '+']) or phone.startswith('+'):
-                        return phone
-    
-    # Last resort: Only look for phone numbers in specific contexts
-    # Look for phone-like patterns near contact-related words
-    context_pattern = r'(?i)(?:phone|tel|call|contact|telefone)[^.]{0,100}?(\d{2,4}[\s\-]\d{3,4}[\s\-]\d{3,4})'
-    context_matches = re.findall(context_pattern, text)
-    if context_matches:
-        for match in context_matches:
-            phone = match.strip()
-            phone_clean = re.sub(r'[^\d+]', '', phone)
-            if 9 <= len(phone_clean) <= 15:
-                return phone
-    
-    # If no phone number found with separators or context, return None
-    # This prevents extracting random numbers like IDs, dates, etc.
-    return None
-
-
-def extract_name_from_page(page, url=None):
-    """Extract name/title from page"""
-    name = None
-    
-    try:
-        # Get URL from page if not provided
-        if url is None:
-            try:
-                url = page.url
-            except:
-                url = ""
-        
-        # For Facebook pages, use JavaScript to find the page name more reliably
-        if is_facebook_url(url):
-            try:
-                # Use JavaScript to find Facebook page name - more reliable
-                name = page.run_js("""
-                    // Method 1: Find h1 with page name (most reliable)
-                    const h1s = document.querySelectorAll('h1');
-                    for (let h1 of h1s) {
-                        const text = h1.textContent.trim();
-                        // Filter out common UI elements
-                        if (text && text.length > 2 && text.length < 200 && 
-                            !text.match(/^\\d+/) && 
-                            !['Facebook', 'Home', 'Posts', 'About', 'Contact', 'Menu', '简介', '帖子'].includes(text) &&
-                            !text.includes('粉丝') && !text.includes('followers') && !text.includes('likes')) {
-                            return text;
-                        }
-                    }
-                    
-                    // Method 2: Find span with page name near profile picture
-                    const spans = document.querySelectorAll('span[dir="auto"]');
-                    const candidates = [];
-                    for (let span of spans) {
-                        const text = span.textContent.trim();
-                        if (text && text.length > 2 && text.length < 200 && 
-                            !text.match(/^\\d+/) && 
-                            !['Facebook', 'Home', 'Posts', 'About', 'Contact', 'Menu', '简介', '帖子'].includes(text) &&
-                            !text.includes('粉丝') && !text.includes('followers') && !text.includes('likes')) {
-                            candidates.push(text);
-                        }
-                    }
-                    // Return the first candidate that looks like a name (has letters)
-                    for (let candidate of candidates) {
-                        if (/[a-zA-ZÀ-ÿ]/.test(candidate)) {
-                            return candidate;
-                        }
-                    }
-                    
-                    return null;
-                """)
-                if name and len(name) > 2 and len(name) < 200:
-                    # Remove "已认证" and "已认证账户" (verified badge) and other common suffixes
-                    name = name.strip()
-                    name = re.sub(r'\s*已认证账户\s*$', '', name)
-                    name = re.sub(r'\s*已认证\s*$', '', name)
-                    name = re.sub(r'\s*Verified\s*Account\s*$', '', name, flags=re.IGNORECASE)
-                    name = re.sub(r'\s*Verified\s*$', '', name, flags=re.IGNORECASE)
-                    return name
-            except Exception as e:
-                print(f"      ⚠️ JavaScript name extraction failed: {e}")
-        
-        # Try h1 tag (works for both Facebook and general pages)
-        try:
-            h1_elements = page.eles('css:h1', timeout=2)
-            for h1 in h1_elements:
-                if h1:
-                    name = h1.text.strip()
-                    # Filter out common UI text and numbers
-                    if name and len(name) > 2 and len(name) < 200:
-                        # Skip if it's just numbers, followers count, or common UI text
-                        if (not name.isdigit() and 
-                            name.lower() not in ['facebook', 'home', 'posts', 'about', 'contact', 'menu', '简介', '帖子'] and
-                            '粉丝' not in name and 'followers' not in name.lower() and 'likes' not in name.lower()):
-                            # Remove "已认证" and "已认证账户" (verified badge) and other common suffixes
-                            name = re.sub(r'\s*已认证账户\s*$', '', name)
-                            name = re.sub(r'\s*已认证\s*$', '', name)
-                            name = re.sub(r'\s*Verified\s*Account\s*$', '', name, flags=re.IGNORECASE)
-                            name = re.sub(r'\s*Verified\s*$', '', name, flags=re.IGNORECASE)
-                            return name
-        except:
-            pass
-        
-        # Try page title
-        title = page.title
-        if title:
-            # Remove common suffixes like "| Facebook", "- Facebook", etc.
-            title = re.sub(r'\s*[-|]\s*Facebook.*$', '', title, flags=re.IGNORECASE)
-            title = re.sub(r'\s*[-|]\s*.*$', '', title)
-            # Remove "已认证" and "已认证账户" (verified badge)
-            title = re.sub(r'\s*已认证账户\s*$', '', title)
-            title = re.sub(r'\s*已认证\s*$', '', title)
-            title = re.sub(r'\s*Verified\s*Account\s*$', '', title, flags=re.IGNORECASE)
-            title = re.sub(r'\s*Verified\s*$', '', title, flags=re.IGNORECASE)
-            if title and len(title) > 2 and len(title) < 200:
-                return title.strip()
-        
-        # Try meta tags (og:title, title)
-        try:
-            name = page.run_js("""
-                const meta = document.querySelector('meta[property="og:title"]') || 
-                            document.querySelector('meta[name="title"]');
-                return meta ? (meta.content || '').trim() : null;
-            """)
-            if name and len(name) > 2 and len(name) < 200:
-                return name
-        except:
-            pass
-            
-    except Exception as e:
-        print(f"      ⚠️ Name extraction error: {e}")
-    
-    return name
-
-
-def is_facebook_url(url):
-    """Check if URL is a Facebook page"""
-    return 'facebook.com' in url.lower() or 'fb.com' in url.lower()
-
-
-def extract_contacts(url, page=None):
-    """Extract name, email, and phone from a URL"""
-    print(f"🌐 Opening URL: {url}")
-    
-    # Connect to browser (assumes Chrome is running with --remote-debugging-port=9222)
-    if page is None:
-        try:
-            # Try to connect to existing browser instance
-            page = ChromiumPage(addr_or_opts=9222)
-        except Exception as e:
-            # If connection fails, try to start browser automatically (for production)
-            try:
-                import subprocess
-                import os
-                # Check if we're in a production environment (Render, Heroku, etc.)
-                if os.environ.get('RENDER') or os.environ.get('DYNO') or os.path.exists('/.dockerenv'):
-                    print("🔧 Production environment detected, starting headless browser...")
-                    # Try to start chromium in headless mode
-                    chromium_paths = []
-                    
-                    # Check if we're in Docker (has /.dockerenv file)
-                    in_docker = os.path.exists('/.dockerenv')
-                    
-                    if in_docker:
-                        # In Docker, prioritize system Chromium
-                        print("   🐳 Docker environment detected, using system Chromium")
-                        chromium_paths = [
-                            '/usr/bin/chromium',  # Docker/Ubuntu (most common)
-                            '/usr/bin/chromium-browser',  # Debian
-                        ]
-                    else:
-                        # Not in Docker, try Playwright first
-                        playwright_path = get_playwright_chromium_path()
-                        if playwright_path:
-                            chromium_paths.append(playwright_path)
-                            print(f"   Found Playwright Chromium: {playwright_path}")
-                        
-                        # Also try to find it manually
-                        import glob
-                        playwright_chromium_patterns = [
-                            os.path.expanduser('~/.cache/ms-playwright/chromium-*/chrome-linux/chrome'),
-                            '/opt/render/.cache/ms-playwright/chromium-*/chrome-linux/chrome',
-                        ]
-                        for pattern in playwright_chromium_patterns:
-                            matches = glob.glob(pattern)
-                            if matches:
-                                chromium_paths.extend(matches)
-                    
-                    # Add system paths (standard Linux locations)
-                    chromium_paths.extend([
-                        '/usr/bin/chromium',
-                        '/usr/bin/chromium-browser',
-                        '/usr/bin/google-chrome',
-                        '/usr/bin/google-chrome-stable',
-                        '/snap/bin/chromium',
-                        os.path.expanduser('~/.local/bin/chromium-browser'),
-                        os.path.expanduser('~/.local/chromium/chrome')
-                    ])
-                    
-                    # Also try to find chromium in PATH
-                    import shutil
-                    chromium_in_path = shutil.which('chromium-browser') or shutil.which('chromium') or shutil.which('google-chrome')
-                    if chromium_in_path:
-                        chromium_paths.insert(0, chromium_in_path)
-                    
-                    for chromium_path in chromium_paths:
-                        if chromium_path and os.path.exists(chromium_path):
-                            try:
-                                print(f"   Trying to start: {chromium_path}")
-                                subprocess.Popen([
-                                    chromium_path,
-                                    '--headless',
-                                    '--remote-debugging-port=9222',
-                                    '--no-sandbox',
-                                    '--disable-dev-shm-usage',
-                                    '--disable-gpu',
-                                    '--disable-software-rasterizer',
-                                    '--disable-extensions'
-                                ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                                time.sleep(3)  # Wait for browser to start
-                                try:
-                                    page = ChromiumPage(addr_or_opts=9222)
-                                    print(f"   ✅ Successfully connected to browser at {chromium_path}")
-                                    break
-                                except Exception as conn_err:
-                                    print(f"   ⚠️  Could not connect: {conn_err}")
-                                    continue
-                            except Exception as start_err:
-                                print(f"   ⚠️  Could not start {chromium_path}: {start_err}")
-                                continue
-                    
-                    if page is None:
-                        # Last resort: try using DrissionPage's built-in browser management
-                        playwright_chromium = None
-                        try:
-                            print("   🔄 Trying DrissionPage browser management...")
-                            from DrissionPage import ChromiumOptions
-                            
-                            # Get Playwright Chromium path
-                            playwright_chromium = get_playwright_chromium_path()
-                            
-                            # If not found, try to install Playwright browsers
-                            if not playwright_chromium:
-                                print("   ⚠️  Playwright Chromium not found, attempting to install...")
-                                try:
-                                    import subprocess
-                                    result = subprocess.run(
-                                        ['python', '-m', 'playwright', 'install', 'chromium'],
-                                        capture_output=True,
-                                        text=True,
-                                        timeout=300
-                                    )
-                                    if result.returncode == 0:
-                                        print("   ✅ Playwright Chromium installed successfully")
-                                        playwright_chromium = get_playwright_chromium_path()
-                                    else:
-                                        print(f"   ⚠️  Installation failed: {result.stderr}")
-                                except Exception as install_err:
-                                    print(f"   ⚠️  Could not install Playwright browsers: {install_err}")
-                            
-                            co = ChromiumOptions()
-                            co.headless(True)
-                            co.set_argument('--no-sandbox')
-                            co.set_argument('--disable-dev-shm-usage')
-                            co.set_argument('--disable-gpu')
-                            co.set_argument('--disable-software-rasterizer')
-                            
-                            # Set browser path if we found Playwright's Chromium
-                            if playwright_chromium and os.path.exists(playwright_chromium):
-                                print(f"   📍 Configuring browser path: {playwright_chromium}")
-                                co.set_browser_path(playwright_chromium)
-                            else:
-                                print("   ⚠️  No browser path found, DrissionPage will try to find it automatically")
-                            
-                            page = ChromiumPage(co)
-                            print("   ✅ Browser started via DrissionPage")
-                        except Exception as drission_err:
-                            error_msg = str(drission_err)
-                            if not playwright_chromium:
-                                error_msg += " (Playwright Chromium path not found)"
-                            
-                            # Last resort: Try using Playwright directly (it handles browser discovery automatically)
-                            print("   🔄 Trying Playwright directly (auto-discovers browser)...")
-                            try:
-                                from playwright.sync_api import sync_playwright
-                                
-                                # Playwright will automatically find/install browsers
-                                p = sync_playwright().start()
-                                browser = p.chromium.launch(
-                                    headless=True,
-                                    args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu', '--disable-software-rasterizer']
-                                )
-                                
-                                # Launch browser with remote debugging so DrissionPage can connect
-                                browser_with_debug = p.chromium.launch(
-                                    headless=True,
-                                    args=[
-                                        '--remote-debugging-port=9222',
-                                        '--no-sandbox',
-                                        '--disable-dev-shm-usage',
-                                        '--disable-gpu',
-                                        '--disable-software-rasterizer'
-                                    ]
-                                )
-                                browser.close()  # Close the first browser
-                                
-                                # Wait a moment for remote debugging to be ready
-                                time.sleep(2)
-                                
-                                # Now try to connect with DrissionPage
-                                try:
-                                    page = ChromiumPage(addr_or_opts=9222)
-                                    print("   ✅ Browser started via Playwright, connected with DrissionPage")
-                                except:
-                                    # If DrissionPage can't connect, we need a different approach
-                                    raise Exception("Playwright browser started but DrissionPage couldn't connect")
-                                    
-                            except Exception as playwright_err:
-                                raise Exception(f"Could not start or connect to browser. Tried all methods. DrissionPage error: {error_msg}. Playwright error: {playwright_err}")
-                else:
-                    raise e
-            except Exception as e2:
-                print(f"❌ Error connecting to browser: {e2}")
-                print("\n💡 Make sure Chrome is running with remote debugging:")
-                print("   chrome --remote-debugging-port=9222")
-                return None, None
-    
-    name = None
-    email = None
-    phone = None
-    
-    try:
-        # Navigate to URL
-        page.get(url)
-        page.wait.doc_loaded(timeout=10)
-        time.sleep(2)
-        
-        # For Facebook pages, try to click "About" section first to get better data
-        if is_facebook_url(url):
-            print("📘 Detected Facebook page, trying to access About section...")
-            try:
-                about_btn = (
-                    page.ele('xpath://a[contains(text(), "About")]', timeout=3) or
-                    page.ele('xpath://span[contains(text(), "About")]', timeout=3) or
-                    page.ele('xpath://a[contains(text(), "简介")]', timeout=3) or
-                    page.ele('xpath://span[contains(text(), "简介")]', timeout=3)
-                )
-                if about_btn:
-                    about_btn.scroll.to_see(center=True)
-                    time.sleep(0.5)
-                    about_btn.click()
-                    time.sleep(2)
-                    print("   ✅ Clicked About section")
-            except:
-                pass
-        # For general webpages, try to click "Contact" link
-        else:
-            print("🌍 Detected general webpage, trying to access Contact section...")
-            try:
-                contact_btn = (
-                    page.ele('xpath://a[contains(translate(text(), "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"), "contact")]', timeout=3) or
-                    page.ele('xpath://a[contains(translate(@href, "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"), "contact")]', timeout=3)
-                )
-                if contact_btn:
-                    contact_btn.scroll.to_see(center=True)
-                    time.sleep(0.5)
-                    contact_btn.click()
-                    page.wait.doc_loaded(timeout=10)
-                    time.sleep(2)
-                    print("   ✅ Clicked Contact section")
-            except:
-                pass
-        
-        # Extract name after navigating to About/Contact section
-        print("📝 Extracting name...")
-        name = extract_name_from_page(page, url)
-        
-        # Extract email and phone - use precise method for Facebook pages
-        print("🔍 Searching for email and phone...")
-        
-        # For Facebook pages, extract directly from structured Intro section
-        if is_facebook_url(url):
-            contact_info = page.run_js("""
-                // Find phone and email directly from Facebook Intro section
-                let phone = null;
-                let email = null;
 
-                // Helper: extract phone candidates from a text block (prefer formatted/WhatsApp style)
-                function extractPhoneFromText(text) {
-                    if (!text) return null;
-                    const t = String(text).replace(/\u00a0/g, ' ').trim(); // normalize nbsp
-
-                    // Common PT formats seen in Facebook Intro:
-                    // - 22 093 1950
-                    // - 966 043 960
-                    // - 21 932 4069
-                    // - +351 911 744 738
-                    const patterns = [
-                        /\+\d{1,4}\s+\d{3}\s+\d{3}\s+\d{3,4}\b/g,      // +351 911 744 738
-                        /\b\d{2,3}\s+\d{3}\s+\d{3,4}\b/g,              // 22 093 1950 / 966 043 960 / 21 932 4069
-                        /\b\d{3}[-\s]\d{3}[-\s]\d{3,4}\b/g             // 966-043-960
-                    ];
-
-                    for (const re of patterns) {
-                        const m = t.match(re);
-                        if (m && m.length) {
-                            // Return the first match in this block
-                            return m[0].trim();
-                        }
-                    }
-                    return null;
-                }
-
-                // Method 0 (most reliable on Facebook): scan Intro/About "rows" (icon + text)
-                // Facebook renders these as list items or repeated blocks in the left "Intro" card.
-                const candidateContainers = document.querySelectorAll(
-                    '[role="main"], [data-pagelet], [class*="intro" i], [class*="about" i]'
-                );
-
-                for (const root of candidateContainers) {
-                    // List-item rows (often contain address/phone/email/website)
-                    const rows = root.querySelectorAll('[role="listitem"], a, div');
-                    for (const row of rows) {
-                        // Only consider short-ish rows to avoid picking numbers from posts
-                        const rowText = (row.innerText || row.textContent || '').trim();
-                        if (!rowText || rowText.length > 200) continue;
-
-                        // Skip anything that is clearly not contact info
-                        if (rowText.toLowerCase().includes('followers')) continue;
-
-                        // Email: detect directly from row text
-                        if (!email) {
-                            const emailMatch = rowText.match(/\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b/);
-                            if (emailMatch) email = emailMatch[1].trim();
-                        }
-
-                        // Phone: prefer rows that contain the phone icon image (VIGUiR6qVQJ.png) OR WhatsApp label/icon
-                        // This avoids picking random numbers elsewhere.
-                        const hasPhoneIconImg = !!row.querySelector('img[src*="VIGUiR6qVQJ"]');
-                        const hasWhatsApp = /whatsapp/i.test(rowText) || !!row.querySelector('img[alt*="whats" i], svg[aria-label*="whats" i]');
-                        const hasPhoneWord = /phone|telephone|tel|telefone|call/i.test(rowText);
-
-                        if (!phone && (hasPhoneIconImg || hasWhatsApp || hasPhoneWord)) {
-                            const p = extractPhoneFromText(rowText);
-                            if (p) {
-                                phone = p;
-                            }
-                        }
-
-                        if (phone && email) break;
-                    }
-                    if (phone && email) break;
-                }
-                
-                // Method 1 fallback: if still no phone, try phone icon container scan
-                if (!phone) {
-                    let phoneIcon = null;
-                    const phoneIconImages = document.querySelectorAll('img[src*="VIGUiR6qVQJ"]');
-                    if (phoneIconImages.length > 0) phoneIcon = phoneIconImages[0];
-
-                    if (!phoneIcon) {
-                        const phoneSvgIcons = document.querySelectorAll('svg');
-                        for (let svg of phoneSvgIcons) {
-                            const ariaLabel = (svg.getAttribute('aria-label') || '').toLowerCase();
-                            const title = (svg.getAttribute('title') || '').toLowerCase();
-                            if (ariaLabel.includes('phone') || ariaLabel.includes('telephone') || ariaLabel.includes('call') ||
-                                title.includes('phone') || title.includes('telephone') || title.includes('call')) {
-                                phoneIcon = svg;
-                                break;
-                            }
-                        }
-                    }
-
-                    if (phoneIcon) {
-                        let container = phoneIcon;
-                        for (let level = 0; level < 20; level++) {
-                            container = container.parentElement;
-                            if (!container) break;
-                            const text = container.innerText || container.textContent || '';
-                            const p = extractPhoneFromText(text);
-                            if (p) { phone = p; break; }
-                        }
-                    }
-                }
-                
-                // Method 2: If phone icon not found, search in Intro section text
-                if (!phone) {
-                    // Find Intro section - look for common Facebook selectors
-                    const introSelectors = [
-                        '[data-pagelet*="ProfileTilesFeed"]',
-                        '[data-pagelet*="ProfileTimeline"]',
-                        '[role="main"]',
-                        '[class*="x1y1aw1k"]',
-                        '[class*="x1n2onr6"]'
-                    ];
-                    
-                    for (let selector of introSelectors) {
-                        const sections = document.querySelectorAll(selector);
-                        for (let section of sections) {
-                            const sectionText = section.innerText || section.textContent || '';
-                            
-                            // Look for phone pattern near contact-related keywords
-                            const phonePattern = /(?:phone|telephone|tel|call|telefone)[^\\n]{0,50}?(\\d{2,3}\\s+\\d{3}\\s+\\d{3,4})/i;
-                            const match = sectionText.match(phonePattern);
-                            if (match) {
-                                phone = match[1].trim();
-                                break;
-                            }
-                            
-                            // Also try finding phone in structured list items
-                            const listItems = section.querySelectorAll('[role="listitem"], div[class*="x1"], span[class*="x1"]');
-                            for (let item of listItems) {
-                                const itemText = item.innerText || item.textContent || '';
-                                
-                                // Check if item contains phone icon
-                                const hasPhoneIcon = item.querySelector('svg[aria-label*="phone" i], svg[aria-label*="telephone" i], svg[aria-label*="call" i]');
-                                
-                                // Also check if item text contains phone-related words
-                                const hasPhoneKeyword = /phone|telephone|tel|call|telefone/i.test(itemText);
-                                
-                                if (hasPhoneIcon || hasPhoneKeyword) {
-                                    // Extract phone number from this item
-                                    const phoneMatch = itemText.match(/\\b(\\d{2,3}\\s+\\d{3}\\s+\\d{3,4})\\b/);
-                                    if (phoneMatch) {
-                                        phone = phoneMatch[1].trim();
-                                        break;
-                                    }
-                                }
-                            }
-                            if (phone) break;
-                        }
-                        if (phone) break;
-                    }
-                }
-                
-                // Method 3: Last resort - find all phone patterns in visible text and pick the one in contact context
-                if (!phone) {
-                    const allText = document.body.innerText || document.body.textContent || '';
-                    // Find all phone patterns
-                    const allPhones = allText.matchAll(/\\b(\\d{2,3}\\s+\\d{3}\\s+\\d{3,4})\\b/g);
-                    for (let match of allPhones) {
-                        const candidate = match[1];
-                        const index = allText.indexOf(candidate);
-                        // Check context (should be near email, address, or in Intro section)
-                        const context = allText.substring(Math.max(0, index - 100), index + 100).toLowerCase();
-                        if (context.includes('@') || context.includes('email') || 
-                            context.includes('address') || context.includes('morada') ||
-                            context.includes('intro') || context.includes('about')) {
-                            phone = candidate.trim();
-                            break;
-                        }
-                    }
-                }
-                
-                // Method 3: Find email icon
-                const emailIcons = document.querySelectorAll('svg');
-                for (let icon of emailIcons) {
-                    const ariaLabel = (icon.getAttribute('aria-label') || '').toLowerCase();
-                    const title = (icon.getAttribute('title') || '').toLowerCase();
-                    
-                    if (ariaLabel.includes('email') || ariaLabel.includes('mail') || 
-                        ariaLabel.includes('envelope') || title.includes('email') || 
-                        title.includes('mail') || title.includes('envelope')) {
-                        
-                        let container = icon;
-                        for (let level = 0; level < 10; level++) {
-                            container = container.parentElement;
-                            if (!container) break;
-                            
-                            const text = container.innerText || container.textContent || '';
-                            const emailMatch = text.match(/\\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\\.[a-zA-Z]{2,})\\b/);
-                            if (emailMatch) {
-                                email = emailMatch[1].trim();
-                                break;
-                            }
-                        }
-                        if (email) break;
-                    }
-                }
-                
-                return {phone: phone, email: email};
-            """)
-            
-            phone = contact_info.get('phone') if contact_info else None
-            email = contact_info.get('email') if contact_info else None
-            
-            if phone:
-                print(f"   ✅ Found phone: {phone}")
-            else:
-                print("   ℹ️  No phone found in page content")
-            
-            if email:
-                print(f"   ✅ Found email: {email}")
-            else:
-                # Fallback: try extracting email from page text
-                page_text = page.html
-                try:
-                    visible_text = page.ele('tag:body').text if page.ele('tag:body') else ""
-                    page_text += " " + visible_text
-                except:
-                    pass
-                email = extract_email_from_text(page_text)
-        else:
-            # For non-Facebook pages, use original method
-            page_text = page.html
-            try:
-                visible_text = page.ele('tag:body').text if page.ele('tag:body') else ""
-                page_text += " " + visible_text
-            except:
-                pass
-            
-            email = extract_email_from_text(page_text)
-            
-            # Only extract phone if phone icon exists
-            phone = None
-            try:
-                has_phone_indicator = page.run_js("""
-                    const svgs = document.querySelectorAll('svg[aria-label*="phone" i], svg[aria-label*="telephone" i], svg[aria-label*="call" i]');
-                    return svgs.length > 0;
-                """)
-                
-                if has_phone_indicator:
-                    phone = extract_phone_from_text(page_text)
-                    if phone:
-                        print(f"   ✅ Found phone: {phone}")
-            except Exception as e:
-                print(f"      ⚠️ Error extracting phone: {e}")
-                phone = None
-        
-        # Close any popups
-        try:
-            page.run_js("""
-                document.querySelectorAll('.modal, .popup, .overlay').forEach(el => {
-                    if (el.style) el.style.display = 'none';
-                    el.remove();
-                });
-                document.body.style.overflow = 'auto';
-            """)
-        except:
-            pass
-        
-    except Exception as e:
-        print(f"❌ Error extracting contacts: {e}")
-        return None, page
-    
-    return {
-        'name': name,
-        'email': email,
-        'phone': phone
-    }, page
-
-
-def read_csv_urls(filename):
-    """Read URLs from CSV file (column A)"""
-    urls = []
-    try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            # Skip header row
-            next(reader, None)
-            
-            for row_num, row in enumerate(reader, start=2):
-                if len(row) > 0 and row[0].strip():
-                    url = row[0].strip()
-                    if url.startswith(('http://', 'https://')):
-                        urls.append({
-                            'row': row_num,
-                            'url': url,
-                            'name': row[1].strip() if len(row) > 1 else '',
-                            'phone': row[2].strip() if len(row) > 2 else '',
-                            'email': row[3].strip() if len(row) > 3 else ''
-                        })
-        
-        return urls
-    except Exception as e:
-        print(f"❌ Error reading CSV: {e}")
-        return []
-
-
-def clean_name(name):
-    """Clean name by removing verified badges"""
-    if not name:
-        return name
-    name = name.strip()
-    name = re.sub(r'\s*已认证账户\s*$', '', name)
-    name = re.sub(r'\s*已认证\s*$', '', name)
-    name = re.sub(r'\s*Verified\s*Account\s*$', '', name, flags=re.IGNORECASE)
-    name = re.sub(r'\s*Verified\s*$', '', name, flags=re.IGNORECASE)
-    return name.strip()
+# Extraction logic is shared with the single-URL extractor and the API server
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from extract_contacts import extract_contacts, clean_name
+from job_store import JobStore, FIELDS
 
 
 def rewrite_csv_clean_names(filename):
@@ -891,120 +68,117 @@ def rewrite_csv_clean_names(filename):
         return False
 
 
-def update_csv_row(filename, row_num, name, phone, email):
-    """Update a specific row in CSV file"""
-    try:
-        # Clean the name before saving
-        name = clean_name(name)
-        
-        # Read all rows
-        rows = []
-        with open(filename, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            rows = list(reader)
-        
-        # Update the specific row (row_num is 1-indexed, rows list is 0-indexed)
-        if row_num <= len(rows):
-            row_idx = row_num - 1
-            # Ensure row has enough columns
-            while len(rows[row_idx]) < 4:
-                rows[row_idx].append('')
-            
-            # Update columns B, C, D (indices 1, 2, 3)
-            rows[row_idx][1] = name
-            rows[row_idx][2] = phone
-            rows[row_idx][3] = email
-        
-        # Write back to file
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerows(rows)
-        
-        return True
-    except Exception as e:
-        print(f"❌ Error updating CSV: {e}")
-        return False
+def launch_worker_browser(port, profile_dir, headless=True, browser_path=None):
+    """Start an independent Chromium on its own debugging port and profile dir"""
+    from DrissionPage import ChromiumOptions
+    
+    os.makedirs(profile_dir, exist_ok=True)
+    co = ChromiumOptions()
+    co.set_local_port(port)
+    co.set_user_data_path(profile_dir)
+    co.headless(headless)
+    co.set_argument('--no-sandbox')
+    co.set_argument('--disable-dev-shm-usage')
+    co.set_argument('--disable-gpu')
+    if browser_path:
+        co.set_browser_path(browser_path)
+    return ChromiumPage(co)
+
+
+# Per-process state of a batch worker (set up by _init_worker)
+_worker_page = None
+_worker_store = None
+_worker_name = None
+_worker_delay = 0
+_worker_error = None
+
+
+def _quit_worker_browser():
+    """Close the worker's browser when the worker process exits"""
+    if _worker_page is not None:
+        try:
+            _worker_page.quit()
+        except Exception:
+            pass
 
 
-def main():
-    """Main function - Read CSV, extract contacts for each URL, and write back to CSV"""
-    # Check if user wants to just clean the CSV
-    if len(sys.argv) > 1 and sys.argv[1] == '--clean':
-        csv_file = sys.argv[2] if len(sys.argv) > 2 else 'contacts.csv'
-        if not os.path.exists(csv_file):
-            print(f"❌ Error: CSV file not found: {csv_file}")
-            sys.exit(1)
-        print("=" * 60)
-        print("🧹 Cleaning Names in CSV")
-        print("=" * 60)
-        if rewrite_csv_clean_names(csv_file):
-            print(f"\n✅ CSV file cleaned: {csv_file}")
-        else:
-            print(f"\n❌ Failed to clean CSV file")
-        return
-    
-    # Get CSV file path (default: contacts.csv)
-    csv_file = sys.argv[1] if len(sys.argv) > 1 else 'contacts.csv'
-    
-    # Check if CSV file exists
-    if not os.path.exists(csv_file):
-        print(f"❌ Error: CSV file not found: {csv_file}")
-        print("\n💡 Create a CSV file with:")
-        print("   Column A: URL")
-        print("   Column B: Name (will be filled)")
-        print("   Column C: Phone (will be filled)")
-        print("   Column D: Email (will be filled)")
-        sys.exit(1)
-    
-    print("=" * 60)
-    print("📞 Contact Extractor - CSV Batch Processing")
-    print("=" * 60)
-    print(f"📖 Reading URLs from: {csv_file}\n")
+def _init_worker(slots, db_file, run_id, headless, browser_path, delay):
+    """Pool initializer - claim a port/profile slot and start this worker's browser"""
+    global _worker_page, _worker_store, _worker_name, _worker_delay, _worker_error
+    from multiprocessing import util
     
-    # Step 1: Clean existing names in CSV (remove verified badges)
-    print("🧹 Cleaning existing names in CSV...")
-    rewrite_csv_clean_names(csv_file)
-    print()
+    port, profile_dir = slots.get()
+    _worker_delay = delay
+    _worker_store = JobStore(db_file)
+    _worker_name = f'{run_id}/{os.getpid()}'
+    try:
+        _worker_page = launch_worker_browser(port, profile_dir, headless, browser_path)
+    except Exception as e:
+        # Don't raise here: a failing initializer makes the pool respawn workers forever
+        _worker_error = f"Could not start browser on port {port}: {e}"
+        print(f"❌ Worker {os.getpid()}: {_worker_error}")
+        return
+    util.Finalize(None, _quit_worker_browser, exitpriority=10)
+    print(f"🚀 Worker {os.getpid()} started browser on port {port} ({profile_dir})")
+
+
+def _extract_in_worker(_):
+    """Pool task - claim the next row from the job store and extract it on this worker's browser"""
+    global _worker_page
+    if _worker_error:
+        return None, None, _worker_error
+    job = _worker_store.claim(_worker_name)
+    if job is None:
+        return None, None, None
     
-    # Step 2: Read all URLs from CSV file (column A)
-    print("📋 Reading URLs from CSV...")
-    urls = read_csv_urls(csv_file)
+    try:
+        results, page = extract_contacts(job['url'], _worker_page)
+        if page is not None:
+            _worker_page = page
+        error = None if results else "Failed to extract contacts from URL"
+    except Exception as e:
+        results, error = None, str(e)
     
-    if not urls:
-        print("❌ No URLs found in CSV file")
-        print("\n💡 Make sure your CSV file has:")
-        print("   - Header row: URL,Name,Phone,Email")
-        print("   - At least one URL in column A (starting from row 2)")
-        sys.exit(1)
+    # Keep the per-browser pacing of the sequential mode
+    if _worker_delay:
+        time.sleep(_worker_delay if not error else _worker_delay + 1)
+    return job, results, error
+
+
+def save_result(store, job, results, stats):
+    """Record one extraction result in the job store and update statistics"""
+    row_num = job['csv_row']
+    name = clean_name(results.get('name', '') or '')
+    phone = results.get('phone', '') or ''
+    email = results.get('email', '') or ''
     
-    print(f"✅ Found {len(urls)} URLs in CSV file")
+    # Update statistics
+    if name:
+        stats['found_name'] += 1
+    if email:
+        stats['found_email'] += 1
+    if phone:
+        stats['found_phone'] += 1
     
-    # Step 3: Filter URLs that need processing
-    # Process if missing data OR if name needs cleaning
-    urls_to_process = []
-    for url_data in urls:
-        name = url_data.get('name', '')
-        phone = url_data.get('phone', '')
-        email = url_data.get('email', '')
-        
-        # Check if name needs cleaning (has verified badges)
-        needs_cleaning = '已认证账户' in name or '已认证' in name or 'Verified Account' in name
-        
-        # Check if data is missing
-        missing_data = not (name and phone and email)
-        
-        if missing_data or needs_cleaning:
-            urls_to_process.append(url_data)
-        else:
-            print(f"⏭️  Skipping row {url_data['row']}: {url_data['url'][:50]}... (already has all data)")
-    
-    if not urls_to_process:
-        print("\n✅ All URLs already processed! No action needed.")
-        return
-    
-    print(f"\n📋 Processing {len(urls_to_process)} URLs...\n")
+    # Store results (exported to the CSV at the end of the run)
+    try:
+        store.record(job['id'], name, phone, email)
+        print(f"   ✅ Recorded results for CSV row {row_num}")
+        if name:
+            print(f"      📝 Name:  {name}")
+        if email:
+            print(f"      📧 Email: {email}")
+        if phone:
+            print(f"      📞 Phone: {phone}")
+    except sqlite3.Error as e:
+        print(f"   ⚠️  Failed to record CSV row {row_num}: {e}")
+        stats['errors'] += 1
     
-    # Step 4: Connect to browser
+    stats['processed'] += 1
+
+
+def process_sequential(store, run_id, total, stats):
+    """Process rows one at a time on the browser running on port 9222"""
     print("🔌 Connecting to browser...")
     try:
         page = ChromiumPage(addr_or_opts=9222)
@@ -1017,20 +191,18 @@ def main():
         print("   /Applications/Google\\ Chrome.app/Contents/MacOS/Google\\ Chrome --remote-debugging-port=9222")
         sys.exit(1)
     
-    # Step 5: Process each URL and write back to CSV
-    # Statistics tracking
-    total_processed = 0
-    total_found_name = 0
-    total_found_email = 0
-    total_found_phone = 0
-    total_errors = 0
-    
-    # Process each URL one by one
-    for idx, url_data in enumerate(urls_to_process, start=1):
-        url = url_data['url']
-        row_num = url_data['row']
+    # Claim and process rows one by one until none are pending
+    idx = 0
+    worker = f'{run_id}/{os.getpid()}'
+    while True:
+        job = store.claim(worker)
+        if job is None:
+            break
+        idx += 1
+        url = job['url']
+        row_num = job['csv_row']
         
-        print(f"\n[{idx}/{len(urls_to_process)}] Processing row {row_num}")
+        print(f"\n[{idx}/{total}] Processing row {row_num}")
         print(f"   URL: {url}")
         
         try:
@@ -1038,65 +210,210 @@ def main():
             results, page = extract_contacts(url, page)
             
             if results:
-                name = results.get('name', '') or ''
-                phone = results.get('phone', '') or ''
-                email = results.get('email', '') or ''
-                
-                # Update statistics
-                if name:
-                    total_found_name += 1
-                if email:
-                    total_found_email += 1
-                if phone:
-                    total_found_phone += 1
-                
-                # Write results back to CSV file
-                if update_csv_row(csv_file, row_num, name, phone, email):
-                    print(f"   ✅ Successfully updated CSV row {row_num}")
-                    if name:
-                        print(f"      📝 Name:  {name}")
-                    if email:
-                        print(f"      📧 Email: {email}")
-                    if phone:
-                        print(f"      📞 Phone: {phone}")
-                else:
-                    print(f"   ⚠️  Failed to update CSV row {row_num}")
-                    total_errors += 1
-                
-                total_processed += 1
+                save_result(store, job, results, stats)
                 
                 # Add delay between requests to avoid rate limiting
-                if idx < len(urls_to_process):  # Don't wait after last URL
+                if idx < total:  # Don't wait after last URL
                     time.sleep(2)
             else:
                 print(f"   ❌ Failed to extract contacts from URL")
-                total_errors += 1
+                store.fail(job['id'], "Failed to extract contacts from URL")
+                stats['errors'] += 1
 
         except KeyboardInterrupt:
             print("\n⏹ Interrupted by user (Ctrl+C). Stopping gracefully without writing further rows.")
+            store.fail(job['id'], "Interrupted")
             break
         except Exception as e:
             print(f"   ❌ Error processing URL: {e}")
-            total_errors += 1
+            store.fail(job['id'], str(e))
+            stats['errors'] += 1
             # Longer delay on error
-            if idx < len(urls_to_process):
+            if idx < total:
                 try:
                     time.sleep(3)
                 except KeyboardInterrupt:
                     print("\n⏹ Interrupted by user (Ctrl+C). Stopping gracefully.")
                     break
+
+
+def process_parallel(store, run_id, total, stats, workers, base_port=9300,
+                     profile_root='chrome_profiles', headless=True, browser_path=None):
+    """Shard rows across N worker processes, each driving its own Chromium"""
+    import multiprocessing
+    
+    workers = min(workers, total)
+    print(f"🚀 Starting {workers} workers (ports {base_port}-{base_port + workers - 1})...")
+    
+    # One debugging port and profile dir per worker; each worker claims one slot
+    slots = multiprocessing.Queue()
+    for i in range(workers):
+        slots.put((base_port + i, os.path.abspath(os.path.join(profile_root, f'worker_{i}'))))
+    
+    pool = multiprocessing.Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(slots, store.path, run_id, headless, browser_path, 2)
+    )
+    try:
+        # Workers claim rows from the job store one at a time so slow pages
+        # don't hold up a shard; results are stored by this process
+        done = 0
+        for job, results, error in pool.imap_unordered(_extract_in_worker, range(total)):
+            if job is None:
+                if error:
+                    print(f"   ❌ {error}")
+                    stats['errors'] += 1
+                continue
+            done += 1
+            print(f"\n[{done}/{total}] Finished row {job['csv_row']}")
+            print(f"   URL: {job['url']}")
+            if results:
+                save_result(store, job, results, stats)
+            else:
+                print(f"   ❌ {error}")
+                store.fail(job['id'], error)
+                stats['errors'] += 1
+        pool.close()
+    except KeyboardInterrupt:
+        print("\n⏹ Interrupted by user (Ctrl+C). Stopping workers without writing further rows.")
+        pool.terminate()
+    finally:
+        pool.join()
+
+
+def main():
+    """Main function - Import the CSV into the job store, extract contacts for pending URLs, export back to CSV"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Extract name, phone, and email for URLs in a CSV file")
+    parser.add_argument('csv_file', nargs='?', default='contacts.csv',
+                        help="CSV file with URLs in column A (default: contacts.csv)")
+    parser.add_argument('--db', default=None,
+                        help="Job store database (default: the CSV's name with .db)")
+    parser.add_argument('--missing', default='name,phone,email',
+                        help="Process rows missing any of these fields (default: name,phone,email)")
+    parser.add_argument('--max-attempts', type=int, default=0,
+                        help="Stop retrying a row after this many attempts (default: 0 = always retry)")
+    parser.add_argument('--export', action='store_true',
+                        help="Only write the job store's results into the CSV")
+    parser.add_argument('--clean', action='store_true',
+                        help="Only remove verified badges from names in the CSV")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of parallel browser processes (default: 1, uses Chrome on port 9222)")
+    parser.add_argument('--base-port', type=int, default=9300,
+                        help="First debugging port for worker browsers (default: 9300)")
+    parser.add_argument('--profile-dir', default='chrome_profiles',
+                        help="Directory holding one browser profile per worker (default: chrome_profiles)")
+    parser.add_argument('--headed', action='store_true',
+                        help="Show worker browser windows instead of running headless")
+    parser.add_argument('--browser-path', default=None,
+                        help="Chromium/Chrome executable for worker browsers")
+    args = parser.parse_args()
+    csv_file = args.csv_file
+    db_file = args.db or os.path.splitext(csv_file)[0] + '.db'
+    missing = [field.strip() for field in args.missing.split(',') if field.strip()]
+    if not missing or any(field not in FIELDS for field in missing):
+        print(f"❌ Error: --missing takes a list of: {', '.join(FIELDS)}")
+        sys.exit(1)
+    
+    # Check if CSV file exists
+    if not os.path.exists(csv_file):
+        print(f"❌ Error: CSV file not found: {csv_file}")
+        print("\n💡 Create a CSV file with:")
+        print("   Column A: URL")
+        print("   Column B: Name (will be filled)")
+        print("   Column C: Phone (will be filled)")
+        print("   Column D: Email (will be filled)")
+        sys.exit(1)
+    
+    # Check if user wants to just clean the CSV
+    if args.clean:
+        print("=" * 60)
+        print("🧹 Cleaning Names in CSV")
+        print("=" * 60)
+        if rewrite_csv_clean_names(csv_file):
+            print(f"\n✅ CSV file cleaned: {csv_file}")
+        else:
+            print(f"\n❌ Failed to clean CSV file")
+        return
+    
+    store = JobStore(db_file)
+    if args.export:
+        print(f"✅ Exported {store.export_csv(csv_file)} rows from {db_file} to {csv_file}")
+        return
+    
+    print("=" * 60)
+    print("📞 Contact Extractor - CSV Batch Processing")
+    print("=" * 60)
+    print(f"📖 Reading URLs from: {csv_file}")
+    print(f"🗄️  Job store: {db_file}\n")
+    
+    # Step 1: Import URLs (column A) and existing results into the job store,
+    # removing verified badges from names on the way
+    print("📋 Importing URLs from CSV...")
+    imported = store.import_csv(csv_file, clean=clean_name)
+    
+    if not imported:
+        print("❌ No URLs found in CSV file")
+        print("\n💡 Make sure your CSV file has:")
+        print("   - Header row: URL,Name,Phone,Email")
+        print("   - At least one URL in column A (starting from row 2)")
+        sys.exit(1)
+    
+    print(f"✅ Found {imported} URLs in CSV file")
+    
+    # Step 2: Queue the rows still missing data for this run (a pid can come
+    # back in a later run, e.g. in a container, so the start time is part of it)
+    run_id = f'{os.getpid()}-{int(time.time())}'
+    total = store.queue(run_id, missing, max_attempts=args.max_attempts)
+    
+    if not total:
+        print("\n✅ All URLs already processed! No action needed.")
+        print(f"💾 Exported {store.export_csv(csv_file)} rows to {csv_file}")
+        return
+    
+    print(f"\n📋 Processing {total} URLs missing {', '.join(missing)}...\n")
+    
+    # Step 3: Process each pending URL and store its results
+    # Statistics tracking
+    stats = {
+        'processed': 0,
+        'found_name': 0,
+        'found_email': 0,
+        'found_phone': 0,
+        'errors': 0,
+    }
+    
+    try:
+        if args.workers > 1:
+            process_parallel(
+                store, run_id, total, stats, args.workers,
+                base_port=args.base_port,
+                profile_root=args.profile_dir,
+                headless=not args.headed,
+                browser_path=args.browser_path
+            )
+        else:
+            process_sequential(store, run_id, total, stats)
+    finally:
+        # Rows this run claimed but didn't finish go back to the queue
+        store.release(run_id)
+    
+    # Step 4: Export the results to the CSV in one pass
+    print(f"\n🗂️  Writing {store.export_csv(csv_file)} rows to {csv_file}...")
     
-    # Step 6: Print final statistics
+    # Step 5: Print final statistics
     print("\n" + "=" * 60)
     print("📊 FINAL STATISTICS")
     print("=" * 60)
-    print(f"✅ Successfully processed: {total_processed}")
-    print(f"📝 Found names: {total_found_name}")
-    print(f"📧 Found emails: {total_found_email}")
-    print(f"📞 Found phones: {total_found_phone}")
-    print(f"❌ Errors: {total_errors}")
+    print(f"✅ Successfully processed: {stats['processed']}")
+    print(f"📝 Found names: {stats['found_name']}")
+    print(f"📧 Found emails: {stats['found_email']}")
+    print(f"📞 Found phones: {stats['found_phone']}")
+    print(f"❌ Errors: {stats['errors']}")
     print("=" * 60)
-    print(f"\n💾 All results saved to: {csv_file}")
+    print(f"\n💾 All results saved to: {csv_file} (and {db_file})")
     print(f"📂 You can now open the CSV file to view the results")
 
 
@@ -0,0 +1,452 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP Extractor - Fast path for non-Facebook websites without a browser
+
+Most business websites are static HTML: the browser path only reads
+page.html and the body text and runs the regex extractors over them. This
+module fetches such pages with a pooled HTTP client (keep-alive, gzip,
+bounded concurrency) and runs the same extractors on the parsed HTML, so a
+non-Facebook URL costs one or two HTTP requests instead of a Chrome tab.
+
+Besides the landing page, candidate pages linked from it (contact, about,
+impressum, contactos, fale-connosco, ..., and footer links) are fetched
+concurrently under a per-site time budget and their results merged.
+
+extract_contacts_http() returns None when the page is clearly rendered by
+JavaScript or nothing was found; the caller then falls back to the browser.
+
+Configuration (environment variables):
+    EXTRACT_HTTP_FAST_PATH      Set to 0 to always use the browser (default: 1)
+    HTTP_MAX_CONCURRENCY        Maximum requests in flight per process (default: 16)
+    HTTP_TIMEOUT                Seconds per request (default: 10)
+    CRAWL_MAX_PAGES             Candidate pages fetched per site (default: 6)
+    CRAWL_BUDGET                Seconds per site for all fetches (default: 12)
+"""
+from concurrent.futures import ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit, urldefrag
+import threading
+import codecs
+import time
+import re
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from page_archive import get_page_archive
+
+from extract_contacts import (
+    extract_email_from_text, extract_phone_from_text, clean_name, site_domain, normalize_found_phone,
+    phone_candidates, normalize_phone_candidates, email_candidates, rank_candidates, PHONE_EVIDENCE_WEIGHTS, EMAIL_EVIDENCE_WEIGHTS,
+)
+
+
+HTTP_FAST_PATH = os.environ.get('EXTRACT_HTTP_FAST_PATH', '1') != '0'
+HTTP_MAX_CONCURRENCY = int(os.environ.get('HTTP_MAX_CONCURRENCY', 16))
+HTTP_TIMEOUT = float(os.environ.get('HTTP_TIMEOUT', 10))
+CRAWL_MAX_PAGES = int(os.environ.get('CRAWL_MAX_PAGES', 6))
+CRAWL_BUDGET = float(os.environ.get('CRAWL_BUDGET', 12))
+MAX_HTML_BYTES = 3 * 1024 * 1024
+
+CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="...; charset=...">
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+META_CHARSET_BYTES = 4096
+BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+)
+
+UI_TEXTS = ['facebook', 'home', 'posts', 'about', 'contact', 'menu', '简介', '帖子']
+PHONE_LABELS = ('phone', 'telephone', 'call')
+
+# Link keywords of pages likely to hold contact details, best first
+CANDIDATE_KEYWORDS = [
+    'contact', 'contato', 'kontakt', 'fale-connosco', 'fale connosco', 'fale-conosco', 'fale conosco',
+    'impressum', 'imprint', 'about', 'sobre', 'quem-somos', 'quem somos',
+]
+# The landing page ranks after the contact-like pages (fale-connosco and better)
+LANDING_RANK = CANDIDATE_KEYWORDS.index('impressum')
+SKIP_LINK_PREFIXES = ('mailto:', 'tel:', 'javascript:', '#')
+SKIP_LINK_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.zip', '.doc', '.docx', '.xls', '.xlsx')
+
+_session = None
+_session_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(HTTP_MAX_CONCURRENCY)
+
+
+def get_session():
+    """Return the process-wide HTTP session (connection pooling + keep-alive)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_MAX_CONCURRENCY, pool_maxsize=HTTP_MAX_CONCURRENCY)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update({
+                    'User-Agent': USER_AGENT,
+                    'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.8',
+                    'Accept-Encoding': 'gzip, deflate',
+                    'Accept-Language': 'en,pt;q=0.9,*;q=0.5',
+                })
+                _session = session
+    return _session
+
+
+def _known_encoding(name):
+    """Python codec name for a charset label, None if unknown"""
+    try:
+        return codecs.lookup(name.strip().strip('"\'')).name
+    except (LookupError, AttributeError):
+        return None
+
+
+def html_encoding(content_type, body):
+    """Charset of an HTML body: Content-Type header, then BOM, then <meta charset>, else UTF-8
+
+    (requests' own guess is ISO-8859-1 for any text/html without a charset.)
+    """
+    match = CHARSET_RE.search(content_type or '')
+    encoding = match and _known_encoding(match.group(1))
+    if encoding:
+        # A UTF-8 BOM would otherwise end up as U+FEFF at the start of the text
+        return 'utf-8-sig' if encoding == 'utf-8' else encoding
+    for bom, bom_encoding in BOMS:
+        if body.startswith(bom):
+            return bom_encoding
+    match = META_CHARSET_RE.search(body[:META_CHARSET_BYTES])
+    encoding = match and _known_encoding(match.group(1).decode('ascii', 'ignore'))
+    return encoding or 'utf-8'
+
+
+def fetch_html(url, timeout=None):
+    """Fetch an HTML page; returns (final_url, html) or None"""
+    try:
+        with _slots:
+            response = get_session().get(url, timeout=timeout or HTTP_TIMEOUT, stream=True)
+            try:
+                if response.status_code != 200:
+                    return None
+                if 'html' not in response.headers.get('Content-Type', 'text/html').lower():
+                    return None
+                body = response.raw.read(MAX_HTML_BYTES, decode_content=True)
+            finally:
+                response.close()
+        encoding = html_encoding(response.headers.get('Content-Type', ''), body)
+        return response.url, body.decode(encoding, errors='replace')
+    except Exception as e:
+        print(f"      ⚠️ HTTP fetch failed for {url}: {e}")
+        return None
+
+
+class PageParser(HTMLParser):
+    """Collects what the extractors need from an HTML document in one pass"""
+
+    SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'svg'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ''
+        self.h1s = []
+        self.meta_title = None
+        self.links = []
+        self.text_parts = []
+        self.script_count = 0
+        self.noscript_text = []
+        self.has_phone_indicator = False
+        self._skip_depth = 0
+        self._footer_depth = 0
+        self._stack = []
+        self._h1 = None
+        self._link = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'svg':
+            label = ((attrs.get('aria-label') or '') + ' ' + (attrs.get('title') or '')).lower()
+            if any(word in label for word in PHONE_LABELS):
+                self.has_phone_indicator = True
+        if tag == 'script':
+            self.script_count += 1
+        if tag == 'meta':
+            if attrs.get('property') == 'og:title' or (attrs.get('name') == 'title' and self.meta_title is None):
+                self.meta_title = (attrs.get('content') or '').strip()
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        if tag == 'footer':
+            self._footer_depth += 1
+        if tag == 'h1':
+            self._h1 = []
+        if tag == 'a':
+            self._link = {'href': attrs.get('href') or '', 'text': [], 'footer': self._footer_depth > 0}
+        self._stack.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        if tag == 'footer' and self._footer_depth:
+            self._footer_depth -= 1
+        if tag == 'h1' and self._h1 is not None:
+            self.h1s.append(' '.join(self._h1).strip())
+            self._h1 = None
+        if tag == 'a' and self._link is not None:
+            self._link['text'] = ' '.join(self._link['text']).strip()
+            self.links.append(self._link)
+            self._link = None
+        if tag in self._stack:
+            while self._stack and self._stack.pop() != tag:
+                pass
+
+    def handle_data(self, data):
+        if self._stack and self._stack[-1] == 'title':
+            self.title += data
+            return
+        if self._stack and self._stack[-1] == 'noscript':
+            self.noscript_text.append(data)
+        if self._skip_depth:
+            return
+        text = data.strip()
+        if not text:
+            return
+        self.text_parts.append(text)
+        if self._h1 is not None:
+            self._h1.append(text)
+        if self._link is not None:
+            self._link['text'].append(text)
+
+    @property
+    def text(self):
+        return '\n'.join(self.text_parts)
+
+
+def parse_html(html):
+    """Parse an HTML document with PageParser"""
+    parser = PageParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        pass
+    return parser
+
+
+def looks_script_rendered(parsed):
+    """Heuristic: the server sent an app shell and the content is built by JavaScript"""
+    visible = len(parsed.text)
+    noscript = ' '.join(parsed.noscript_text).lower()
+    if 'enable javascript' in noscript or 'javascript is required' in noscript:
+        return visible < 2000
+    return visible < 200 and parsed.script_count > 0
+
+
+def extract_name_from_html(parsed):
+    """Extract name/title from parsed HTML (same order as name_from_bundle)"""
+    for text in parsed.h1s:
+        if text and 2 < len(text) < 200:
+            if (not text.isdigit() and text.lower() not in UI_TEXTS and
+                    '粉丝' not in text and 'followers' not in text.lower() and 'likes' not in text.lower()):
+                return clean_name(text)
+
+    title = parsed.title.strip()
+    if title:
+        title = re.sub(r'\s*[-|]\s*Facebook.*$', '', title, flags=re.IGNORECASE)
+        title = re.sub(r'\s*[-|]\s*.*$', '', title)
+        title = clean_name(title)
+        if title and 2 < len(title) < 200:
+            return title
+
+    if parsed.meta_title and 2 < len(parsed.meta_title) < 200:
+        return parsed.meta_title
+    return None
+
+
+def normalize_link(url):
+    """Key used for the visited set: no fragment, no trailing slash, lowercase host"""
+    url = urldefrag(url)[0]
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc.lower()}{parts.path.rstrip('/')}" + (f"?{parts.query}" if parts.query else '')
+
+
+def same_site(url, base_url):
+    """Check that a link stays on the site (ignoring a leading www.)"""
+    host = urlsplit(url).netloc.lower()
+    base = urlsplit(base_url).netloc.lower()
+    return host.removeprefix('www.') == base.removeprefix('www.')
+
+
+def find_candidate_links(parsed, base_url, limit=CRAWL_MAX_PAGES):
+    """Same-site links likely to hold contact details, best first"""
+    candidates = {}
+    for link in parsed.links:
+        href = link['href'].strip()
+        if not href or href.startswith(SKIP_LINK_PREFIXES):
+            continue
+        url = urljoin(base_url, href)
+        if not url.startswith(('http://', 'https://')) or not same_site(url, base_url):
+            continue
+        if urlsplit(url).path.lower().endswith(SKIP_LINK_EXTENSIONS):
+            continue
+
+        haystack = (link['text'] + ' ' + href).lower()
+        rank = next((i for i, keyword in enumerate(CANDIDATE_KEYWORDS) if keyword in haystack), None)
+        if rank is None:
+            if not link['footer']:
+                continue
+            rank = len(CANDIDATE_KEYWORDS)
+
+        key = normalize_link(url)
+        if key not in candidates or rank < candidates[key][0]:
+            candidates[key] = (rank, url)
+
+    ranked = sorted(candidates.values(), key=lambda candidate: candidate[0])
+    return [(rank, url) for rank, url in ranked[:limit]]
+
+
+def extract_from_document(html, parsed):
+    """Run the text extractors over one document"""
+    page_text = html + ' ' + parsed.text
+    email = extract_email_from_text(page_text)
+    # Only extract phone if phone icon exists (same rule as the browser path)
+    phone = extract_phone_from_text(page_text) if parsed.has_phone_indicator else None
+    return email, phone
+
+
+def fetch_candidates(urls, deadline):
+    """Fetch candidate pages concurrently; returns {url: (html, parsed)} for those done in time"""
+    pages = {}
+    if not urls:
+        return pages
+
+    def fetch_and_parse(url):
+        fetched = fetch_html(url, timeout=max(0.5, min(HTTP_TIMEOUT, deadline - time.time())))
+        if not fetched:
+            return None
+        parsed = parse_html(fetched[1])
+        if looks_script_rendered(parsed):
+            return None
+        return fetched[1], parsed
+
+    executor = ThreadPoolExecutor(max_workers=len(urls), thread_name_prefix='crawl')
+    futures = {executor.submit(fetch_and_parse, url): url for url in urls}
+    done, _ = wait(futures, timeout=max(0, deadline - time.time()))
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    for future in done:
+        try:
+            result = future.result()
+        except Exception:
+            continue
+        if result:
+            pages[futures[future]] = result
+    return pages
+
+
+def crawl_site(url, budget=CRAWL_BUDGET, max_pages=CRAWL_MAX_PAGES):
+    """Fetch the landing page and its candidate contact pages; returns (final_url, [(rank, url, html, parsed)])
+
+    Pages are ordered best first: contact-like pages by keyword rank, then the
+    landing page, then about/footer pages. Returns None if the landing page
+    can't be fetched or is rendered by JavaScript.
+    """
+    deadline = time.time() + budget
+    fetched = fetch_html(url, timeout=min(HTTP_TIMEOUT, budget))
+    if not fetched:
+        return None
+    final_url, html = fetched
+    parsed = parse_html(html)
+    if looks_script_rendered(parsed):
+        print("   ℹ️  Page is rendered by JavaScript, using the browser")
+        return None
+
+    visited = {normalize_link(url), normalize_link(final_url)}
+    candidates = []
+    for rank, link in find_candidate_links(parsed, final_url, limit=max_pages):
+        key = normalize_link(link)
+        if key not in visited:
+            visited.add(key)
+            candidates.append((rank, link))
+
+    pages = fetch_candidates([link for _, link in candidates], deadline)
+    if candidates:
+        print(f"   🔗 Fetched {len(pages)}/{len(candidates)} candidate pages")
+
+    results = [(LANDING_RANK, final_url, html, parsed)]
+    results.extend((rank, link, *pages[link]) for rank, link in candidates if link in pages)
+    results.sort(key=lambda page: page[0])
+    return final_url, results
+
+
+def site_candidates(final_url, pages, phone, email):
+    """Ranked phone/email candidates over the crawled pages (a value keeps its best page's evidence)"""
+    phones = {}
+    emails = {}
+    site = site_domain(final_url)
+    for rank, link, html, parsed in pages:
+        section = None
+        if link != final_url:
+            section = 'contact' if rank < LANDING_RANK else 'about'
+        page_text = html + ' ' + parsed.text
+        for found, merged in ((normalize_phone_candidates(phone_candidates(page_text), final_url, phone), phones), (email_candidates(page_text, site), emails)):
+            for key, candidate in found.items():
+                candidate['evidence']['page'] = link
+                if section:
+                    candidate['evidence']['section'] = section
+                if parsed.has_phone_indicator and merged is phones:
+                    candidate['evidence']['page_icon'] = True
+                merged.setdefault(key, candidate)
+    return {
+        'phone': rank_candidates(phones, PHONE_EVIDENCE_WEIGHTS, phone),
+        'email': rank_candidates(emails, EMAIL_EVIDENCE_WEIGHTS, email),
+    }
+
+
+def extract_contacts_http(url, candidates=False):
+    """Extract name, email, and phone over plain HTTP; None means "use the browser" """
+    crawled = crawl_site(url)
+    if not crawled:
+        return None
+    final_url, pages = crawled
+    archive = get_page_archive()
+    if archive:
+        archive.save(url, final_url, {'pages': [{'rank': rank, 'url': link, 'html': html}
+                                                for rank, link, html, _ in pages]}, source='http')
+    return contacts_from_pages(final_url, pages, candidates=candidates)
+
+
+def contacts_from_pages(final_url, pages, candidates=False):
+    """Name, email and phone of a crawled site ([(rank, url, html, parsed)], best first); None if no contact"""
+    # Merge: each field comes from the best-ranked page that has it
+    email = None
+    phone = None
+    phone_e164 = None
+    for _, _, html, parsed in pages:
+        page_email, page_phone = extract_from_document(html, parsed)
+        email = email or page_email
+        if not phone:
+            phone, phone_e164 = normalize_found_phone(page_phone, final_url)
+        if email and phone:
+            break
+    if not email and not phone:
+        return None
+
+    # Name: prefer the landing page, then any other page
+    name = None
+    for _, _, _, parsed in sorted(pages, key=lambda page: page[1] != final_url):
+        name = extract_name_from_html(parsed)
+        if name:
+            break
+
+    results = {
+        'name': name,
+        'email': email,
+        'phone': phone,
+        'phone_e164': phone_e164
+    }
+    if candidates:
+        results['candidates'] = site_candidates(final_url, pages, phone, email)
+    return results
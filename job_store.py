@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Job Store - SQLite database that drives CSV batch runs
+
+The CSV batch used contacts.csv as its database: re-read in full to decide
+what to do, rewritten to store results. The job store keeps one row per URL
+instead, keyed by its canonical form (so duplicates in the CSV are
+extracted once), with a status, per-field results and their timestamps,
+and attempt counts. The CSV is only imported at the start of a run and
+exported at the end.
+
+Picking work is an indexed query ("rows still missing a phone" uses a
+partial index), and claim() hands out a row atomically, so any number of
+worker processes - or separate batch runs on the same database - can pull
+rows without processing one twice. A claim older than EXTRACT_CLAIM_TIMEOUT
+is considered abandoned (crashed worker) and the row can be claimed again.
+
+Queued rows belong to the run that queued them: workers (named
+'<run>/<worker>') only claim their own run's rows, so rows left pending by
+an earlier run that selected other fields are not picked up.
+
+Usage:
+    from job_store import JobStore
+
+    store = JobStore('contacts.db')
+    store.import_csv('contacts.csv')
+    store.queue('run-1', missing=['phone'])
+    while (job := store.claim('run-1/worker-1')):
+        store.record(job['id'], name, phone, email)
+    store.export_csv('contacts.csv')
+
+Configuration (environment variables):
+    EXTRACT_CLAIM_TIMEOUT    Seconds before a claimed row is considered abandoned (default: 600)
+"""
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+import sqlite3
+import csv
+import os
+
+
+CLAIM_TIMEOUT = int(os.environ.get('EXTRACT_CLAIM_TIMEOUT', '600'))
+# Result fields and their CSV columns (B, C, D)
+FIELDS = {'name': 1, 'phone': 2, 'email': 3}
+
+# Row statuses
+PENDING = 'pending'
+CLAIMED = 'claimed'
+DONE = 'done'
+FAILED = 'failed'
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS urls (
+    id INTEGER PRIMARY KEY,
+    canonical_url TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    csv_row INTEGER,
+    status TEXT NOT NULL DEFAULT '{DONE}',
+    queued_by TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    claimed_by TEXT,
+    claimed_at TEXT,
+    last_error TEXT,
+    updated_at TEXT,
+    {', '.join(f"{field} TEXT NOT NULL DEFAULT '', {field}_at TEXT" for field in FIELDS)}
+);
+CREATE INDEX IF NOT EXISTS urls_status ON urls (status, queued_by, csv_row);
+{' '.join(f"CREATE INDEX IF NOT EXISTS urls_missing_{field} ON urls (status, csv_row) WHERE {field} = '';"
+          for field in FIELDS)}
+"""
+
+
+def canonical_url(url):
+    """One key per page: lowercase host without www., no scheme, fragment, default port or trailing slash"""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f'{host}:{parts.port}'
+    path = parts.path.rstrip('/')
+    return host + path + (f'?{parts.query}' if parts.query else '')
+
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+class JobStore:
+    """URL jobs, their results and claims, in one SQLite file"""
+
+    def __init__(self, path):
+        self.path = path
+        # Autocommit; multi-statement updates open their own transaction
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        # WAL lets workers read while another one writes; NORMAL syncs at checkpoints
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def import_csv(self, csv_file, clean=None):
+        """Add the CSV's URLs (column A); names/phones/emails already in the CSV fill empty fields
+
+        `clean` (e.g. clean_name) is applied to imported names. Returns the number of URLs read.
+        """
+        count = 0
+        now = _now()
+        with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            # Skip header row
+            next(reader, None)
+            self.db.execute('BEGIN')
+            try:
+                for row_num, row in enumerate(reader, start=2):
+                    url = row[0].strip() if row else ''
+                    if not url.startswith(('http://', 'https://')):
+                        continue
+                    values = {field: row[column].strip() if len(row) > column else ''
+                              for field, column in FIELDS.items()}
+                    if clean and values['name']:
+                        values['name'] = clean(values['name']) or ''
+                    self.db.execute(
+                        'INSERT INTO urls (canonical_url, url, csv_row) VALUES (?, ?, ?) '
+                        'ON CONFLICT (canonical_url) DO NOTHING',
+                        (canonical_url(url), url, row_num))
+                    for field, value in values.items():
+                        if value:
+                            self.db.execute(
+                                f"UPDATE urls SET {field} = ?, {field}_at = ? "
+                                f"WHERE canonical_url = ? AND {field} = ''",
+                                (value, now, canonical_url(url)))
+                    count += 1
+                self.db.execute('COMMIT')
+            except BaseException:
+                self.db.execute('ROLLBACK')
+                raise
+        return count
+
+    def queue(self, run, missing=tuple(FIELDS), max_attempts=0):
+        """Queue rows missing any of the `missing` fields for `run`; returns how many the run has pending
+
+        Rows claimed by a live worker are left alone; with max_attempts, rows
+        tried that many times are given up on.
+        """
+        condition = ' OR '.join(f"{field} = ''" for field in missing)
+        stale = (datetime.now() - timedelta(seconds=CLAIM_TIMEOUT)).isoformat(timespec='seconds')
+        params = [run, stale]
+        limit = ''
+        if max_attempts:
+            limit = ' AND attempts < ?'
+            params.append(max_attempts)
+        self.db.execute(
+            f"UPDATE urls SET status = '{PENDING}', queued_by = ? WHERE ({condition}) "
+            f"AND (status != '{CLAIMED}' OR claimed_at < ?){limit}", params)
+        return self.db.execute(f"SELECT COUNT(*) FROM urls WHERE status = '{PENDING}' AND queued_by = ?",
+                               (run,)).fetchone()[0]
+
+    def claim(self, worker):
+        """Atomically take the next pending (or abandoned) row of the worker's run; None when there is no work left
+
+        Workers are named '<run>/<worker>'.
+        """
+        run = worker.partition('/')[0]
+        stale = (datetime.now() - timedelta(seconds=CLAIM_TIMEOUT)).isoformat(timespec='seconds')
+        # IMMEDIATE takes the write lock up front, so two workers can't pick the same row
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            job = self.db.execute(
+                f"SELECT * FROM urls WHERE queued_by = ? AND (status = '{PENDING}' "
+                f"OR (status = '{CLAIMED}' AND claimed_at < ?)) ORDER BY csv_row LIMIT 1",
+                (run, stale)).fetchone()
+            if job:
+                self.db.execute(
+                    f"UPDATE urls SET status = '{CLAIMED}', claimed_by = ?, claimed_at = ?, "
+                    f"attempts = attempts + 1 WHERE id = ?", (worker, _now(), job['id']))
+            self.db.execute('COMMIT')
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+        return dict(job) if job else None
+
+    def release(self, owner):
+        """Put back rows claimed by `owner` (claims are named '<owner>/<worker>') that never finished"""
+        self.db.execute(
+            f"UPDATE urls SET status = '{PENDING}', claimed_by = NULL, claimed_at = NULL "
+            f"WHERE status = '{CLAIMED}' AND claimed_by LIKE ?", (f'{owner}/%',))
+
+    def record(self, job_id, name, phone, email):
+        """Store a finished row's results (fields found empty keep their earlier value)"""
+        now = _now()
+        values = {'name': name, 'phone': phone, 'email': email}
+        assignments = ', '.join(
+            f"{field} = CASE WHEN ? != '' THEN ? ELSE {field} END, "
+            f"{field}_at = CASE WHEN ? != '' THEN ? ELSE {field}_at END" for field in FIELDS)
+        params = []
+        for field in FIELDS:
+            value = values[field] or ''
+            params += [value, value, value, now]
+        self.db.execute(
+            f"UPDATE urls SET {assignments}, status = '{DONE}', claimed_by = NULL, claimed_at = NULL, "
+            f"last_error = NULL, updated_at = ? WHERE id = ?", params + [now, job_id])
+
+    def fail(self, job_id, error):
+        """Give a claimed row back as failed (queue() retries it on the next run)"""
+        self.db.execute(
+            f"UPDATE urls SET status = '{FAILED}', claimed_by = NULL, claimed_at = NULL, "
+            f"last_error = ?, updated_at = ? WHERE id = ?", (error, _now(), job_id))
+
+    def export_csv(self, csv_file):
+        """Write the stored results into columns B-D of the CSV in one streaming pass
+
+        Rows are matched by canonical URL, other rows and columns are copied
+        as they are; the CSV is replaced only once the new copy is complete.
+        Returns the number of rows written with results.
+        """
+        columns = ', '.join(FIELDS)
+        tmp_file = f'{csv_file}.{os.getpid()}.tmp'
+        updated = 0
+        with open(csv_file, 'r', encoding='utf-8', newline='') as src, \
+                open(tmp_file, 'w', encoding='utf-8', newline='') as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst)
+            header = next(reader, None)
+            if header is not None:
+                writer.writerow(header)
+            for row in reader:
+                url = row[0].strip() if row else ''
+                result = None
+                if url.startswith(('http://', 'https://')):
+                    result = self.db.execute(f'SELECT {columns} FROM urls WHERE canonical_url = ?',
+                                             (canonical_url(url),)).fetchone()
+                if result:
+                    # Ensure row has enough columns
+                    row += [''] * (len(FIELDS) + 1 - len(row))
+                    for field, column in FIELDS.items():
+                        row[column] = result[field]
+                    updated += 1
+                writer.writerow(row)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp_file, csv_file)
+        return updated
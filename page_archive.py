@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Page Archive - Content-addressed snapshots of extracted pages, re-extracted offline
+
+When enabled, extract_contacts() saves every page it visits as a
+compressed snapshot, with the requested and the resolved URL:
+
+- browser pages: the extraction bundle (final HTML, visible text, name
+  candidates, Facebook Intro contacts, phone indicator);
+- sites read over the HTTP fast path: the HTML of every crawled page.
+
+Snapshots are stored by the SHA-256 of their content, so revisiting an
+unchanged page doesn't grow the archive.
+
+After changing extract_phone_from_text, extract_email_from_text or
+clean_name, re-run the extractors over the archive with no browser and no
+network:
+
+    python page_archive.py reextract [--archive DIR] [--workers N] [--output results.jsonl] [--candidates] [--rerun-intro]
+
+The Facebook Intro scan runs in the page, so by default re-extraction uses
+the captured Intro values ('intro': 'captured'). With --rerun-intro the
+captured DOM (scripts stripped, network blocked) is loaded into a tab of
+the browser already running on port 9222 and the current Intro script
+runs on it ('intro': 'rerun'). Replay never launches a browser: without
+one on port 9222, --rerun-intro stops with an error.
+
+Usage:
+    from page_archive import get_page_archive
+
+    archive = get_page_archive()
+    if archive:
+        archive.save(url, final_url, bundle)
+
+Configuration (environment variables):
+    EXTRACT_SNAPSHOT_DIR    Archive directory (default: empty = don't archive)
+"""
+from datetime import datetime
+import contextlib
+import functools
+import hashlib
+import gzip
+import json
+import urllib.request
+import sys
+import io
+import re
+import os
+
+from batch_extract import imap_chunks
+
+
+SNAPSHOT_DIR = os.environ.get('EXTRACT_SNAPSHOT_DIR', '')
+SNAPSHOT_SUFFIX = '.json.gz'
+# Snapshots handed to a worker process at a time
+REEXTRACT_CHUNK = 16
+# DevTools port of the browser Facebook snapshots are replayed in
+REPLAY_PORT = 9222
+SCRIPT_RE = re.compile(r'<script\b[^>]*>.*?</script\s*>', re.IGNORECASE | re.DOTALL)
+
+
+class PageArchive:
+    """Snapshots stored as <dir>/<sha[:2]>/<sha>.json.gz"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def snapshot_path(self, digest):
+        return os.path.join(self.path, digest[:2], digest + SNAPSHOT_SUFFIX)
+
+    def save(self, url, final_url, bundle, source='browser'):
+        """Store one extracted page; returns its content hash (None if it couldn't be written)
+
+        `source` is 'browser' (bundle = extraction bundle) or 'http' (bundle =
+        {'pages': [{'rank', 'url', 'html'}, ...]}, the crawled pages best first).
+        """
+        content = {'url': url, 'final_url': final_url or url, 'bundle': bundle or {}}
+        if source != 'browser':
+            content['source'] = source
+        encoded = json.dumps(content, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        digest = hashlib.sha256(encoded).hexdigest()
+        target = self.snapshot_path(digest)
+        if os.path.exists(target):
+            return digest
+
+        content['captured_at'] = datetime.now().isoformat(timespec='seconds')
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp_file = f'{target}.{os.getpid()}.tmp'
+            with gzip.open(tmp_file, 'wt', encoding='utf-8') as f:
+                json.dump(content, f, ensure_ascii=False)
+            os.replace(tmp_file, target)
+        except OSError as e:
+            print(f"   ⚠️  Could not write page snapshot: {e}")
+            return None
+        return digest
+
+    def paths(self):
+        """All snapshot files, in a stable order"""
+        for root, dirs, files in os.walk(self.path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(SNAPSHOT_SUFFIX):
+                    yield os.path.join(root, name)
+
+    @staticmethod
+    def load(path):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+
+_archive = None
+
+
+def get_page_archive():
+    """Return the archive configured by EXTRACT_SNAPSHOT_DIR, or None when archiving is off"""
+    global _archive
+    if _archive is None and SNAPSHOT_DIR:
+        _archive = PageArchive(SNAPSHOT_DIR)
+    return _archive
+
+
+# Tab this worker process replays Facebook snapshots in
+_replay_tab = None
+
+
+def _close_replay_tab():
+    try:
+        _replay_tab.close()
+    except Exception:
+        pass
+
+
+def replay_browser_reachable():
+    """True if a browser already answers on the DevTools port"""
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{REPLAY_PORT}/json/version', timeout=5):
+            return True
+    except (OSError, ValueError):
+        return False
+
+
+def get_replay_tab():
+    """A tab of the browser running on port 9222 for this process
+
+    Only attaches to a running browser (connect_browser() or a bare
+    ChromiumPage would launch one); raises RuntimeError when there is none.
+    """
+    global _replay_tab
+    if _replay_tab is None:
+        from multiprocessing import util
+        from DrissionPage import ChromiumPage
+
+        if not replay_browser_reachable():
+            raise RuntimeError(f"no browser on port {REPLAY_PORT} "
+                               f"(start Chrome with --remote-debugging-port={REPLAY_PORT})")
+        _replay_tab = ChromiumPage(addr_or_opts=REPLAY_PORT).new_tab()
+        util.Finalize(None, _close_replay_tab, exitpriority=10)
+    return _replay_tab
+
+
+def rerun_intro(tab, bundle, candidates=False):
+    """Run the current Facebook Intro script over a captured DOM; returns the new bundle"""
+    from extract_contacts import extract_bundle_js
+
+    html = SCRIPT_RE.sub('', bundle.get('html') or '')
+    # Nothing the snapshot references gets fetched
+    tab.run_cdp('Network.enable')
+    tab.run_cdp('Network.setBlockedURLs', urls=['*'])
+    try:
+        tab.get('about:blank')
+        frame_id = tab.run_cdp('Page.getFrameTree')['frameTree']['frame']['id']
+        tab.run_cdp('Page.setDocumentContent', frameId=frame_id, html=html)
+        data = tab.run_js(extract_bundle_js(True, keep_page=True, candidates=candidates)) or {}
+    finally:
+        tab.run_cdp('Network.setBlockedURLs', urls=[])
+    # Keep the captured page text/HTML, take the Intro results of the current script
+    rerun = dict(bundle)
+    for key in ('facebook_name', 'phone', 'email', 'methods', 'tried', 'candidates'):
+        rerun[key] = data.get(key)
+    return rerun
+
+
+def reextract_snapshot(path, candidates=False, replay_intro=False):
+    """Run the current extractors over one snapshot (worker process)
+
+    With replay_intro, Facebook snapshots get the current Intro script run on
+    their captured DOM in the browser on port 9222; otherwise (or if that
+    fails, see 'intro_error') the captured Intro values are used.
+    """
+    from extract_contacts import contacts_from_bundle, is_facebook_url
+
+    try:
+        snapshot = PageArchive.load(path)
+    except (OSError, ValueError) as e:
+        return {'snapshot': os.path.basename(path), 'error': str(e)}
+    url = snapshot.get('final_url') or snapshot.get('url')
+    bundle = snapshot.get('bundle') or {}
+    intro = intro_error = None
+    # The extractors narrate their progress; only the results matter here
+    with contextlib.redirect_stdout(io.StringIO()):
+        if snapshot.get('source') == 'http':
+            from http_extract import contacts_from_pages, parse_html
+
+            pages = [(page['rank'], page['url'], page['html'], parse_html(page['html']))
+                     for page in bundle.get('pages') or []]
+            results = contacts_from_pages(url, pages, candidates=candidates) or {}
+        else:
+            if is_facebook_url(url) and bundle.get('html'):
+                intro = 'captured'
+                if replay_intro:
+                    try:
+                        bundle = rerun_intro(get_replay_tab(), bundle, candidates)
+                        intro = 'rerun'
+                    except Exception as e:
+                        intro_error = str(e)
+            results = contacts_from_bundle(bundle, url, candidates=candidates)
+    result = {
+        'snapshot': os.path.basename(path)[:-len(SNAPSHOT_SUFFIX)],
+        'url': snapshot.get('url'),
+        'final_url': snapshot.get('final_url'),
+        'captured_at': snapshot.get('captured_at'),
+        'name': results.get('name'),
+        'email': results.get('email'),
+        'phone': results.get('phone'),
+        'phone_e164': results.get('phone_e164'),
+    }
+    if intro:
+        result['intro'] = intro
+    if intro_error:
+        result['intro_error'] = intro_error
+    if candidates:
+        result['candidates'] = results.get('candidates')
+    return result
+
+
+def reextract(archive, workers=None, output=None, candidates=False, replay_intro=False):
+    """Re-extract every snapshot in parallel, writing one JSON line per snapshot"""
+    out = open(output, 'w', encoding='utf-8') if output else sys.stdout
+    count = 0
+    try:
+        for result in imap_chunks(functools.partial(reextract_snapshot, candidates=candidates,
+                                                    replay_intro=replay_intro),
+                                  archive.paths(), workers=workers, chunk_size=REEXTRACT_CHUNK):
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+            count += 1
+    finally:
+        if output:
+            out.close()
+    return count
+
+
+def main():
+    """Command line: re-extract an archive offline"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Re-run the contact extractors over archived page snapshots")
+    parser.add_argument('command', choices=['reextract'], help="Action to run on the archive")
+    parser.add_argument('--archive', default=SNAPSHOT_DIR or None,
+                        help="Archive directory (default: $EXTRACT_SNAPSHOT_DIR)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument('--output', default=None,
+                        help="Write JSON lines here instead of stdout")
+    parser.add_argument('--candidates', action='store_true',
+                        help="Also rank every phone/email found, with scores and evidence")
+    parser.add_argument('--rerun-intro', action='store_true',
+                        help=f"Re-run the Facebook Intro scan in the browser already running on port {REPLAY_PORT}")
+    args = parser.parse_args()
+
+    if not args.archive or not os.path.isdir(args.archive):
+        print(f"❌ Error: archive directory not found: {args.archive}", file=sys.stderr)
+        sys.exit(1)
+    if args.rerun_intro and not replay_browser_reachable():
+        print(f"❌ Error: --rerun-intro needs a browser on port {REPLAY_PORT}; none is running", file=sys.stderr)
+        print(f"   chrome --remote-debugging-port={REPLAY_PORT}", file=sys.stderr)
+        sys.exit(1)
+
+    count = reextract(PageArchive(args.archive), workers=args.workers, output=args.output,
+                      candidates=args.candidates, replay_intro=args.rerun_intro)
+    print(f"✅ Re-extracted {count} snapshots", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Phone Numbers - Normalize extracted phone numbers to E.164 with numbering-plan tables
+
+Pages write the same number in many ways ("21 794 8800", "+351 21 794 8800",
+"00351 217948800"). normalize_phone() maps them to one E.164 form
+("+351217948800") and rejects numbers no plan allows, using table lookups:
+the calling code picks the plan, the plan's prefix table and allowed lengths
+decide whether the national number can exist.
+
+Plans ship for Portugal; other countries plug in with register_plan():
+
+    register_plan(NumberingPlan('ES', '34', lengths=(9,), prefixes={
+        '6': 'mobile', '7': 'mobile', '8': 'landline', '9': 'landline'}, tlds=('es',)))
+
+The plan of a number written without a calling code comes from the site's
+country-code top-level domain (country_for_url). Sites with a generic domain
+(.com, facebook.com) tell nothing, so EXTRACT_PHONE_COUNTRY's plan is tried:
+a number it accepts is VALID, any other is kept unvalidated (UNKNOWN, never
+IMPOSSIBLE), since it may belong to another country. Numbers with a calling
+code that has no plan keep their digits ('+' form, unvalidated).
+
+Configuration (environment variables):
+    EXTRACT_PHONE_COUNTRY    Country tried for national numbers on sites whose domain has
+                             no country, e.g. facebook.com (default: PT, empty = none)
+"""
+import re
+import os
+
+
+DEFAULT_COUNTRY = os.environ.get('EXTRACT_PHONE_COUNTRY', 'PT').strip().upper() or None
+# E.164 caps a number (calling code included) at 15 digits
+E164_MAX_DIGITS = 15
+INTERNATIONAL_PREFIX = '00'
+
+# normalize_phone() outcomes
+VALID = 'valid'
+IMPOSSIBLE = 'impossible'
+UNKNOWN = 'unknown'
+
+
+class NumberingPlan:
+    """A country's numbering plan: calling code, national number lengths and prefix table"""
+
+    def __init__(self, country, calling_code, lengths, prefixes, trunk_prefix='', tlds=()):
+        self.country = country
+        self.calling_code = calling_code
+        self.lengths = frozenset(lengths)
+        # National number prefix -> number type ('mobile', 'landline', ...)
+        self.prefixes = dict(prefixes)
+        self.prefix_lengths = sorted({len(prefix) for prefix in self.prefixes}, reverse=True)
+        self.trunk_prefix = trunk_prefix
+        self.tlds = tuple(tlds)
+
+    def number_type(self, national):
+        """Type of a national number, None if the plan has no such number"""
+        if len(national) not in self.lengths:
+            return None
+        for size in self.prefix_lengths:
+            kind = self.prefixes.get(national[:size])
+            if kind:
+                return kind
+        return None
+
+
+# Portugal (ANACOM plan): 9-digit numbers, no trunk prefix
+PORTUGAL = NumberingPlan('PT', '351', lengths=(9,), prefixes={
+    # Geographic: 21 Lisboa, 22 Porto, 23x-29x the other areas and the islands
+    '21': 'landline', '22': 'landline', '23': 'landline', '24': 'landline', '25': 'landline',
+    '26': 'landline', '27': 'landline', '28': 'landline', '29': 'landline',
+    '30': 'voip',
+    '91': 'mobile', '92': 'mobile', '93': 'mobile', '96': 'mobile',
+    '707': 'shared', '708': 'shared', '760': 'premium', '761': 'premium', '762': 'premium',
+    '800': 'freephone', '808': 'shared', '809': 'shared',
+}, tlds=('pt',))
+
+_plans_by_code = {}
+_plans_by_country = {}
+_plans_by_tld = {}
+_code_lengths = []
+
+
+def register_plan(plan):
+    """Add (or replace) a country's numbering plan"""
+    global _code_lengths
+    _plans_by_code[plan.calling_code] = plan
+    _plans_by_country[plan.country] = plan
+    for tld in plan.tlds:
+        _plans_by_tld[tld] = plan
+    _code_lengths = sorted({len(code) for code in _plans_by_code}, reverse=True)
+
+
+register_plan(PORTUGAL)
+
+
+def country_for_url(url):
+    """Country whose plan covers the site's top-level domain (e.g. '.pt'), else None"""
+    host = re.sub(r'^[a-z]+://', '', (url or '').lower()).split('/')[0].split(':')[0]
+    plan = _plans_by_tld.get(host.rsplit('.', 1)[-1])
+    return plan.country if plan else None
+
+
+def normalize_phone(phone, country=None, default_country=DEFAULT_COUNTRY):
+    """E.164 form of a phone number and how sure we are: (e164, VALID/IMPOSSIBLE/UNKNOWN)
+
+    VALID: a plan allows the number. IMPOSSIBLE: the plan for its calling code
+    (or for `country`, when written without one) has no such number.
+    UNKNOWN: no plan covers it (e164 is then the '+' form if the calling code
+    was written, else None). Without a calling code or `country`, the
+    `default_country` plan is tried: VALID if it allows the number, else UNKNOWN.
+    """
+    if not phone:
+        return None, IMPOSSIBLE
+    if not country and default_country:
+        e164, status = normalize_phone(phone, default_country=None)
+        if e164 or status != UNKNOWN:
+            # Written with a calling code: that decides
+            return e164, status
+        e164, status = normalize_phone(phone, default_country, default_country=None)
+        return (e164, VALID) if status == VALID else (None, UNKNOWN)
+    phone = phone.strip()
+    digits = re.sub(r'\D', '', phone)
+    international = phone.startswith('+') or digits.startswith(INTERNATIONAL_PREFIX)
+    if digits.startswith(INTERNATIONAL_PREFIX) and not phone.startswith('+'):
+        digits = digits[len(INTERNATIONAL_PREFIX):]
+
+    plan = _plans_by_country.get((country or '').upper())
+    # A national number of the site's country written with its calling code but no '+'
+    if not international and plan and digits.startswith(plan.calling_code) \
+            and len(digits) - len(plan.calling_code) in plan.lengths:
+        international = True
+
+    if international:
+        plan = next((_plans_by_code[digits[:size]] for size in _code_lengths
+                     if digits[:size] in _plans_by_code), None)
+        if not plan:
+            if 8 <= len(digits) <= E164_MAX_DIGITS:
+                return '+' + digits, UNKNOWN
+            return None, IMPOSSIBLE
+        national = digits[len(plan.calling_code):]
+    elif not plan:
+        return None, UNKNOWN
+    else:
+        national = digits
+
+    if plan.trunk_prefix and national.startswith(plan.trunk_prefix) \
+            and len(national) - len(plan.trunk_prefix) in plan.lengths:
+        national = national[len(plan.trunk_prefix):]
+    if not plan.number_type(national) or len(plan.calling_code) + len(national) > E164_MAX_DIGITS:
+        return None, IMPOSSIBLE
+    return '+' + plan.calling_code + national, VALID
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Strategy Stats - Learn which extraction method finds each field, per site
+
+Every field (phone, email) can be found by several methods, tried in a fixed
+order: the Facebook Intro scan tries icon, keyword, context for phones; the
+general-page extractor tries keyword, formatted, context. This store records,
+per domain and page template, how often each method was tried and how often
+it produced the field. The order is the rules' priority - when several
+methods find a value, the first one's wins - so it never changes; later runs
+only skip methods that practically never yield when they get to run (with
+occasional exploration so a skipped method can come back).
+
+Several processes (batch workers, API server workers) share the file: saves
+merge their counts into it under an exclusive lock on <file>.lock.
+
+Usage:
+    from strategy_stats import get_strategy_stats
+
+    stats = get_strategy_stats()
+    methods = stats.plan('facebook.com|about', 'phone', ['icon', 'keyword', 'context'])
+    ...
+    stats.record('facebook.com|about', 'phone', tried=['icon', 'keyword'], winner='keyword')
+
+Configuration (environment variables):
+    EXTRACT_STRATEGY_STATS    JSON file (default: ~/.cache/extract_contacts/strategy_stats.json,
+                              empty = don't learn)
+"""
+import contextlib
+import threading
+import atexit
+import random
+import json
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+STATS_FILE = os.environ.get(
+    'EXTRACT_STRATEGY_STATS',
+    os.path.expanduser('~/.cache/extract_contacts/strategy_stats.json')
+)
+
+# A method is skipped once it was tried MIN_TRIES times with a yield below
+# MIN_YIELD; EXPLORE_RATE of the plans still run every method
+MIN_TRIES = 20
+MIN_YIELD = 0.02
+EXPLORE_RATE = 0.05
+# Unsaved records before the store is written back
+SAVE_EVERY = 20
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    """Hold an exclusive lock on `path` (shared by every process using it)"""
+    with open(path, 'a+') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class StrategyStats:
+    """Per-key (domain|template) and per-field counters of tries and wins per method"""
+
+    def __init__(self, path=STATS_FILE, save_every=SAVE_EVERY):
+        self.path = path
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._stats = self._load()
+        # Counts not yet written, merged into the file on save (other processes may write it too)
+        self._pending = {}
+        self._unsaved = 0
+
+    def _load(self):
+        """Read the store; a missing or broken file starts empty"""
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _add(stats, key, field, method, tries, wins):
+        counts = stats.setdefault(key, {}).setdefault(field, {}).setdefault(method, [0, 0])
+        counts[0] += tries
+        counts[1] += wins
+
+    def plan(self, key, field, methods):
+        """`methods` in their given (priority) order, without those that practically never yield
+
+        A method's yield is (wins + 1) / (tries + 2) over the runs that got to
+        it, i.e. where every method before it found nothing.
+        """
+        with self._lock:
+            counts = self._stats.get(key, {}).get(field, {})
+
+            def never_yields(method):
+                tries, wins = counts.get(method, (0, 0))
+                return tries >= MIN_TRIES and (wins + 1) / (tries + 2) < MIN_YIELD
+
+            keep = [m for m in methods if not never_yields(m)]
+        if not keep or random.random() < EXPLORE_RATE:
+            return list(methods)
+        return keep
+
+    def record(self, key, field, tried, winner=None):
+        """Count one extraction: every method in `tried` was run, `winner` produced the field"""
+        if not tried:
+            return
+        with self._lock:
+            for method in tried:
+                wins = 1 if method == winner else 0
+                self._add(self._stats, key, field, method, 1, wins)
+                self._add(self._pending, key, field, method, 1, wins)
+            self._unsaved += 1
+            due = self._unsaved >= self.save_every
+        if due:
+            self.save()
+
+    def save(self):
+        """Merge unsaved counts into the file (atomic replace, under the file lock)"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending, self._unsaved = self._pending, {}, 0
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                # Other processes merge into the same file: read-merge-write under their lock
+                with _file_lock(f'{self.path}.lock'):
+                    merged = self._load()
+                    for key, fields in pending.items():
+                        for field, methods in fields.items():
+                            for method, (tries, wins) in methods.items():
+                                self._add(merged, key, field, method, tries, wins)
+                    tmp_file = f'{self.path}.{os.getpid()}.tmp'
+                    with open(tmp_file, 'w', encoding='utf-8') as f:
+                        json.dump(merged, f, indent=1, sort_keys=True)
+                    os.replace(tmp_file, self.path)
+                self._stats = merged
+            except OSError as e:
+                print(f"   ⚠️  Could not write strategy stats: {e}")
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def get_strategy_stats():
+    """Return the process-wide stats store (saved on exit)"""
+    global _stats
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                stats = StrategyStats()
+                atexit.register(stats.save)
+                _stats = stats
+    return _stats
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Tab Pool - Share one Chrome instance between concurrent extraction requests
+
+Every /extract request used to drive the single active tab of the Chrome
+running on port 9222, so two overlapping requests navigated the same page
+under each other. The pool opens up to N tabs in that browser and hands each
+request its own tab for the duration of the extraction.
+
+Usage:
+    from tab_pool import get_tab_pool
+
+    with get_tab_pool().tab() as tab:
+        results, page = extract_contacts(url, page=tab)
+        if page is None:
+            get_tab_pool().mark_broken(tab)
+
+    # Or, for work spanning several calls:
+    tab = get_tab_pool().checkout()
+    try:
+        ...
+    finally:
+        get_tab_pool().checkin(tab)
+
+Configuration (environment variables):
+    TAB_POOL_SIZE          Number of tabs to open (default: 4)
+    TAB_POOL_TIMEOUT       Seconds to wait for a free tab (default: 120)
+"""
+from contextlib import contextmanager
+import threading
+import time
+import os
+
+from extract_contacts import connect_browser
+from browser_supervisor import running_supervisor
+
+
+DEFAULT_POOL_SIZE = int(os.environ.get('TAB_POOL_SIZE', 4))
+DEFAULT_CHECKOUT_TIMEOUT = float(os.environ.get('TAB_POOL_TIMEOUT', 120))
+
+
+class TabPoolExhausted(Exception):
+    """Raised when no tab becomes free within the checkout timeout"""
+
+
+class TabPool:
+    """A fixed-size pool of browser tabs that requests check out and return"""
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, checkout_timeout=DEFAULT_CHECKOUT_TIMEOUT):
+        self.size = max(1, int(size))
+        self.checkout_timeout = checkout_timeout
+        # Idle tabs (most recently returned last) and the open tab count; every
+        # change that frees a tab or a slot notifies the waiting checkouts
+        self._idle = []
+        self._cond = threading.Condition()
+        self._created = 0
+        self._browser = None
+        self._generation = 0
+        self._tab_generation = {}
+        self._broken = set()
+
+    def _connect(self):
+        """Connect to the browser (once), starting it in production if needed"""
+        if self._browser is None:
+            self._browser = connect_browser()
+            if self._browser is None:
+                raise Exception("Failed to connect to browser. Make sure Chrome is running with --remote-debugging-port=9222")
+            print(f"✅ Tab pool connected to browser (size: {self.size})")
+        return self._browser
+
+    def _open_tab(self):
+        """Open a new blank tab in the browser"""
+        try:
+            return self._connect().new_tab()
+        except Exception:
+            # The browser may have been restarted; reconnect and try once more
+            self._browser = None
+            return self._connect().new_tab()
+
+    def _drop_stale_tabs(self, supervisor):
+        """Forget idle tabs of a browser the supervisor has since restarted"""
+        with self._cond:
+            if supervisor is None or supervisor.generation == self._generation:
+                return
+            self._generation = supervisor.generation
+            self._browser = None
+            for tab in self._idle:
+                self._tab_generation.pop(id(tab), None)
+            self._created -= len(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+
+    def _take_tab(self):
+        """Take an idle tab, open a new one if below size, or wait for a tab or a slot to free up"""
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._cond:
+            while not self._idle and self._created >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TabPoolExhausted(
+                        f"No browser tab became free within {self.checkout_timeout}s "
+                        f"(pool size: {self.size})"
+                    )
+                self._cond.wait(remaining)
+            if self._idle:
+                return self._idle.pop()
+
+            self._created += 1
+            try:
+                tab = self._open_tab()
+            except Exception:
+                self._created -= 1
+                self._cond.notify()
+                raise
+            self._tab_generation[id(tab)] = self._generation
+            return tab
+
+    def checkout(self):
+        """Check out a tab; while it is out the supervisor won't recycle the browser"""
+        supervisor = running_supervisor()
+        # Lease first: a pending recycle happens before the tab is picked, not under it
+        if supervisor is not None:
+            supervisor.acquire()
+        try:
+            self._drop_stale_tabs(supervisor)
+            return self._take_tab()
+        except BaseException:
+            if supervisor is not None:
+                supervisor.release()
+            raise
+
+    def checkin(self, tab, broken=False):
+        """Reset a tab to a blank page and put it back, or drop it if broken"""
+        supervisor = running_supervisor()
+        try:
+            self._return_tab(tab, broken)
+        finally:
+            if supervisor is not None:
+                supervisor.release()
+
+    def _return_tab(self, tab, broken):
+        """Put a tab back in the idle queue, or close it and free its slot"""
+        if self._tab_generation.get(id(tab)) != self._generation or id(tab) in self._broken:
+            # The browser was restarted while this tab was out, or it was reported dead
+            broken = True
+        self._broken.discard(id(tab))
+        if not broken:
+            try:
+                tab.get('about:blank')
+                with self._cond:
+                    self._idle.append(tab)
+                    self._cond.notify()
+                return
+            except Exception:
+                pass
+
+        # Tab is unusable: close it and free its slot so a fresh one gets opened
+        try:
+            tab.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._tab_generation.pop(id(tab), None)
+            self._created -= 1
+            self._cond.notify()
+
+    def mark_broken(self, tab):
+        """Report a checked-out tab as dead (e.g. extract_contacts() returned no page for it)"""
+        self._broken.add(id(tab))
+
+    @contextmanager
+    def tab(self):
+        """Check out a tab for the duration of a `with` block"""
+        tab = self.checkout()
+        broken = False
+        try:
+            yield tab
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.checkin(tab, broken=broken)
+
+    def stats(self):
+        """Return pool usage counters"""
+        idle = len(self._idle)
+        return {
+            "size": self.size,
+            "open": self._created,
+            "idle": idle,
+            "busy": self._created - idle,
+        }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_tab_pool():
+    """Return the process-wide tab pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = TabPool()
+    return _pool
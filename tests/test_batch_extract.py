@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+
+from batch_extract import extract_document, extract_texts
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DOCUMENTS = [
+    {'id': 1, 'text': 'Contactos\nTel: 21 794 8800\nEmail: geral@loja.pt', 'name': 'Loja Verified'},
+    'Escreva para info@outra.pt',
+    42,
+    ['a', 'list'],
+    None,
+    {'id': 6, 'text': 12345},
+    {'id': 7, 'text': 'Sem contactos'},
+]
+
+
+def test_records_that_are_not_documents_are_reported_per_record():
+    assert extract_document(42) == {'error': 'unsupported record: expected a string or an object, got int'}
+    assert extract_document(None)['error'].endswith('got NoneType')
+    assert extract_document({'id': 'x', 'text': ['a']}) == {
+        'id': 'x', 'error': "unsupported record: 'text' is a list, not a string"}
+
+
+def test_extract_texts_keeps_going_past_bad_records():
+    results = list(extract_texts(DOCUMENTS, workers=2, chunk_size=2))
+
+    assert len(results) == len(DOCUMENTS)
+    assert results[0]['id'] == 1
+    assert results[0]['email'] == 'geral@loja.pt'
+    assert results[0]['phone'] == '21 794 8800'
+    assert results[1]['email'] == 'info@outra.pt'
+    assert [sorted(r) for r in results[2:5]] == [['error']] * 3
+    assert sorted(results[5]) == ['error', 'id']
+    assert results[6] == {'id': 7, 'email': None, 'phone': None, 'phone_e164': None}
+
+
+def test_cli_reports_bad_lines_and_writes_every_result(tmp_path):
+    corpus = tmp_path / 'corpus.jsonl'
+    lines = [json.dumps(document) for document in DOCUMENTS] + ['{not json']
+    corpus.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    output = tmp_path / 'results.jsonl'
+
+    run = subprocess.run([sys.executable, 'batch_extract.py', str(corpus), '--output', str(output),
+                          '--workers', '2', '--chunk-size', '3'],
+                         cwd=ROOT, capture_output=True, text=True, timeout=120)
+
+    assert run.returncode == 0, run.stderr
+    assert 'Extracted 8 documents' in run.stderr
+    assert '5 records could not be extracted' in run.stderr
+    results = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert len(results) == 8
+    assert results[0]['email'] == 'geral@loja.pt'
+    assert results[7]['error'].startswith('line 8: invalid JSON')
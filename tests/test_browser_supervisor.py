@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+from browser_supervisor import BrowserSupervisor
+
+
+class FakeProcess:
+    pid = 0
+
+    def poll(self):
+        return None
+
+
+@pytest.fixture
+def supervisor(tmp_path, monkeypatch):
+    supervisor = BrowserSupervisor(max_pages=1, user_data_dir=str(tmp_path), drain_timeout=10)
+
+    def launch():
+        supervisor._process = FakeProcess()
+        supervisor.generation += 1
+        supervisor._pages_served = 0
+        supervisor._recycle_reason = None
+
+    monkeypatch.setattr(supervisor, '_launch', launch)
+    monkeypatch.setattr(supervisor, '_terminate', lambda: None)
+    launch()
+    return supervisor
+
+
+def test_pending_recycle_drains_new_leases(supervisor):
+    supervisor.acquire()
+    supervisor.acquire()
+    # Page limit reached while another page is in use: the recycle waits for it
+    supervisor.release()
+    assert supervisor._recycle_reason and supervisor.generation == 1
+
+    leased = threading.Event()
+    thread = threading.Thread(target=lambda: (supervisor.acquire(), leased.set()))
+    thread.start()
+    assert not leased.wait(0.2)
+
+    supervisor.release()
+    assert leased.wait(5)
+    thread.join()
+    # The new lease runs on the recycled browser
+    assert supervisor.generation == 2
+    assert supervisor._active == 1
+
+
+def test_drain_timeout_forces_the_recycle(supervisor):
+    supervisor.drain_timeout = 0.1
+    supervisor.acquire()
+    supervisor._recycle_reason = 'memory 2000 MB > 1500 MB'
+
+    started = time.monotonic()
+    supervisor.acquire()
+    assert time.monotonic() - started < 5
+    assert supervisor.generation == 2
+    assert supervisor._recycle_reason is None
+    assert supervisor._active == 2
+
+
+def test_no_wait_without_a_pending_recycle(supervisor):
+    supervisor.acquire()
+    supervisor.acquire()
+    assert supervisor._active == 2 and supervisor.generation == 1
@@ -0,0 +1,34 @@
+from domain_filter import DEFAULT_BLOCKED_DOMAINS, DomainFilter, normalize_domain, read_domain_list
+
+
+def test_subdomains_match_on_label_boundaries():
+    domain_filter = DomainFilter(['wixpress.com'])
+    assert domain_filter.blocks('errors@sentry.wixpress.com')
+    assert domain_filter.blocks('me@WixPress.com.')
+    assert not domain_filter.blocks('me@notwixpress.com')
+    assert not domain_filter.blocks('me@wixpress.com.pt')
+
+
+def test_most_specific_rule_wins():
+    domain_filter = DomainFilter(['shop.pt'], allowed=['loja.shop.pt'])
+    assert domain_filter.blocks('a@shop.pt')
+    assert not domain_filter.blocks('a@loja.shop.pt')
+    assert not domain_filter.blocks('a@norte.loja.shop.pt')
+    domain_filter.block(['norte.loja.shop.pt'])
+    assert domain_filter.blocks('a@norte.loja.shop.pt')
+
+
+def test_default_blocklist_keeps_real_mailboxes():
+    domain_filter = DomainFilter(DEFAULT_BLOCKED_DOMAINS)
+    assert domain_filter.blocks('you@example.com')
+    assert domain_filter.blocks('abc@o123.ingest.sentry.io')
+    assert not domain_filter.blocks('loja@gmail.com')
+    assert not domain_filter.blocks('info@padaria.pt')
+
+
+def test_list_files(tmp_path):
+    path = tmp_path / 'blocked.txt'
+    path.write_text('# ad networks\n@Mailer.Example.org\n*.tracker.net  # and subdomains\n\nspam.pt.\n',
+                    encoding='utf-8')
+    assert list(read_domain_list(str(path))) == ['mailer.example.org', 'tracker.net', 'spam.pt']
+    assert normalize_domain(' *.Foo.COM. ') == 'foo.com'
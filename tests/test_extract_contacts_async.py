@@ -0,0 +1,158 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+import extract_contacts
+import extract_contacts_async
+from extract_contacts_async import CDPBrowser, CDPError, extract_contacts_async as extract_one, extract_many_async
+from strategy_stats import StrategyStats
+
+
+class StubWebSocket:
+    """Plays the browser side of the DevTools protocol over a fake websocket
+
+    `pages` maps a URL to the extraction bundle its page returns (None: the
+    bundle script throws). Methods in `fail` are answered with an error,
+    methods in `silent` never get an answer.
+    """
+
+    def __init__(self, pages=None, fail=(), silent=()):
+        self.pages = pages or {}
+        self.fail = set(fail)
+        self.silent = set(silent)
+        self.incoming = asyncio.Queue()
+        self.sent = []
+        self.locations = {}
+        self.targets = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.incoming.get()
+        if message is None:
+            # Clean close: the iteration just ends, as with websockets
+            raise StopAsyncIteration
+        return json.dumps(message)
+
+    async def close(self):
+        self.closed = True
+        self.incoming.put_nowait(None)
+
+    def methods(self, method):
+        return [message for message in self.sent if message['method'] == method]
+
+    async def send(self, raw):
+        message = json.loads(raw)
+        self.sent.append(message)
+        method, session = message['method'], message.get('sessionId')
+        if method in self.silent:
+            return
+        if method in self.fail:
+            self.incoming.put_nowait({'id': message['id'], 'error': {'message': f'{method} failed'}})
+            return
+        event = None
+        result = {}
+        if method == 'Target.createTarget':
+            self.targets += 1
+            result = {'targetId': f't{self.targets}'}
+        elif method == 'Target.attachToTarget':
+            result = {'sessionId': 's' + message['params']['targetId'][1:]}
+        elif method == 'Page.navigate':
+            self.locations[session] = message['params']['url']
+            event = {'method': 'Page.loadEventFired', 'sessionId': session, 'params': {}}
+        elif method == 'Runtime.evaluate':
+            result = self.evaluate(message['params']['expression'], self.locations.get(session))
+        self.incoming.put_nowait({'id': message['id'], 'result': result})
+        if event:
+            self.incoming.put_nowait(event)
+
+    def evaluate(self, expression, url):
+        if 'const isFacebook' in expression:
+            if self.pages.get(url) is None:
+                return {'exceptionDetails': {'text': 'Uncaught TypeError'}}
+            value = self.pages[url]
+        elif 'readyState' in expression:
+            value = {'found': 'h1', 'href': url, 'readyState': 'complete', 'resources': 1}
+        elif 'const click' in expression:
+            # No About/Contact link on the page
+            value = -1
+        elif 'location.href' in expression:
+            value = url
+        else:
+            value = None
+        return {'result': {'value': value}}
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    """Route CDPBrowser.connect() to a stub websocket (the test sets its pages)"""
+    ws = StubWebSocket()
+
+    async def connect(self):
+        self._ws = ws
+        self._reader = asyncio.create_task(self._read_loop())
+        return self
+
+    monkeypatch.setattr(CDPBrowser, 'connect', connect)
+    monkeypatch.setattr(extract_contacts, 'get_strategy_stats', lambda: StrategyStats(path=''))
+    monkeypatch.setattr(extract_contacts_async, 'get_page_archive', lambda: None)
+    return ws
+
+
+PAGE = {'has_phone_indicator': True, 'h1s': ['Loja A'], 'title': 'Loja A',
+        'text': 'Contactos\nTel: 21 794 8800\nEmail: geral@loja-a.pt'}
+
+
+def test_one_failing_url_keeps_the_other_results(stub):
+    stub.pages = {'https://a.pt/': PAGE, 'https://b.pt/': None}
+
+    results = asyncio.run(extract_many_async(['https://a.pt/', 'https://b.pt/'], concurrency=2))
+
+    assert results[0]['name'] == 'Loja A'
+    assert results[0]['phone'] == '21 794 8800'
+    assert results[0]['email'] == 'geral@loja-a.pt'
+    assert results[1] is None
+    assert len(stub.methods('Target.closeTarget')) == 2
+    assert stub.closed
+
+
+def test_failed_tab_setup_closes_the_tab_and_the_browser(stub):
+    stub.fail = {'Target.attachToTarget'}
+
+    assert asyncio.run(extract_one('https://a.pt/')) is None
+
+    assert [m['params']['targetId'] for m in stub.methods('Target.closeTarget')] == ['t1']
+    assert stub.closed
+
+
+def test_tab_setup_failure_does_not_abort_the_batch(stub):
+    stub.pages = {'https://a.pt/': PAGE}
+    stub.fail = {'Target.attachToTarget'}
+
+    assert asyncio.run(extract_many_async(['https://a.pt/', 'https://b.pt/'])) == [None, None]
+
+
+def test_clean_close_fails_waiting_commands(stub):
+    stub.silent = {'Runtime.evaluate'}
+
+    async def scenario():
+        browser = await CDPBrowser().connect()
+        command = asyncio.create_task(browser.send('Runtime.evaluate', {'expression': '1'}, timeout=30))
+        event = browser.expect_event('Page.loadEventFired', 's1')
+        await asyncio.sleep(0.05)
+        await stub.close()
+        started = time.monotonic()
+        with pytest.raises(CDPError):
+            await command
+        with pytest.raises(CDPError):
+            await event
+        assert time.monotonic() - started < 5
+        with pytest.raises(CDPError):
+            await browser.send('Page.enable')
+        await browser.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import threading
+import codecs
+
+import pytest
+
+from http_extract import html_encoding, fetch_html
+
+
+PAGE = '<html><head><title>João Café</title></head><body>Olá</body></html>'
+
+
+def test_header_charset_wins():
+    assert html_encoding('text/html; charset=ISO-8859-1', PAGE.encode('utf-8')) == 'iso8859-1'
+
+
+def test_utf8_header_strips_bom():
+    assert html_encoding('text/html; charset="utf-8"', b'\xef\xbb\xbf<html>') == 'utf-8-sig'
+
+
+def test_bom_without_header_charset():
+    assert html_encoding('text/html', codecs.BOM_UTF16_LE + '<html>'.encode('utf-16-le')) == 'utf-16'
+
+
+def test_meta_charset():
+    body = b'<html><head><meta http-equiv="Content-Type" content="text/html; charset=windows-1252">'
+    assert html_encoding('text/html', body) == 'cp1252'
+    assert html_encoding('text/html', b'<meta charset="latin-1">') == 'iso8859-1'
+
+
+def test_defaults_to_utf8():
+    assert html_encoding('text/html', PAGE.encode('utf-8')) == 'utf-8'
+    assert html_encoding('text/html; charset=bogus', b'<meta charset="nope">') == 'utf-8'
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = PAGE.encode('utf-8')
+        self.send_response(200)
+        # No charset: requests would assume ISO-8859-1
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}/'
+    httpd.shutdown()
+
+
+def test_utf8_page_without_charset_is_not_mojibake(server):
+    _, html = fetch_html(server)
+    assert 'João Café' in html
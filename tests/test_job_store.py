@@ -0,0 +1,116 @@
+import csv
+import multiprocessing
+
+import pytest
+
+from job_store import CLAIMED, FAILED, PENDING, JobStore, canonical_url
+
+
+@pytest.mark.parametrize('url, key', [
+    ('https://www.Loja.PT/', 'loja.pt'),
+    ('http://loja.pt', 'loja.pt'),
+    ('https://loja.pt:443/contactos/', 'loja.pt/contactos'),
+    ('https://loja.pt:8080/contactos', 'loja.pt:8080/contactos'),
+    ('https://loja.pt/p?id=3#top', 'loja.pt/p?id=3'),
+    ('  https://www.facebook.com/Loja  ', 'facebook.com/Loja'),
+])
+def test_canonical_url(url, key):
+    assert canonical_url(url) == key
+
+
+def write_csv(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerows([['url', 'name', 'phone', 'email']] + rows)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / 'contacts.db'))
+    yield store
+    store.close()
+
+
+def test_duplicates_are_imported_once_and_exported_to_every_row(store, tmp_path):
+    csv_file = str(tmp_path / 'contacts.csv')
+    write_csv(csv_file, [['https://www.loja.pt/', 'Loja Verified'], ['not a url'], ['http://loja.pt', '', '', 'a@loja.pt']])
+
+    assert store.import_csv(csv_file, clean=lambda name: name.replace(' Verified', '')) == 2
+    assert store.queue('run-1') == 1
+    job = store.claim('run-1/1')
+    assert (job['name'], job['email']) == ('Loja', 'a@loja.pt')
+    store.record(job['id'], None, '912 345 678', None)
+
+    assert store.export_csv(csv_file) == 2
+    with open(csv_file, encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[1] == ['https://www.loja.pt/', 'Loja', '912 345 678', 'a@loja.pt']
+    assert rows[2] == ['not a url']
+    assert rows[3] == ['http://loja.pt', 'Loja', '912 345 678', 'a@loja.pt']
+
+
+def status_of(store, url):
+    return store.db.execute('SELECT status FROM urls WHERE canonical_url = ?', (canonical_url(url),)).fetchone()[0]
+
+
+def test_rows_queued_by_an_earlier_run_are_not_claimed(store, tmp_path):
+    csv_file = str(tmp_path / 'contacts.csv')
+    write_csv(csv_file, [['https://a.pt', 'A', '912 345 678', ''], ['https://b.pt', 'B', '', 'b@b.pt']])
+    store.import_csv(csv_file)
+
+    # An earlier run queued the rows missing an email and stopped before doing them
+    assert store.queue('run-1', missing=['email']) == 1
+    assert status_of(store, 'https://a.pt') == PENDING
+
+    assert store.queue('run-2', missing=['phone']) == 1
+    job = store.claim('run-2/1')
+    assert job['url'] == 'https://b.pt'
+    store.record(job['id'], None, None, None)
+    assert store.claim('run-2/1') is None
+    assert status_of(store, 'https://a.pt') == PENDING
+
+
+def test_failed_and_released_rows_are_queued_again(store, tmp_path):
+    csv_file = str(tmp_path / 'contacts.csv')
+    write_csv(csv_file, [['https://a.pt'], ['https://b.pt']])
+    store.import_csv(csv_file)
+    store.queue('run-1')
+    first, second = store.claim('run-1/1'), store.claim('run-1/2')
+    assert (first['url'], second['url']) == ('https://a.pt', 'https://b.pt')
+    store.fail(first['id'], 'timeout')
+    store.release('run-1')
+    assert (status_of(store, 'https://a.pt'), status_of(store, 'https://b.pt')) == (FAILED, PENDING)
+
+    assert store.queue('run-2', max_attempts=2) == 2
+    assert store.claim('run-2/1')['attempts'] == 1
+    store.claim('run-2/1')
+    assert store.queue('run-3', max_attempts=2) == 0
+    assert status_of(store, 'https://a.pt') == CLAIMED
+    assert status_of(store, 'https://b.pt') == CLAIMED
+
+
+def claim_all(db_file, worker, results):
+    store = JobStore(db_file)
+    claimed = []
+    while (job := store.claim(worker)):
+        claimed.append(job['id'])
+        store.record(job['id'], 'x', '', '')
+    store.close()
+    results.put(claimed)
+
+
+def test_concurrent_claims_never_hand_out_a_row_twice(store, tmp_path):
+    csv_file = str(tmp_path / 'contacts.csv')
+    write_csv(csv_file, [[f'https://site{i}.pt'] for i in range(200)])
+    store.import_csv(csv_file)
+    assert store.queue('run-1') == 200
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    workers = [context.Process(target=claim_all, args=(store.path, f'run-1/{i}', results)) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    claimed = [job_id for _ in workers for job_id in results.get(timeout=60)]
+    for worker in workers:
+        worker.join()
+
+    assert len(claimed) == len(set(claimed)) == 200
@@ -0,0 +1,51 @@
+import unicodedata
+
+import pytest
+
+from name_normalizer import NameNormalizer, normalize_name
+
+
+def test_unicode_is_composed():
+    decomposed = unicodedata.normalize('NFD', 'Café São João')
+    assert decomposed != 'Café São João'
+    assert normalize_name(decomposed) == 'Café São João'
+    assert NameNormalizer(unicode_form=None)(decomposed) == decomposed.strip()
+
+
+def test_whitespace_is_collapsed():
+    assert normalize_name('  Padaria  Central\n\tLda ') == 'Padaria Central Lda'
+
+
+@pytest.mark.parametrize('name', [
+    'Fidelidade Seguros 已认证账户',
+    'Fidelidade Seguros已认证',
+    'Fidelidade Seguros Verified Account',
+    'Fidelidade Seguros verifiedaccount',
+    'Fidelidade Seguros Verified 已认证',
+    'Fidelidade SegurosVerified',
+])
+def test_badges_are_stripped(name):
+    assert normalize_name(name) == 'Fidelidade Seguros'
+
+
+@pytest.mark.parametrize('name', [
+    'Café Unverified',
+    'UNVERIFIED',
+    'Maria da Silva',
+    'Casa dos Verifiedores',
+])
+def test_words_containing_a_badge_are_kept(name):
+    assert normalize_name(name) == name
+
+
+def test_prefixes_and_particles():
+    normalizer = NameNormalizer(suffixes=['Lda', 'S.A.'], prefixes=['@', 'Dr'])
+    assert normalizer('@@ Dr Ana de Sousa Lda') == 'Ana de Sousa'
+    assert normalizer('Drogaria da Sé S.A.') == 'Drogaria da Sé'
+    assert normalizer('Olda') == 'Olda'
+    assert normalizer('Dr') == ''
+
+
+def test_empty_names_are_returned_unchanged():
+    assert normalize_name(None) is None
+    assert normalize_name('') == ''
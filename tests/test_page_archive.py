@@ -0,0 +1,139 @@
+import socket
+import sys
+
+import pytest
+
+import page_archive
+from page_archive import PageArchive, reextract_snapshot
+
+
+SITE_HTML = """<html><head><title>Padaria Central</title></head><body>
+<h1>Padaria Central</h1>
+<p>Contacte-nos: geral@padariacentral.pt</p>
+</body></html>"""
+
+
+def test_http_snapshot_is_reextracted_from_its_pages(tmp_path):
+    archive = PageArchive(str(tmp_path))
+    archive.save('https://padariacentral.pt', 'https://padariacentral.pt/',
+                 {'pages': [{'rank': 0, 'url': 'https://padariacentral.pt/', 'html': SITE_HTML}]}, source='http')
+    [path] = archive.paths()
+
+    result = reextract_snapshot(path)
+
+    assert PageArchive.load(path)['source'] == 'http'
+    assert result['url'] == 'https://padariacentral.pt'
+    assert result['email'] == 'geral@padariacentral.pt'
+    assert result['name'] == 'Padaria Central'
+
+
+def test_browser_snapshot_keeps_its_content_hash(tmp_path):
+    archive = PageArchive(str(tmp_path))
+    bundle = {'title': 'Shop', 'text': 'shop@example.pt'}
+    assert archive.save('https://shop.pt', None, bundle) == archive.save('https://shop.pt', None, bundle, 'browser')
+    assert 'source' not in PageArchive.load(next(archive.paths()))
+
+
+def test_snapshot_without_url_is_reextracted(tmp_path):
+    archive = PageArchive(str(tmp_path))
+    archive.save(None, 'https://shop.pt/', {'title': 'Shop', 'text': 'Email: loja@shop.pt'})
+    [path] = archive.paths()
+
+    result = reextract_snapshot(path)
+
+    assert result['url'] is None
+    assert result['email'] == 'loja@shop.pt'
+
+
+class FakeTab:
+    """Tab that answers the Intro script with fixed values and records the CDP calls"""
+
+    def __init__(self, data):
+        self.data = data
+        self.cdp = []
+
+    def run_cdp(self, method, **params):
+        self.cdp.append((method, params))
+        if method == 'Page.getFrameTree':
+            return {'frameTree': {'frame': {'id': 'main'}}}
+        return {}
+
+    def get(self, url):
+        pass
+
+    def run_js(self, script):
+        return self.data
+
+
+FACEBOOK_BUNDLE = {'html': '<div>Intro<script>tracker()</script></div>', 'text': 'Intro',
+                   'facebook_name': 'Loja', 'phone': '911 111 111', 'email': None}
+
+
+def test_facebook_intro_is_rerun_in_a_tab(tmp_path, monkeypatch):
+    tab = FakeTab({'facebook_name': 'Loja', 'phone': '922 222 222', 'email': 'loja@gmail.com'})
+    monkeypatch.setattr(page_archive, 'get_replay_tab', lambda: tab)
+    archive = PageArchive(str(tmp_path))
+    archive.save('https://www.facebook.com/loja', None, FACEBOOK_BUNDLE)
+
+    result = reextract_snapshot(next(archive.paths()), replay_intro=True)
+
+    assert result['intro'] == 'rerun'
+    assert result['phone'] == '922 222 222'
+    assert result['email'] == 'loja@gmail.com'
+    [html] = [params['html'] for method, params in tab.cdp if method == 'Page.setDocumentContent']
+    assert '<script' not in html
+    # Network blocked while the captured DOM is loaded, unblocked afterwards
+    blocked = [params['urls'] for method, params in tab.cdp if method == 'Network.setBlockedURLs']
+    assert blocked == [['*'], []]
+
+
+def no_browser_launch(*args, **kwargs):
+    raise AssertionError("replay must not start a browser")
+
+
+def test_captured_intro_is_used_by_default(tmp_path, monkeypatch):
+    monkeypatch.setattr(page_archive, 'get_replay_tab', no_browser_launch)
+    archive = PageArchive(str(tmp_path))
+    archive.save('https://www.facebook.com/loja', None, FACEBOOK_BUNDLE)
+
+    result = reextract_snapshot(next(archive.paths()))
+
+    assert result['intro'] == 'captured'
+    assert result['phone'] == '911 111 111'
+    assert 'intro_error' not in result
+
+
+def test_replay_without_a_browser_fails_instead_of_launching_one(tmp_path, monkeypatch):
+    import DrissionPage
+    import extract_contacts
+
+    monkeypatch.setattr(page_archive, '_replay_tab', None)
+    monkeypatch.setattr(page_archive, 'REPLAY_PORT', free_port())
+    monkeypatch.setattr(DrissionPage, 'ChromiumPage', no_browser_launch)
+    monkeypatch.setattr(extract_contacts, 'connect_browser', no_browser_launch)
+    archive = PageArchive(str(tmp_path))
+    archive.save('https://www.facebook.com/loja', None, FACEBOOK_BUNDLE)
+
+    result = reextract_snapshot(next(archive.paths()), replay_intro=True)
+
+    assert result['intro'] == 'captured'
+    assert result['phone'] == '911 111 111'
+    assert 'no browser on port' in result['intro_error']
+
+
+def test_cli_rerun_intro_stops_without_a_browser(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(page_archive, 'replay_browser_reachable', lambda: False)
+    monkeypatch.setattr(page_archive, 'reextract', no_browser_launch)
+    monkeypatch.setattr(sys, 'argv', ['page_archive.py', 'reextract', '--archive', str(tmp_path), '--rerun-intro'])
+
+    with pytest.raises(SystemExit) as exit_info:
+        page_archive.main()
+
+    assert exit_info.value.code == 1
+    assert '--rerun-intro needs a browser' in capsys.readouterr().err
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
@@ -0,0 +1,85 @@
+import random
+import re
+
+import pytest
+
+from extract_contacts import PHONE_KEYWORDS, extract_phone_from_text, scan_contacts
+
+
+def per_keyword_phone(text):
+    """The keyword/format/context rules as they were written before the one-pass scan"""
+    for keyword in PHONE_KEYWORDS:
+        keyword_patterns = [
+            rf'(?i){re.escape(keyword)}[:\s]*([\+\d][\d\s\-\(\)]{{8,20}})',
+            rf'(?i){re.escape(keyword)}[:\s]*(\d{{2,4}}[\s\-]\d{{3,4}}[\s\-]\d{{3,4}})',
+        ]
+        for pattern in keyword_patterns:
+            matches = re.findall(pattern, text)
+            if matches:
+                phone = matches[0].strip()
+                phone_clean = re.sub(r'[^\d+]', '', phone)
+                if 9 <= len(phone_clean) <= 15 and any(sep in phone for sep in [' ', '-', '(', ')', '+']):
+                    return phone
+    formatted_patterns = [
+        r'\b\d{2}\s+\d{3}\s+\d{4}\b',
+        r'\b9\d{2}[\s\-]\d{3}[\s\-]\d{3}\b',
+        r'\b2\d{1}[\s\-]\d{3}[\s\-]\d{4}\b',
+        r'\+?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,4}[\s\-]?\d{1,9}',
+        r'\(\d{3}\)[\s\-]?\d{3}[\s\-]?\d{4}',
+        r'\d{3}[\-]\d{3}[\-]\d{4}',
+    ]
+    for pattern in formatted_patterns:
+        for match in re.findall(pattern, text):
+            phone = match.strip()
+            phone_clean = re.sub(r'[^\d+]', '', phone)
+            if 9 <= len(phone_clean) <= 15:
+                if 1900 <= int(phone_clean[:4]) <= 2099:
+                    continue
+                if any(sep in phone for sep in [' ', '-', '(', ')', '+']) or phone.startswith('+'):
+                    return phone
+    context_pattern = r'(?i)(?:phone|tel|call|contact|telefone)[^.]{0,100}?(\d{2,4}[\s\-]\d{3,4}[\s\-]\d{3,4})'
+    for match in re.findall(context_pattern, text):
+        phone = match.strip()
+        if 9 <= len(re.sub(r'[^\d+]', '', phone)) <= 15:
+            return phone
+    return None
+
+
+@pytest.mark.parametrize('text', [
+    'Contactel: 912345678 (ext 22)',
+    'Contactel 21-794-8800',
+    'Telephone: +351 912 345 678',
+    'TELEFONE: 21 794 8800',
+    'Excellent! Call 912-345-678',
+    'Recall: 2024 1234 5678',
+    'Contacte-nos pelo Telefone:(21) 794 8800.',
+    '电话：+86 10 1234 5678',
+    'phonetelephone 912 345 678',
+])
+def test_overlapping_keywords_match_the_per_keyword_rules(text):
+    assert extract_phone_from_text(text) == per_keyword_phone(text)
+
+
+def test_keyword_inside_another_is_found():
+    scan = scan_contacts('Contactel: 912345678')
+    assert scan.keywords['contact'] == [0]
+    assert scan.keywords['tel'] == [6]
+    assert extract_phone_from_text('Contactel: 912345678') is None
+    assert extract_phone_from_text('Contactel: 912 345 678') == '912 345 678'
+
+
+def test_every_keyword_offset_is_found():
+    text = 'telephonecellcontactelefone: 912 345 678'
+    scan = scan_contacts(text)
+    for keyword in PHONE_KEYWORDS:
+        expected = [m.start() for m in re.finditer(f'(?=(?i:{re.escape(keyword)}))', text)]
+        assert scan.keywords.get(keyword, []) == expected, keyword
+
+
+def test_random_texts_match_the_per_keyword_rules():
+    pieces = ['contact', 'tel', 'Contactel', 'telephone', 'Telefone:', 'phone', 'call', 'cell', 'mobile',
+              '电话', ': ', ' ', '-', '.', '(21)', '912', '345', '678', '21', '794', '8800', '+351', 'x', 'ab']
+    rng = random.Random(18)
+    for _ in range(2000):
+        text = ''.join(rng.choice(pieces) for _ in range(rng.randint(1, 14)))
+        assert extract_phone_from_text(text) == per_keyword_phone(text), text
@@ -0,0 +1,65 @@
+import pytest
+
+from batch_extract import extract_document
+from extract_contacts import normalize_found_phone, normalize_phone_candidates, phone_candidates
+from phone_numbers import IMPOSSIBLE, UNKNOWN, VALID, country_for_url, normalize_phone
+
+
+@pytest.mark.parametrize('phone', ['21 794 8800', '+351 21 794 8800', '00351 217948800', '351217948800'])
+def test_portuguese_site_numbers_are_validated(phone):
+    assert normalize_phone(phone, country_for_url('https://www.loja.pt/contactos')) == ('+351217948800', VALID)
+
+
+def test_impossible_portuguese_number_is_dropped():
+    assert normalize_phone('99 999 9999', 'PT') == (None, IMPOSSIBLE)
+    assert normalize_found_phone('99 999 9999', 'https://loja.pt') == (None, None)
+
+
+@pytest.mark.parametrize('url, phone', [
+    ('https://www.shop.co.uk/contact', '020 7946 0958'),
+    ('https://www.loja.com.br/', '(11) 5555-1234'),
+    ('https://example-shop.com/', '(212) 555-1234'),
+    ('https://www.facebook.com/somepage', '(212) 555-1234'),
+    (None, '020 7946 0958'),
+])
+def test_foreign_numbers_are_kept_unvalidated(url, phone):
+    assert country_for_url(url) is None
+    assert normalize_phone(phone, country_for_url(url)) == (None, UNKNOWN)
+    assert normalize_found_phone(phone, url) == (phone, None)
+
+
+@pytest.mark.parametrize('phone', ['21 794 8800', '217948800', '351217948800'])
+def test_facebook_page_numbers_get_the_default_country(phone):
+    assert country_for_url('https://www.facebook.com/FidelidadeSeguros.Portugal') is None
+    assert normalize_found_phone(phone, 'https://www.facebook.com/FidelidadeSeguros.Portugal') == \
+        (phone, '+351217948800')
+
+
+def test_default_country_never_rejects_a_number():
+    # Not a Portuguese number, but it may be another country's
+    assert normalize_phone('99 999 9999', None) == (None, UNKNOWN)
+    assert normalize_found_phone('99 999 9999', 'https://www.facebook.com/loja') == ('99 999 9999', None)
+    assert normalize_phone('21 794 8800', None, default_country=None) == (None, UNKNOWN)
+
+
+def test_calling_code_is_validated_on_any_site():
+    assert normalize_found_phone('+351 912 345 678', 'https://www.facebook.com/loja') == \
+        ('+351 912 345 678', '+351912345678')
+    assert normalize_found_phone('+351 99 999 9999', 'https://example-shop.com') == (None, None)
+    # Calling code without a plan: digits kept, not validated
+    assert normalize_found_phone('+44 20 7946 0958', 'https://example-shop.com') == \
+        ('+44 20 7946 0958', '+442079460958')
+
+
+def test_batch_document_without_url_keeps_foreign_numbers():
+    result = extract_document({'text': 'Call us: 020 7946 0958'})
+    assert result['phone'] == '020 7946 0958'
+    assert result['phone_e164'] is None
+
+
+def test_candidates_of_foreign_site_are_not_dropped():
+    text = 'Telefone: 11 5555-1234'
+    found = normalize_phone_candidates(phone_candidates(text), 'https://www.loja.com.br/')
+    [candidate] = found.values()
+    assert candidate['value'] == '11 5555-1234'
+    assert candidate['e164'] is None
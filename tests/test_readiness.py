@@ -0,0 +1,39 @@
+import extract_contacts
+from extract_contacts import PAGE_READY_SELECTORS, ReadyTracker, wait_for_ready
+
+OLD = {'found': 'h1', 'href': 'https://shop.pt/', 'readyState': 'complete', 'resources': 3}
+NEW = {'found': 'h1', 'href': 'https://shop.pt/contactos', 'readyState': 'complete', 'resources': 5}
+
+
+def test_page_being_left_is_not_ready():
+    tracker = ReadyTracker(timeout=5, leaving='https://shop.pt/')
+    assert tracker.update(OLD) is None
+    assert tracker.update(NEW) == 'content'
+
+
+def test_page_that_never_navigates_times_out():
+    tracker = ReadyTracker(timeout=0, leaving='https://shop.pt/')
+    assert tracker.update(OLD) == 'timeout'
+
+
+def test_without_leaving_the_current_page_counts():
+    assert ReadyTracker(timeout=5).update(OLD) == 'content'
+
+
+class NavigatingPage:
+    """Answers the readiness probe with the old page for a few polls, then the new one"""
+
+    def __init__(self, polls_before_commit):
+        self.polls = 0
+        self.polls_before_commit = polls_before_commit
+
+    def run_js(self, script):
+        self.polls += 1
+        return OLD if self.polls <= self.polls_before_commit else NEW
+
+
+def test_wait_for_ready_waits_for_the_navigation(monkeypatch):
+    monkeypatch.setattr(extract_contacts.time, 'sleep', lambda seconds: None)
+    page = NavigatingPage(polls_before_commit=3)
+    assert wait_for_ready(page, PAGE_READY_SELECTORS, leaving='https://shop.pt/') == 'content'
+    assert page.polls == 4
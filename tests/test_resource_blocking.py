@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import extract_contacts
+from extract_contacts import build_block_patterns, BLOCK_PATTERNS
+
+
+def test_default_profile_is_kept():
+    patterns = build_block_patterns('image,media,font,tracking', '')
+    expected = BLOCK_PATTERNS['image'] + BLOCK_PATTERNS['media'] + BLOCK_PATTERNS['font'] + BLOCK_PATTERNS['tracking']
+    assert patterns == expected
+
+
+def test_patterns_covering_allowed_resources_are_dropped():
+    patterns = build_block_patterns('none', '*.png*,*fbcdn.net/*,*.js*,*.svg*')
+    assert patterns == ['*.svg*']
+
+
+def test_patterns_covering_the_page_are_dropped():
+    patterns = build_block_patterns('none', '*shop.pt/*,*ads.example/*', keep_urls=['https://shop.pt/contact'])
+    assert patterns == ['*ads.example/*']
+
+
+class FailingPage:
+    """Records CDP calls; navigation fails"""
+
+    def __init__(self):
+        self.cdp = []
+
+    def run_cdp(self, method, **params):
+        self.cdp.append((method, params))
+
+    def get(self, url):
+        raise RuntimeError("navigation failed")
+
+
+def test_blocking_is_lifted_after_extraction():
+    page = FailingPage()
+    assert extract_contacts.extract_contacts('https://shop.pt', page=page, http_first=False) == (None, page)
+    blocked = [params['urls'] for method, params in page.cdp if method == 'Network.setBlockedURLs']
+    assert blocked[0] and blocked[-1] == []
@@ -0,0 +1,91 @@
+import json
+import multiprocessing
+
+import pytest
+
+import extract_contacts
+import strategy_stats
+from strategy_stats import MIN_TRIES, StrategyStats
+
+METHODS = ['keyword', 'formatted', 'context']
+
+
+@pytest.fixture
+def no_exploration(monkeypatch):
+    monkeypatch.setattr(strategy_stats.random, 'random', lambda: 1.0)
+
+
+def test_priority_order_is_kept_whatever_the_yields(tmp_path, no_exploration):
+    stats = StrategyStats(str(tmp_path / 'stats.json'))
+    # 'keyword' missed once, 'formatted' then found the phone every time
+    stats.record('shop.pt|home', 'phone', ['keyword', 'formatted'], 'formatted')
+    for _ in range(10):
+        stats.record('shop.pt|home', 'phone', ['keyword', 'formatted'], 'formatted')
+    stats.record('shop.pt|home', 'phone', ['keyword'], 'keyword')
+    assert stats.plan('shop.pt|home', 'phone', METHODS) == METHODS
+
+
+def test_methods_that_never_yield_are_skipped(tmp_path, no_exploration):
+    stats = StrategyStats(str(tmp_path / 'stats.json'))
+    for _ in range(MIN_TRIES + 40):
+        stats.record('shop.pt|home', 'phone', ['keyword', 'formatted'], 'formatted')
+    assert stats.plan('shop.pt|home', 'phone', METHODS) == ['formatted', 'context']
+    # Other keys and fields keep every method
+    assert stats.plan('other.pt|home', 'phone', METHODS) == METHODS
+
+
+def test_too_few_tries_are_not_skipped(tmp_path, no_exploration):
+    stats = StrategyStats(str(tmp_path / 'stats.json'))
+    for _ in range(MIN_TRIES - 1):
+        stats.record('shop.pt|home', 'phone', ['keyword', 'formatted'], 'formatted')
+    assert stats.plan('shop.pt|home', 'phone', METHODS) == METHODS
+
+
+def test_exploration_runs_every_method(tmp_path, monkeypatch):
+    stats = StrategyStats(str(tmp_path / 'stats.json'))
+    for _ in range(MIN_TRIES + 40):
+        stats.record('shop.pt|home', 'phone', ['keyword', 'formatted'], 'formatted')
+    monkeypatch.setattr(strategy_stats.random, 'random', lambda: 0.0)
+    assert stats.plan('shop.pt|home', 'phone', METHODS) == METHODS
+
+
+def test_record_methods_counts_the_general_page_rules(tmp_path, monkeypatch, no_exploration):
+    stats = StrategyStats(str(tmp_path / 'stats.json'))
+    monkeypatch.setattr(extract_contacts, 'get_strategy_stats', lambda: stats)
+    plan = extract_contacts.plan_extraction('https://shop.pt/contactos', 'contact')
+    assert plan['phone'] == list(extract_contacts.PHONE_TEXT_METHODS)
+
+    data = {'has_phone_indicator': True, 'text': 'Ligue 21 794 8800'}
+    results = extract_contacts.contacts_from_bundle(data, 'https://shop.pt/contactos', plan)
+
+    assert results['phone'] == '21 794 8800'
+    assert stats._stats['shop.pt|contact']['phone'] == {'keyword': [1, 0], 'formatted': [1, 1]}
+
+
+def test_saves_of_two_stores_are_merged(tmp_path):
+    path = str(tmp_path / 'stats.json')
+    first, second = StrategyStats(path), StrategyStats(path)
+    first.record('shop.pt|home', 'phone', ['keyword'], 'keyword')
+    second.record('shop.pt|home', 'phone', ['keyword', 'formatted'], None)
+    first.save()
+    second.save()
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['shop.pt|home']['phone'] == {'keyword': [2, 1], 'formatted': [1, 0]}
+
+
+def record_and_save(path, count):
+    stats = StrategyStats(path, save_every=1)
+    for _ in range(count):
+        stats.record('shop.pt|home', 'phone', ['keyword'], 'keyword')
+
+
+def test_concurrent_saves_lose_no_counts(tmp_path):
+    path = str(tmp_path / 'stats.json')
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=record_and_save, args=(path, 50)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['shop.pt|home']['phone']['keyword'] == [200, 200]
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import pytest
+
+import api_server
+import browser_supervisor
+import extract_contacts
+import tab_pool
+
+
+def _no_browser(monkeypatch):
+    def refuse(*args, **kwargs):
+        raise ConnectionError("no browser on 9222")
+    monkeypatch.setattr(extract_contacts, 'ChromiumPage', refuse)
+    monkeypatch.setattr(browser_supervisor, 'is_production_environment', lambda: False)
+
+
+def test_connect_browser_returns_none_without_browser(monkeypatch):
+    _no_browser(monkeypatch)
+    assert extract_contacts.connect_browser() is None
+
+
+def test_extract_contacts_reports_failed_connection(monkeypatch):
+    _no_browser(monkeypatch)
+    assert extract_contacts.extract_contacts('https://www.facebook.com/x', http_first=False) == (None, None)
+
+
+def test_pool_raises_clear_error_without_browser(monkeypatch):
+    _no_browser(monkeypatch)
+    monkeypatch.setattr(tab_pool, 'connect_browser', extract_contacts.connect_browser)
+    pool = tab_pool.TabPool(size=1)
+    with pytest.raises(Exception, match="Failed to connect to browser"):
+        pool.checkout()
+    assert pool.stats()['open'] == 0
+
+
+class FakeTab:
+    def __init__(self):
+        self.closed = False
+
+    def get(self, url):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def new_tab(self):
+        return FakeTab()
+
+
+class DeadTab:
+    """A tab whose DevTools connection is gone"""
+
+    def __getattr__(self, name):
+        raise extract_contacts.PageDisconnectedError()
+
+
+def test_lost_tab_is_reported_without_a_page():
+    assert extract_contacts.extract_contacts('https://shop.pt', page=DeadTab(), http_first=False) == (None, None)
+
+
+def test_tab_marked_broken_is_not_reused(monkeypatch):
+    monkeypatch.setattr(tab_pool, 'connect_browser', FakeBrowser)
+    pool = tab_pool.TabPool(size=1)
+    with pool.tab() as tab:
+        pool.mark_broken(tab)
+    assert tab.closed
+    assert pool.stats()['open'] == 0
+    with pool.tab() as fresh:
+        assert fresh is not tab
+    assert pool.stats() == {'size': 1, 'open': 1, 'idle': 1, 'busy': 0}
+
+
+def _wait_in_thread(pool):
+    """Start a checkout in another thread; returns (thread, result dict)"""
+    result = {}
+
+    def run():
+        try:
+            result['tab'] = pool.checkout()
+        except Exception as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, result
+
+
+@pytest.mark.parametrize('broken', [False, True])
+def test_waiting_checkout_is_woken_by_a_return(monkeypatch, broken):
+    monkeypatch.setattr(tab_pool, 'connect_browser', FakeBrowser)
+    pool = tab_pool.TabPool(size=1, checkout_timeout=10)
+    tab = pool.checkout()
+    thread, result = _wait_in_thread(pool)
+    time.sleep(0.1)
+    assert thread.is_alive()
+
+    started = time.monotonic()
+    # A broken tab frees its slot: the waiter opens a fresh tab instead of timing out
+    pool.checkin(tab, broken=broken)
+    thread.join(5)
+    assert time.monotonic() - started < 2
+    assert 'error' not in result
+    assert (result['tab'] is tab) != broken
+    assert pool.stats() == {'size': 1, 'open': 1, 'idle': 0, 'busy': 1}
+
+
+def test_checkout_times_out_when_no_tab_frees_up(monkeypatch):
+    monkeypatch.setattr(tab_pool, 'connect_browser', FakeBrowser)
+    pool = tab_pool.TabPool(size=1, checkout_timeout=0.2)
+    pool.checkout()
+    with pytest.raises(tab_pool.TabPoolExhausted):
+        pool.checkout()
+
+
+class LosingPool:
+    """Pool whose tabs die on first use and that can't hand out a replacement"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkins = []
+
+    def checkout(self):
+        self.checkouts += 1
+        if self.checkouts > 1:
+            raise tab_pool.TabPoolExhausted("no tab")
+        return FakeTab()
+
+    def checkin(self, tab, broken=False):
+        self.checkins.append(broken)
+
+
+def test_batch_stops_using_the_browser_when_no_tab_is_left(monkeypatch):
+    pool = LosingPool()
+    calls = []
+
+    def lose_tab(url, page=None, **kwargs):
+        calls.append(page)
+        return None, None
+
+    monkeypatch.setattr(api_server, 'get_tab_pool', lambda: pool)
+    monkeypatch.setattr(api_server, 'extract_contacts', lose_tab)
+    response = api_server.app.test_client().post(
+        '/extract/batch', json={'urls': ['https://a.pt', 'https://b.pt', 'https://c.pt']})
+
+    body = response.get_json()
+    assert calls == [calls[0]] and calls[0] is not None
+    assert [error['url'] for error in body['errors']] == ['https://a.pt', 'https://b.pt', 'https://c.pt']
+    assert body['errors'][1]['error'] == 'No browser tab available: no tab'
+    assert pool.checkins == [True]